@@ -107,6 +107,55 @@ SIMPLE_JWT = {
     "AUTH_HEADER_TYPES": ("Bearer",),
 }
 
+# Generated study plans cache: in-process LRU size, plus an optional entry of
+# CACHES to share plans between workers (None keeps the cache per process)
+STUDY_PLAN_CACHE = {
+    "MAX_SIZE": 1024,
+    "CACHE_ALIAS": None,
+    "TIMEOUT": 60 * 60 * 24,
+}
+
+# Holds the quiz bank's version counter, recent questions and quiz sessions.
+# LocMemCache is per process: use a cache shared between workers (e.g. Redis)
+# when running several. Django's default of 300 entries would evict sessions.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "OPTIONS": {"MAX_ENTRIES": 50000},
+    }
+}
+
+# Quiz questions are kept in memory per process; the bank's version counter
+# lives in this cache alias so every worker drops its copy when questions
+# change (use a cache shared between workers, e.g. Redis, in production).
+# The alias also remembers the last RECENT_QUESTIONS questions per user and
+# level, which quizzes avoid (0 disables this), and the questions of each quiz
+# for SESSION_TIMEOUT seconds so the server can grade it. Adaptive quizzes use
+# question difficulties at most ADAPTIVE_INDEX_TTL seconds old.
+QUIZ_QUESTION_BANK = {
+    "CACHE_ALIAS": "default",
+    "RECENT_QUESTIONS": 50,
+    "RECENT_TIMEOUT": 60 * 60 * 24 * 30,
+    "SESSION_TIMEOUT": 60 * 60 * 6,
+    "ADAPTIVE_INDEX_TTL": 300,
+}
+
+# Default and largest page of the paginated task lists (?page_size=)
+TASK_LIST_PAGE_SIZE = 50
+TASK_LIST_MAX_PAGE_SIZE = 500
+
+# Seconds before the client's cursor delta sync (sync/?since=) reads again,
+# for rows whose transaction committed after the previous sync
+SYNC_OVERLAP_SECONDS = 60
+
+# Prebuilt question bundles (manage.py build_quiz_bundles)
+QUIZ_BUNDLES = {
+    "DIR": BASE_DIR / "quiz_bundles",
+}
+
+# Days of a rolling-horizon study plan returned when no ?from=&to= is given
+STUDY_PLAN_WINDOW_DAYS = 14
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
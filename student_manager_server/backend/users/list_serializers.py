@@ -0,0 +1,116 @@
+from datetime import timezone
+
+from rest_framework import serializers
+from rest_framework.settings import ISO_8601, api_settings
+
+from .models import TaskEvent
+from .serializers import NotificationSerializer, TaskEventSerializer
+
+# Fields whose to_representation returns the values Django loads unchanged
+PLAIN_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.IntegerField,
+)
+
+
+def iso_datetime(field_timezone):
+    """What DateTimeField.to_representation does for an ISO 8601 field."""
+
+    def format_datetime(value):
+        value = value.astimezone(field_timezone).isoformat()
+        if value.endswith("+00:00"):
+            value = value[:-6] + "Z"
+        return value
+
+    return format_datetime
+
+
+class ValuesSerializer:
+    """
+    Read-only stand-in for a ModelSerializer's many=True output on hot list
+    endpoints. Only the serializer's columns are loaded, with values(), and
+    each row is turned into the dict the serializer returns by a formatter
+    per field chosen once per list instead of model instances and field
+    objects per row. Fields it has no formatter for use the field's own
+    to_representation.
+    """
+
+    def __init__(self, serializer_class):
+        self.fields = list(serializer_class().fields.values())
+        self.columns = []
+        for field in self.fields:
+            if isinstance(field, serializers.PrimaryKeyRelatedField):
+                # The related id, without loading the related object
+                self.columns.append(f"{field.source}_id")
+            else:
+                self.columns.append(field.source)
+
+    def formatter(self, field):
+        """Function turning a non-null value of field into its output, or None."""
+        if isinstance(field, serializers.DateTimeField):
+            output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+            if output_format is not None and output_format.lower() == ISO_8601:
+                return iso_datetime(
+                    getattr(field, "timezone", field.default_timezone())
+                )
+            return field.to_representation
+        if isinstance(field, serializers.FloatField):
+            return float
+        if isinstance(field, serializers.PrimaryKeyRelatedField):
+            if field.pk_field is None:
+                return None
+            return field.pk_field.to_representation
+        if isinstance(field, serializers.JSONField) and not field.binary:
+            return None
+        if isinstance(field, PLAIN_FIELDS):
+            return None
+        return field.to_representation
+
+    def serialize(self, queryset):
+        # Formatters are chosen per call: the current time zone may change
+        fields = [
+            (field.field_name, column, self.formatter(field))
+            for field, column in zip(self.fields, self.columns)
+        ]
+        data = []
+        for row in queryset.values(*self.columns):
+            item = {}
+            for name, column, formatter in fields:
+                value = row[column]
+                if formatter is not None and value is not None:
+                    value = formatter(value)
+                item[name] = value
+            data.append(item)
+        return data
+
+
+class CompletedTaskSerializer(serializers.ModelSerializer):
+    """
+    What CompletedTasksView returns: datetimes rendered as loaded, in UTC,
+    whatever the current time zone.
+    """
+
+    start_date = serializers.DateTimeField(default_timezone=timezone.utc)
+    event_date = serializers.DateTimeField(default_timezone=timezone.utc)
+
+    class Meta:
+        model = TaskEvent
+        fields = [
+            "id",
+            "task_name",
+            "subject",
+            "task_type",
+            "start_date",
+            "event_date",
+            "estimated_study_hours",
+            "notes",
+            "priority",
+            "status",
+        ]
+
+
+task_list_serializer = ValuesSerializer(TaskEventSerializer)
+completed_task_serializer = ValuesSerializer(CompletedTaskSerializer)
+notification_list_serializer = ValuesSerializer(NotificationSerializer)
@@ -0,0 +1,160 @@
+import json
+import math
+import timeit
+from datetime import datetime, timedelta, timezone
+
+from django.core.management.base import BaseCommand, CommandError
+
+from users.scheduling import build_study_days, count_open_days, weekday_mask
+
+
+def legacy_study_days(
+    study_start_date,
+    total_days,
+    skip_days,
+    day_limit,
+    subject,
+    preferred_study_time,
+    study_hours_per_day,
+):
+    """The day-by-day loop generate_study_plan used before build_study_days."""
+    skip_days_count = sum(
+        1
+        for i in range(total_days)
+        if (study_start_date + timedelta(days=i)).strftime("%A") in skip_days
+    )
+    max_session_length = 1.5
+    max_sessions_per_day = 2
+    study_plan = []
+
+    current_date = study_start_date
+    days_added = 0
+    exam_date_minus_one = study_start_date + timedelta(days=total_days - 1)
+    while days_added < day_limit and current_date <= exam_date_minus_one:
+        weekday_name = current_date.strftime("%A")
+        if weekday_name in skip_days:
+            current_date += timedelta(days=1)
+            continue
+
+        if preferred_study_time == "Morning":
+            study_start_time = current_date.replace(hour=6, minute=0)
+        elif preferred_study_time == "Day":
+            study_start_time = current_date.replace(hour=12, minute=0)
+        elif preferred_study_time == "Night":
+            study_start_time = current_date.replace(hour=21, minute=0)
+        else:
+            study_start_time = current_date.replace(hour=8, minute=0)
+
+        sessions_per_day = min(
+            max(1, math.ceil(study_hours_per_day / max_session_length)),
+            max_sessions_per_day,
+        )
+        session_hours = min(study_hours_per_day / sessions_per_day, max_session_length)
+        daily_schedule = []
+
+        current_time = study_start_time
+        for session in range(sessions_per_day):
+            session_end_time = current_time + timedelta(hours=session_hours)
+            daily_schedule.append(
+                {
+                    "start_time": current_time.strftime("%H:%M"),
+                    "end_time": session_end_time.strftime("%H:%M"),
+                    "hours_to_study": round(session_hours, 2),
+                }
+            )
+            current_time = session_end_time + timedelta(minutes=30)
+
+        study_plan.append(
+            {
+                "study_date": current_date.strftime("%Y-%m-%d"),
+                "sessions": daily_schedule,
+                "subject": subject,
+                "study_time": preferred_study_time,
+                "total_hours": round(session_hours * sessions_per_day, 2),
+            }
+        )
+        days_added += 1
+        current_date += timedelta(days=1)
+
+    return skip_days_count, study_plan
+
+
+def vectorized_study_days(
+    study_start_date,
+    total_days,
+    skip_days,
+    day_limit,
+    subject,
+    preferred_study_time,
+    study_hours_per_day,
+):
+    skip_days_count = total_days - count_open_days(
+        study_start_date, total_days, weekday_mask(skip_days)
+    )
+    study_plan = build_study_days(
+        study_start_date,
+        total_days,
+        skip_days,
+        day_limit,
+        subject,
+        preferred_study_time,
+        study_hours_per_day,
+    )
+    return skip_days_count, study_plan
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the study plan calendar engine against the legacy day-by-day "
+        "loop: checks the plan JSON is identical and reports the speedup."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            nargs="+",
+            default=[7, 30, 90, 180, 365],
+            help="Plan horizons (in days) to benchmark.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=200,
+            help="Number of plans generated per horizon and engine.",
+        )
+
+    def handle(self, *args, **options):
+        start = datetime(2025, 5, 3, 9, 41, 27, 512000, tzinfo=timezone.utc)
+        cases = [
+            ([], "Morning", 2.0),
+            (["Saturday", "Sunday"], "Night", 3.3),
+            (["Monday", "Wednesday", "Friday"], "Day", 0.85),
+        ]
+
+        for days in options["days"]:
+            legacy_time = 0.0
+            vectorized_time = 0.0
+            for skip_days, study_time, hours in cases:
+                day_limit = int((days - len(skip_days) * days / 7) * 5 / 7)
+                args = (start, days, skip_days, day_limit, "DSA", study_time, hours)
+
+                legacy = json.dumps(legacy_study_days(*args))
+                vectorized = json.dumps(vectorized_study_days(*args))
+                if legacy != vectorized:
+                    raise CommandError(
+                        f"Plan mismatch for {days} days, skip_days={skip_days}"
+                    )
+
+                legacy_time += timeit.timeit(
+                    lambda: legacy_study_days(*args), number=options["repeat"]
+                )
+                vectorized_time += timeit.timeit(
+                    lambda: vectorized_study_days(*args), number=options["repeat"]
+                )
+
+            self.stdout.write(
+                f"{days:>4} days: legacy {legacy_time * 1000:8.1f} ms, "
+                f"vectorized {vectorized_time * 1000:8.1f} ms, "
+                f"speedup {legacy_time / vectorized_time:5.1f}x"
+            )
@@ -0,0 +1,185 @@
+import json
+import platform
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from rest_framework.renderers import JSONRenderer
+
+from users.list_serializers import (
+    completed_task_serializer,
+    notification_list_serializer,
+    task_list_serializer,
+)
+from users.models import Notification, TaskEvent
+from users.serializers import NotificationSerializer, TaskEventSerializer
+from users.task_lists import user_tasks
+
+EVENT_START = datetime(2025, 1, 6, 9, 0, tzinfo=timezone.utc)
+
+STATUSES = ["Pending", "Not Complete", "Complete", "Deleted"]
+
+COMPLETED_TASK_FIELDS = [
+    "id",
+    "task_name",
+    "subject",
+    "task_type",
+    "start_date",
+    "event_date",
+    "estimated_study_hours",
+    "notes",
+    "priority",
+    "status",
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark serializing the task and notification lists through DRF "
+        "serializers against the values()-based list serializers, on a "
+        "throwaway test database. Fails when their JSON output differs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=10000,
+            help="Tasks and notifications seeded for the benchmarked user.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Timed runs per case; the fastest one is recorded.",
+        )
+        parser.add_argument(
+            "--output",
+            default=None,
+            help="Also write the results to this JSON file.",
+        )
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False
+        )
+        try:
+            cases = self.run_cases(options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        for name, result in cases.items():
+            self.stdout.write(
+                f"{name}: {result['rows']} rows, DRF {result['drf_ms']:.1f} ms "
+                f"({result['drf_rows_per_s']:,} rows/s), lean {result['lean_ms']:.1f} "
+                f"ms ({result['lean_rows_per_s']:,} rows/s), {result['speedup']}x"
+            )
+        if options["output"]:
+            Path(options["output"]).write_text(
+                json.dumps(
+                    {"python": platform.python_version(), "cases": cases}, indent=2
+                )
+            )
+
+    def run_cases(self, options):
+        user = self.seed_user(options["rows"])
+        # Every run evaluates a fresh queryset (.all()), never a cached one
+        tasks = user_tasks(user, ["Deleted", "Complete"])
+        all_tasks = user_tasks(user, ["Deleted"])
+        completed = TaskEvent.objects.filter(user=user, status="Complete")
+        notifications = Notification.objects.filter(user=user)
+
+        return {
+            "TaskEventListView": self.compare(
+                lambda: TaskEventSerializer(tasks.all(), many=True).data,
+                lambda: task_list_serializer.serialize(tasks),
+                options["repeat"],
+            ),
+            "AllTaskEventListView": self.compare(
+                lambda: TaskEventSerializer(all_tasks.all(), many=True).data,
+                lambda: task_list_serializer.serialize(all_tasks),
+                options["repeat"],
+            ),
+            "CompletedTasksView": self.compare(
+                lambda: [
+                    {field: getattr(task, field) for field in COMPLETED_TASK_FIELDS}
+                    for task in completed.all()
+                ],
+                lambda: completed_task_serializer.serialize(completed),
+                options["repeat"],
+            ),
+            "NotificationListView": self.compare(
+                lambda: NotificationSerializer(notifications.all(), many=True).data,
+                lambda: notification_list_serializer.serialize(notifications),
+                options["repeat"],
+            ),
+        }
+
+    def seed_user(self, rows):
+        user = User.objects.create_user(username="bench", password="bench")
+        TaskEvent.objects.bulk_create(
+            [
+                TaskEvent(
+                    user=user,
+                    task_name=f"Task {i}",
+                    subject="DSA",
+                    task_type="Exam",
+                    start_date=EVENT_START + timedelta(hours=i),
+                    event_date=EVENT_START + timedelta(days=7, hours=i, seconds=0.5),
+                    estimated_study_hours=i % 40 / 2,
+                    notes=f"Notes {i}",
+                    priority=i % 5,
+                    status=STATUSES[i % len(STATUSES)],
+                    skip_days=["Sunday"] if i % 2 else None,
+                )
+                for i in range(rows)
+            ]
+        )
+        Notification.objects.bulk_create(
+            [
+                Notification(
+                    user=user,
+                    title=f"Notification {i}",
+                    body=f"Task 'Task {i}' is now Complete",
+                    is_read=bool(i % 3),
+                )
+                for i in range(rows)
+            ]
+        )
+        return user
+
+    def compare(self, drf, lean, repeat):
+        """
+        Fastest wall time of both ways of serializing a list, rendered to
+        JSON as the views do, after checking they render the same bytes.
+        """
+        renderer = JSONRenderer()
+        drf_json = renderer.render(drf())
+        if renderer.render(lean()) != drf_json:
+            raise CommandError("The lean output differs from the DRF output.")
+        rows = len(json.loads(drf_json))
+
+        timings = {}
+        for name, run in (("drf", drf), ("lean", lean)):
+            wall_times = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                renderer.render(run())
+                wall_times.append(time.perf_counter() - started)
+            timings[name] = min(wall_times)
+
+        return {
+            "rows": rows,
+            "drf_ms": round(timings["drf"] * 1000, 3),
+            "lean_ms": round(timings["lean"] * 1000, 3),
+            "drf_rows_per_s": round(rows / timings["drf"]),
+            "lean_rows_per_s": round(rows / timings["lean"]),
+            "speedup": round(timings["drf"] / timings["lean"], 1),
+        }
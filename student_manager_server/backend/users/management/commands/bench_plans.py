@@ -0,0 +1,295 @@
+import json
+import platform
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import (
+    CaptureQueriesContext,
+    setup_test_environment,
+    teardown_test_environment,
+)
+from rest_framework.test import APIClient
+
+from users.mastery import record_quiz_result
+from users.models import QuizResult, StudyPlan, TaskEvent, UserPreference
+from users.plan_cache import plan_cache
+from users.views import generate_study_plan
+
+SKIP_PATTERNS = {
+    "none": [],
+    "weekends": ["Saturday", "Sunday"],
+    "mwf": ["Monday", "Wednesday", "Friday"],
+}
+
+PLAN_START = datetime(2025, 1, 6, 9, 0, tzinfo=timezone.utc)
+
+# Timings this close to the baseline are noise, whatever the threshold
+TIME_SLACK_MS = 1.0
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark study plan generation and the study plan endpoints on a "
+        "throwaway test database. Records wall time, query counts and peak "
+        "memory per case, and fails when a case regresses past the baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--baseline",
+            default="bench_plans.json",
+            help="Baseline JSON file to compare against (written when missing).",
+        )
+        parser.add_argument(
+            "--save-baseline",
+            action="store_true",
+            help="Overwrite the baseline with this run instead of comparing.",
+        )
+        parser.add_argument(
+            "--output",
+            default=None,
+            help="Also write the results of this run to this JSON file.",
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.25,
+            help="Allowed relative increase of wall time and peak memory (0.25 = 25%%).",
+        )
+        parser.add_argument(
+            "--horizons",
+            type=int,
+            nargs="+",
+            default=[7, 30, 90, 180, 365],
+            help="Plan horizons (days between start date and exam date).",
+        )
+        parser.add_argument(
+            "--task-counts",
+            type=int,
+            nargs="+",
+            default=[1, 10, 50],
+            help="Pending tasks per user for the multi-plan endpoints.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Timed runs per case; the fastest one is recorded.",
+        )
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False
+        )
+        try:
+            cases = self.run_cases(options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        results = {
+            "python": platform.python_version(),
+            "repeat": options["repeat"],
+            "cases": cases,
+        }
+        if options["output"]:
+            Path(options["output"]).write_text(json.dumps(results, indent=2))
+
+        baseline_path = Path(options["baseline"])
+        if options["save_baseline"] or not baseline_path.exists():
+            baseline_path.write_text(json.dumps(results, indent=2))
+            self.stdout.write(self.style.SUCCESS(f"Baseline saved to {baseline_path}"))
+            return
+
+        baseline = json.loads(baseline_path.read_text())["cases"]
+        regressions = self.compare(cases, baseline, options["threshold"])
+        if regressions:
+            raise CommandError(
+                f"{len(regressions)} regression(s) against {baseline_path}:\n"
+                + "\n".join(regressions)
+            )
+        self.stdout.write(
+            self.style.SUCCESS(f"No regressions against {baseline_path}.")
+        )
+
+    def run_cases(self, options):
+        cases = {}
+        for horizon in options["horizons"]:
+            for pattern in SKIP_PATTERNS:
+                user, tasks = self.seed_user(1, horizon, pattern)
+                task_data = self.task_data(tasks[0])
+
+                cases[f"generate_study_plan[{horizon}d,{pattern}]"] = self.measure(
+                    lambda: generate_study_plan(user, task_data, task_data["id"]),
+                    options["repeat"],
+                )
+
+                client = self.client_for(user)
+                cases[f"StudyPlanView[{horizon}d,{pattern}]"] = self.measure(
+                    lambda: self.request(
+                        client.post, "/api/study-plan/", task_data, format="json"
+                    ),
+                    options["repeat"],
+                    setup=lambda: StudyPlan.objects.filter(user=user).delete(),
+                )
+
+        for task_count in options["task_counts"]:
+            for horizon in options["horizons"]:
+                user, tasks = self.seed_user(task_count, horizon)
+                client = self.client_for(user)
+                label = f"{task_count}t,{horizon}d"
+
+                # The first (untimed) run creates the plans; timed runs update them
+                cases[f"UpdateStudyPlansView[{label}]"] = self.measure(
+                    lambda: self.request(
+                        client.post,
+                        "/api/update-study-plans/",
+                        {"subject": "DSA"},
+                        format="json",
+                    ),
+                    options["repeat"],
+                )
+                cases[f"GetAllStudyPlansView[{label}]"] = self.measure(
+                    lambda: self.request(client.get, "/api/study-plans/"),
+                    options["repeat"],
+                )
+
+        return cases
+
+    def seed_user(self, task_count, horizon, pattern=None):
+        user = User.objects.create_user(
+            username=f"bench{User.objects.count()}", password="bench"
+        )
+        UserPreference.objects.create(
+            user=user,
+            strengths=["Quick learner"],
+            weaknesses=["Easily distracted"],
+            hours_per_day=3,
+            days_per_week=5,
+            preferred_study_time="Night",
+        )
+        record_quiz_result(
+            QuizResult.objects.create(
+                user=user, subject="DSA", level="Intermediate", results="75%"
+            )
+        )
+        patterns = [pattern] if pattern else list(SKIP_PATTERNS)
+        tasks = TaskEvent.objects.bulk_create(
+            [
+                TaskEvent(
+                    user=user,
+                    task_name=f"Task {i}",
+                    subject="DSA",
+                    task_type="Exam",
+                    start_date=PLAN_START,
+                    event_date=PLAN_START + timedelta(days=horizon),
+                    estimated_study_hours=horizon / 2,
+                    notes="",
+                    priority=1,
+                    skip_days=SKIP_PATTERNS[patterns[i % len(patterns)]],
+                )
+                for i in range(task_count)
+            ]
+        )
+        return user, tasks
+
+    def task_data(self, task):
+        return {
+            "id": task.id,
+            "subject": task.subject,
+            "study_start_date": task.start_date.isoformat(),
+            "exam_date": task.event_date.isoformat(),
+            "estimated_study_hours": task.estimated_study_hours,
+        }
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    def request(self, method, path, data=None, **kwargs):
+        response = method(path, data, **kwargs)
+        if response.status_code != 200:
+            raise CommandError(
+                f"{path} returned {response.status_code}: {response.content[:200]}"
+            )
+        return response
+
+    def measure(self, run, repeat, setup=None):
+        """
+        Fastest wall time of `repeat` runs, plus the query count and peak
+        traced memory of one more run. The plan cache is cleared before every
+        run so each one generates its plans.
+        """
+
+        def prepare():
+            plan_cache.clear()
+            if setup:
+                setup()
+
+        # Warm up (URL resolver, imports, first-run state)
+        prepare()
+        run()
+
+        wall_times = []
+        for _ in range(repeat):
+            prepare()
+            started = time.perf_counter()
+            run()
+            wall_times.append(time.perf_counter() - started)
+
+        prepare()
+        tracemalloc.start()
+        with CaptureQueriesContext(connection) as queries:
+            run()
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        return {
+            "wall_time_ms": round(min(wall_times) * 1000, 3),
+            "queries": len(queries),
+            "peak_memory_kb": round(peak_memory / 1024, 1),
+        }
+
+    def compare(self, cases, baseline, threshold):
+        regressions = []
+        for name, result in cases.items():
+            base = baseline.get(name)
+            if base is None:
+                self.stdout.write(f"{name}: {self.describe(result)} (new case)")
+                continue
+
+            self.stdout.write(
+                f"{name}: {self.describe(result)} (baseline {self.describe(base)})"
+            )
+            if (
+                result["wall_time_ms"] > base["wall_time_ms"] * (1 + threshold)
+                and result["wall_time_ms"] - base["wall_time_ms"] > TIME_SLACK_MS
+            ):
+                regressions.append(
+                    f"{name}: wall time {base['wall_time_ms']} -> "
+                    f"{result['wall_time_ms']} ms"
+                )
+            if result["queries"] > base["queries"]:
+                regressions.append(
+                    f"{name}: queries {base['queries']} -> {result['queries']}"
+                )
+            if result["peak_memory_kb"] > base["peak_memory_kb"] * (1 + threshold):
+                regressions.append(
+                    f"{name}: peak memory {base['peak_memory_kb']} -> "
+                    f"{result['peak_memory_kb']} KiB"
+                )
+        return regressions
+
+    def describe(self, result):
+        return (
+            f"{result['wall_time_ms']:.1f} ms, {result['queries']} queries, "
+            f"{result['peak_memory_kb']:.0f} KiB"
+        )
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from users.quiz_bundles import bundle_keys, quiz_bundles
+
+
+class Command(BaseCommand):
+    help = (
+        "Write the gzipped, versioned JSON question bundle of every subject and "
+        "level to the bundle directory, removing outdated versions. The API "
+        "also rebuilds bundles on its own when questions change."
+    )
+
+    def handle(self, *args, **options):
+        for subject, level in bundle_keys():
+            bundle = quiz_bundles.build(subject, level)
+            self.stdout.write(
+                f"{bundle.file_name}: {bundle.count} questions, "
+                f"{len(bundle.body)} bytes"
+            )
+        self.stdout.write(self.style.SUCCESS(f"Bundles written to {quiz_bundles.directory}."))
@@ -0,0 +1,68 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from users.question_import import (
+    BATCH_SIZE,
+    QuestionImportError,
+    detect_format,
+    import_questions,
+    import_rows,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Import quiz questions from an NDJSON or CSV file, streaming it in "
+        "batches. Invalid rows and questions already in the bank are skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="NDJSON (.ndjson/.jsonl) or CSV file.")
+        parser.add_argument(
+            "--format",
+            choices=["csv", "ndjson"],
+            default=None,
+            help="File format, when the extension doesn't tell.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BATCH_SIZE,
+            help="Rows validated and inserted per batch.",
+        )
+
+    def handle(self, *args, **options):
+        file_format = options["format"] or detect_format(options["path"])
+        if file_format is None:
+            raise CommandError("Unknown file format; pass --format csv or ndjson.")
+
+        if settings.DEBUG:
+            # Every insert is then logged with its parameters quoted by SQLite
+            # one by one, which makes large imports several times slower
+            self.stderr.write(
+                self.style.WARNING(
+                    "DEBUG is on, which slows large imports down; "
+                    "run with DEBUG off for big files."
+                )
+            )
+
+        started = time.perf_counter()
+        try:
+            with open(options["path"], encoding="utf-8-sig", newline="") as lines:
+                report = import_questions(
+                    import_rows(lines, file_format), options["batch_size"]
+                )
+        except (OSError, QuestionImportError, UnicodeDecodeError) as e:
+            raise CommandError(str(e))
+
+        for error in report["errors"]:
+            self.stderr.write(f"Line {error['line']}: {error['errors']}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {report['created']} questions in "
+                f"{time.perf_counter() - started:.1f}s ({report['duplicates']} "
+                f"duplicates, {report['invalid']} invalid rows)."
+            )
+        )
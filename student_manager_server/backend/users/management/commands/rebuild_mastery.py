@@ -0,0 +1,83 @@
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from users.mastery import rebuild_user_mastery
+from users.models import QuizResult, UserMastery
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild every user's mastery summary from their quiz results, or "
+        "with --verify only check the stored summaries against them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help="Report summaries that differ from the quiz results without writing.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="Number of users rebuilt or verified per batch.",
+        )
+
+    def handle(self, *args, **options):
+        user_ids = sorted(
+            set(QuizResult.objects.values_list("user_id", flat=True).distinct())
+            | set(UserMastery.objects.values_list("user_id", flat=True))
+        )
+
+        mismatches = []
+        rebuilt = 0
+        for id_chunk in chunked(user_ids, options["chunk_size"]):
+            summaries = dict(rebuild_user_mastery(id_chunk))
+            stored = dict(
+                UserMastery.objects.filter(user_id__in=id_chunk).values_list(
+                    "user_id", "subjects"
+                )
+            )
+            if options["verify"]:
+                mismatches += [
+                    user_id
+                    for user_id in id_chunk
+                    if summaries.get(user_id, []) != stored.get(user_id, [])
+                ]
+                continue
+
+            with transaction.atomic():
+                UserMastery.objects.filter(user_id__in=id_chunk).delete()
+                UserMastery.objects.bulk_create(
+                    [
+                        UserMastery(user_id=user_id, subjects=subjects)
+                        for user_id, subjects in summaries.items()
+                    ]
+                )
+            rebuilt += len(summaries)
+
+        if options["verify"]:
+            if mismatches:
+                raise CommandError(
+                    f"{len(mismatches)} of {len(user_ids)} mastery summaries are "
+                    f"out of date (users {', '.join(map(str, mismatches[:20]))}"
+                    f"{', ...' if len(mismatches) > 20 else ''}). "
+                    "Run rebuild_mastery to fix them."
+                )
+            self.stdout.write(
+                self.style.SUCCESS(f"All {len(user_ids)} mastery summaries match.")
+            )
+            return
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt the mastery summaries of {rebuilt} users.")
+        )
@@ -0,0 +1,234 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from users.mastery import first_results_by_level
+from users.models import StudyPlan, TaskEvent, UserMastery, UserPreference
+from users.plan_days import (
+    all_study_dates,
+    changed_study_dates,
+    replan_study_plan,
+    sync_study_plan_days,
+)
+from users.scheduling import (
+    STUDY_TYPE,
+    StudyPlanError,
+    generator_params,
+    plan_task,
+    preference_inputs,
+)
+from users.sync import touch
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+class Command(BaseCommand):
+    help = (
+        "Regenerate the study plan of every pending task for every user, "
+        "spreading plan generation across worker processes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Number of worker processes (default: one per CPU, 1 runs in-process).",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="Number of tasks loaded, planned and written back per batch.",
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        started = time.perf_counter()
+        totals = {"created": 0, "updated": 0, "skipped": 0, "failed": 0}
+
+        task_ids = list(
+            TaskEvent.objects.filter(status="Pending")
+            .order_by("user_id", "id")
+            .values_list("id", flat=True)
+        )
+
+        executor = None
+        if options["workers"] != 1:
+            executor = ProcessPoolExecutor(max_workers=options["workers"])
+
+        try:
+            for id_chunk in chunked(task_ids, chunk_size):
+                self.replan_chunk(id_chunk, executor, totals)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Replanned in {time.perf_counter() - started:.1f}s: "
+                f"{totals['created']} created, {totals['updated']} updated, "
+                f"{totals['skipped']} skipped (no preferences), "
+                f"{totals['failed']} failed."
+            )
+        )
+
+    def replan_chunk(self, id_chunk, executor, totals):
+        task_chunk = list(
+            TaskEvent.objects.filter(id__in=id_chunk).only(
+                "id",
+                "user_id",
+                "subject",
+                "start_date",
+                "event_date",
+                "estimated_study_hours",
+                "skip_days",
+            )
+        )
+        user_ids = {task.user_id for task in task_chunk}
+
+        # Load everything the chunk's plans depend on with one query per model
+        preferences = {
+            user_preference.user_id: preference_inputs(user_preference)
+            for user_preference in UserPreference.objects.filter(user_id__in=user_ids)
+        }
+        masteries = dict(
+            UserMastery.objects.filter(user_id__in=user_ids).values_list(
+                "user_id", "subjects"
+            )
+        )
+
+        existing_plans = {}
+        for study_plan in StudyPlan.objects.filter(
+            event_id__in=[task.id for task in task_chunk]
+        ).only(
+            "id",
+            "event_id",
+            "rolling_horizon",
+            "plan",
+            "generator_params",
+            "day_overrides",
+        ):
+            existing_plans.setdefault(study_plan.event_id_id, []).append(study_plan)
+
+        jobs = {}
+        tasks_by_id = {}
+        for task in task_chunk:
+            if task.user_id not in preferences:
+                totals["skipped"] += 1
+                continue
+            tasks_by_id[task.id] = task
+            jobs[task.id] = (
+                task.id,
+                preferences[task.user_id],
+                first_results_by_level(
+                    masteries.get(task.user_id, []), task.subject
+                ),
+                {
+                    "subject": task.subject,
+                    "study_start_date": task.start_date.isoformat(),
+                    "exam_date": task.event_date.isoformat(),
+                    "estimated_study_hours": task.estimated_study_hours,
+                    "skip_days": task.skip_days or [],
+                },
+            )
+
+        # Rolling plans generate their days on read, so tasks with only those
+        # are replanned here without generating a whole plan in the workers
+        rolling_task_ids = {
+            task_id
+            for task_id in jobs
+            if existing_plans.get(task_id)
+            and all(
+                study_plan.rolling_horizon for study_plan in existing_plans[task_id]
+            )
+        }
+        plan_jobs = [
+            job for task_id, job in jobs.items() if task_id not in rolling_task_ids
+        ]
+        if executor is None:
+            results = map(plan_task, plan_jobs)
+        else:
+            results = executor.map(
+                plan_task, plan_jobs, chunksize=max(len(plan_jobs) // 32, 1)
+            )
+        results = chain(
+            ((task_id, None, None) for task_id in rolling_task_ids), results
+        )
+
+        today = timezone.localdate()
+        plans_to_create = []
+        plans_to_update = []
+        changed_dates = {}
+        for task_id, plan, error in results:
+            task = tasks_by_id[task_id]
+            if error is not None:
+                totals["failed"] += 1
+                self.stderr.write(f"Task {task_id}: {error}")
+                continue
+
+            params = generator_params(*jobs[task_id][1:])
+            study_plans = existing_plans.get(task_id)
+            if study_plans:
+                for study_plan in study_plans:
+                    study_plan.user_id = task.user_id
+                    study_plan.subject = task.subject
+                    study_plan.study_type = STUDY_TYPE
+                    if study_plan.rolling_horizon:
+                        # Only the days from today are regenerated, the past
+                        # ones are stored
+                        try:
+                            changed_dates[study_plan.id] = replan_study_plan(
+                                study_plan, params, today
+                            )
+                        except StudyPlanError as e:
+                            totals["failed"] += 1
+                            self.stderr.write(f"Task {task_id}: {e}")
+                            continue
+                        plans_to_update.append(study_plan)
+                    else:
+                        changed_dates[study_plan.id] = changed_study_dates(
+                            study_plan.plan, plan
+                        )
+                        study_plan.generator_params = params
+                        study_plan.plan = plan
+                        study_plan.day_overrides = {}
+                        plans_to_update.append(study_plan)
+            else:
+                plans_to_create.append(
+                    StudyPlan(
+                        user_id=task.user_id,
+                        subject=task.subject,
+                        study_type=STUDY_TYPE,
+                        plan=plan,
+                        event_id_id=task_id,
+                        generator_params=params,
+                    )
+                )
+
+        with transaction.atomic():
+            StudyPlan.objects.bulk_create(plans_to_create)
+            StudyPlan.objects.bulk_update(
+                touch(plans_to_update),
+                [
+                    "user",
+                    "subject",
+                    "study_type",
+                    "plan",
+                    "generator_params",
+                    "day_overrides",
+                    "updated_at",
+                ],
+            )
+            changed_dates.update(all_study_dates(plans_to_create))
+            sync_study_plan_days(plans_to_create + plans_to_update, changed_dates)
+        totals["created"] += len(plans_to_create)
+        totals["updated"] += len(plans_to_update)
@@ -0,0 +1,175 @@
+from .models import QuizResult, UserMastery
+
+LEVELS = ["Beginner", "Intermediate", "Advanced"]
+
+
+def apply_quiz_result(subjects, quiz_result):
+    """
+    Fold a written QuizResult (new or updated) into a mastery summary.
+    subjects lists, in the order they were first taken, each subject with its
+    levels, and for each level the first and latest result by primary key.
+    """
+    subject = next(
+        (entry for entry in subjects if entry["subject"] == quiz_result.subject), None
+    )
+    if subject is None:
+        subject = {"subject": quiz_result.subject, "levels": []}
+        subjects.append(subject)
+
+    level = next(
+        (entry for entry in subject["levels"] if entry["level"] == quiz_result.level),
+        None,
+    )
+    if level is None:
+        level = {"level": quiz_result.level}
+        subject["levels"].append(level)
+        level["first_id"] = level["last_id"] = quiz_result.id
+
+    result = {"results": quiz_result.results, "score": quiz_result.score}
+    if quiz_result.id <= level["first_id"]:
+        level.update(
+            first_id=quiz_result.id,
+            first_results=result["results"],
+            first_score=result["score"],
+        )
+    if quiz_result.id >= level["last_id"]:
+        level.update(
+            last_id=quiz_result.id,
+            last_results=result["results"],
+            last_score=result["score"],
+        )
+    return subjects
+
+
+def record_quiz_result(quiz_result):
+    """
+    Update the user's mastery summary with a QuizResult that was just saved.
+    Call it in the transaction of the write so the two stay consistent.
+    """
+    mastery, _ = UserMastery.objects.select_for_update().get_or_create(
+        user_id=quiz_result.user_id
+    )
+    apply_quiz_result(mastery.subjects, quiz_result)
+    mastery.save(update_fields=["subjects"])
+
+
+def record_quiz_results(quiz_results):
+    """
+    record_quiz_result for many QuizResults at once, in a fixed number of
+    queries however many users they belong to.
+    """
+    masteries = UserMastery.objects.select_for_update().in_bulk(
+        {quiz_result.user_id for quiz_result in quiz_results}
+    )
+    new_masteries = {}
+    for quiz_result in quiz_results:
+        mastery = masteries.get(quiz_result.user_id)
+        if mastery is None:
+            mastery = new_masteries.setdefault(
+                quiz_result.user_id, UserMastery(user_id=quiz_result.user_id)
+            )
+        apply_quiz_result(mastery.subjects, quiz_result)
+    UserMastery.objects.bulk_update(masteries.values(), ["subjects"])
+    UserMastery.objects.bulk_create(new_masteries.values())
+
+
+def user_mastery(user_id):
+    """The mastery summary of a user (empty when they have no quiz results)."""
+    return (
+        UserMastery.objects.filter(user_id=user_id)
+        .values_list("subjects", flat=True)
+        .first()
+        or []
+    )
+
+
+def first_results_by_level(subjects, subject):
+    """
+    Map each level of the subject to the results string of its first
+    QuizResult, the same row .filter(level=...).first() would return.
+    """
+    for entry in subjects:
+        if entry["subject"] == subject:
+            return {
+                level["level"]: level["first_results"] for level in entry["levels"]
+            }
+    return {}
+
+
+def latest_scores_by_level(subjects, subject):
+    """Map each level of the subject to the score of its latest QuizResult."""
+    for entry in subjects:
+        if entry["subject"] == subject:
+            return {level["level"]: level["last_score"] for level in entry["levels"]}
+    return {}
+
+
+def weighted_overall_percentage(subjects):
+    """
+    Weighted 0.5/0.35/0.15 (Advanced/Intermediate/Beginner) score of the
+    first result of each level, whatever its subject.
+    """
+    first_scores = {}
+    for level in LEVELS:
+        firsts = [
+            entry
+            for subject in subjects
+            for entry in subject["levels"]
+            if entry["level"] == level
+        ]
+        first = min(firsts, key=lambda entry: entry["first_id"], default=None)
+        first_scores[level] = (first and first["first_score"]) or 0.0
+    return (
+        (first_scores["Advanced"] * 0.5)
+        + (first_scores["Intermediate"] * 0.35)
+        + (first_scores["Beginner"] * 0.15)
+    )
+
+
+def latest_results_by_subject(subjects):
+    """Map each subject to {level: latest results string}, every level included."""
+    results_by_subject = {}
+    for subject in subjects:
+        results_by_subject[subject["subject"]] = {
+            level["level"]: level["last_results"] for level in subject["levels"]
+        }
+        for level in LEVELS:
+            results_by_subject[subject["subject"]].setdefault(level, None)
+    return results_by_subject
+
+
+def level_averages(subjects):
+    """Average score of the latest result of each level across subjects."""
+    scores = {level: [] for level in LEVELS}
+    for subject in subjects:
+        for level in subject["levels"]:
+            if level["level"] in scores and level["last_score"] is not None:
+                scores[level["level"]].append(level["last_score"])
+    return {
+        level: sum(level_scores) / len(level_scores) if level_scores else None
+        for level, level_scores in scores.items()
+    }
+
+
+def rebuild_user_mastery(user_ids=None):
+    """
+    Recompute mastery summaries from the QuizResult rows, for the given
+    users or everyone. Yields (user_id, subjects) for every user with results.
+    """
+    quiz_results = QuizResult.objects.only(
+        "id", "user_id", "subject", "level", "results", "score"
+    ).order_by("user_id", "id")
+    if user_ids is not None:
+        quiz_results = quiz_results.filter(user_id__in=user_ids)
+
+    user_id = None
+    subjects = []
+    for quiz_result in quiz_results.iterator(chunk_size=2000):
+        if quiz_result.user_id != user_id:
+            if user_id is not None:
+                yield user_id, subjects
+            user_id = quiz_result.user_id
+            subjects = []
+        apply_quiz_result(subjects, quiz_result)
+    if user_id is not None:
+        yield user_id, subjects
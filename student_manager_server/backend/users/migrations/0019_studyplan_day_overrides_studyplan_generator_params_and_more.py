@@ -0,0 +1,28 @@
+# Generated by Django 4.2.20 on 2026-10-18 18:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0018_notification'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studyplan',
+            name='day_overrides',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='studyplan',
+            name='generator_params',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='studyplan',
+            name='rolling_horizon',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,100 @@
+# Generated by Django 4.2.20 on 2026-10-18 18:16
+
+from datetime import datetime
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_study_plan_days(apps, schema_editor):
+    StudyPlan = apps.get_model("users", "StudyPlan")
+    StudyPlanDay = apps.get_model("users", "StudyPlanDay")
+    StudySession = apps.get_model("users", "StudySession")
+
+    days = []
+    day_sessions = []
+
+    def flush():
+        StudyPlanDay.objects.bulk_create(days)
+        StudySession.objects.bulk_create(
+            [
+                StudySession(
+                    day=day,
+                    position=position,
+                    start_time=session["start_time"],
+                    end_time=session["end_time"],
+                    hours_to_study=session["hours_to_study"],
+                )
+                for day, sessions in zip(days, day_sessions)
+                for position, session in enumerate(sessions)
+            ]
+        )
+        days.clear()
+        day_sessions.clear()
+
+    study_plans = StudyPlan.objects.filter(rolling_horizon=False).only(
+        "id", "user_id", "plan"
+    )
+    for study_plan in study_plans.iterator(chunk_size=500):
+        for day in study_plan.plan or []:
+            try:
+                study_date = datetime.strptime(day["study_date"], "%Y-%m-%d").date()
+            except (KeyError, TypeError, ValueError):
+                continue
+            days.append(
+                StudyPlanDay(
+                    study_plan_id=study_plan.id,
+                    user_id=study_plan.user_id,
+                    study_date=study_date,
+                    subject=day.get("subject", ""),
+                    study_time=day.get("study_time", ""),
+                    total_hours=day.get("total_hours", 0),
+                )
+            )
+            day_sessions.append(day.get("sessions") or [])
+        if len(days) >= 5000:
+            flush()
+    flush()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('users', '0019_studyplan_day_overrides_studyplan_generator_params_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudyPlanDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('study_date', models.DateField()),
+                ('subject', models.CharField(max_length=100)),
+                ('study_time', models.CharField(max_length=20)),
+                ('total_hours', models.FloatField()),
+                ('study_plan', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='days', to='users.studyplan')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='StudySession',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveSmallIntegerField()),
+                ('start_time', models.CharField(max_length=5)),
+                ('end_time', models.CharField(max_length=5)),
+                ('hours_to_study', models.FloatField()),
+                ('day', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sessions', to='users.studyplanday')),
+            ],
+            options={
+                'ordering': ['day', 'position'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='studyplanday',
+            index=models.Index(fields=['user', 'study_date'], name='users_study_user_id_f7b800_idx'),
+        ),
+        migrations.RunPython(backfill_study_plan_days, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.20 on 2026-10-18 18:29
+
+from django.db import migrations, models
+
+
+def backfill_quiz_result_scores(apps, schema_editor):
+    QuizResult = apps.get_model("users", "QuizResult")
+
+    quiz_results = []
+    for quiz_result in QuizResult.objects.only("id", "results").iterator(
+        chunk_size=2000
+    ):
+        try:
+            quiz_result.score = float(quiz_result.results.replace("%", "").strip())
+        except (AttributeError, ValueError):
+            continue
+        quiz_results.append(quiz_result)
+    QuizResult.objects.bulk_update(quiz_results, ["score"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0020_studyplanday_studysession_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quizresult',
+            name='score',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_quiz_result_scores, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 4.2.20 on 2026-10-18 18:31
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_user_mastery(apps, schema_editor):
+    QuizResult = apps.get_model("users", "QuizResult")
+    UserMastery = apps.get_model("users", "UserMastery")
+
+    # In id order, the first row seen of a level is its first result and the
+    # last row seen its latest one
+    summaries = {}
+    for quiz_result in QuizResult.objects.order_by("id").iterator(chunk_size=2000):
+        subjects = summaries.setdefault(quiz_result.user_id, {})
+        levels = subjects.setdefault(quiz_result.subject, {})
+        result = {
+            "id": quiz_result.id,
+            "results": quiz_result.results,
+            "score": quiz_result.score,
+        }
+        levels.setdefault(quiz_result.level, {"first": result})["last"] = result
+
+    UserMastery.objects.bulk_create(
+        [
+            UserMastery(
+                user_id=user_id,
+                subjects=[
+                    {
+                        "subject": subject,
+                        "levels": [
+                            {
+                                "level": level,
+                                "first_id": results["first"]["id"],
+                                "last_id": results["last"]["id"],
+                                "first_results": results["first"]["results"],
+                                "first_score": results["first"]["score"],
+                                "last_results": results["last"]["results"],
+                                "last_score": results["last"]["score"],
+                            }
+                            for level, results in levels.items()
+                        ],
+                    }
+                    for subject, levels in subjects.items()
+                ],
+            )
+            for user_id, subjects in summaries.items()
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('users', '0021_quizresult_score'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserMastery',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='mastery', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('subjects', models.JSONField(default=list)),
+            ],
+        ),
+        migrations.RunPython(backfill_user_mastery, migrations.RunPython.noop),
+    ]
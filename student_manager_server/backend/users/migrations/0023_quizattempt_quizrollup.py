@@ -0,0 +1,52 @@
+# Generated by Django 4.2.20 on 2026-10-18 18:34
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('users', '0022_usermastery'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuizRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.CharField(choices=[('day', 'Day'), ('week', 'Week')], max_length=4)),
+                ('subject', models.CharField(choices=[('DSA', 'Data Structures & Algorithms'), ('OOP', 'Object-Oriented Programming'), ('SE', 'Software Engineering')], max_length=28)),
+                ('level', models.CharField(choices=[('Beginner', 'Beginner'), ('Intermediate', 'Intermediate'), ('Advanced', 'Advanced')], max_length=12)),
+                ('bucket_start', models.DateField()),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('scored_attempts', models.PositiveIntegerField(default=0)),
+                ('score_total', models.FloatField(default=0)),
+                ('best_score', models.FloatField(blank=True, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='QuizAttempt',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.CharField(choices=[('DSA', 'Data Structures & Algorithms'), ('OOP', 'Object-Oriented Programming'), ('SE', 'Software Engineering')], max_length=28)),
+                ('level', models.CharField(choices=[('Beginner', 'Beginner'), ('Intermediate', 'Intermediate'), ('Advanced', 'Advanced')], max_length=12)),
+                ('results', models.TextField()),
+                ('score', models.FloatField(blank=True, null=True)),
+                ('attempted_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='quizrollup',
+            constraint=models.UniqueConstraint(fields=('user', 'bucket', 'subject', 'level', 'bucket_start'), name='unique_quiz_rollup_bucket'),
+        ),
+        migrations.AddIndex(
+            model_name='quizattempt',
+            index=models.Index(fields=['user', 'subject', 'attempted_at'], name='users_quiza_user_id_c6720c_idx'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.20 on 2026-10-18 18:36
+
+import hashlib
+import json
+
+from django.db import migrations, models
+
+
+def backfill_question_content_hashes(apps, schema_editor):
+    QuizQuestion = apps.get_model("users", "QuizQuestion")
+
+    questions = []
+    for question in QuizQuestion.objects.iterator(chunk_size=2000):
+        content = [question.subject, question.question.strip()] + [
+            choice.strip()
+            for choice in [
+                question.choice_1,
+                question.choice_2,
+                question.choice_3,
+                question.choice_4,
+            ]
+        ]
+        question.content_hash = hashlib.sha256(
+            json.dumps(content, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()
+        questions.append(question)
+    QuizQuestion.objects.bulk_update(questions, ["content_hash"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0023_quizattempt_quizrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quizquestion',
+            name='content_hash',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=64),
+        ),
+        migrations.RunPython(
+            backfill_question_content_hashes, migrations.RunPython.noop
+        ),
+    ]
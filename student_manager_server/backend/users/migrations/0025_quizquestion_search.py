@@ -0,0 +1,71 @@
+from django.db import migrations
+
+COLUMNS = [
+    "question",
+    "choice_1",
+    "choice_2",
+    "choice_3",
+    "choice_4",
+]
+
+FIELDS = ", ".join(COLUMNS)
+NEW_VALUES = ", ".join(f"new.{column}" for column in COLUMNS)
+OLD_VALUES = ", ".join(f"old.{column}" for column in COLUMNS)
+
+# External content FTS5 index of the question text and choices, with prefix
+# indexes for search-as-you-type. The triggers keep it in sync with every
+# write, bulk_create and queryset updates included.
+CREATE_SEARCH_INDEX = [
+    f"""
+    CREATE VIRTUAL TABLE users_quizquestion_fts USING fts5(
+        {FIELDS},
+        content='users_quizquestion',
+        content_rowid='id',
+        tokenize='porter unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER users_quizquestion_fts_insert AFTER INSERT ON users_quizquestion
+    BEGIN
+        INSERT INTO users_quizquestion_fts (rowid, {FIELDS})
+        VALUES (new.id, {NEW_VALUES});
+    END
+    """,
+    f"""
+    CREATE TRIGGER users_quizquestion_fts_delete AFTER DELETE ON users_quizquestion
+    BEGIN
+        INSERT INTO users_quizquestion_fts (users_quizquestion_fts, rowid, {FIELDS})
+        VALUES ('delete', old.id, {OLD_VALUES});
+    END
+    """,
+    f"""
+    CREATE TRIGGER users_quizquestion_fts_update
+    AFTER UPDATE OF {FIELDS} ON users_quizquestion
+    BEGIN
+        INSERT INTO users_quizquestion_fts (users_quizquestion_fts, rowid, {FIELDS})
+        VALUES ('delete', old.id, {OLD_VALUES});
+        INSERT INTO users_quizquestion_fts (rowid, {FIELDS})
+        VALUES (new.id, {NEW_VALUES});
+    END
+    """,
+    "INSERT INTO users_quizquestion_fts (users_quizquestion_fts) VALUES ('rebuild')",
+]
+
+DROP_SEARCH_INDEX = [
+    "DROP TRIGGER IF EXISTS users_quizquestion_fts_insert",
+    "DROP TRIGGER IF EXISTS users_quizquestion_fts_delete",
+    "DROP TRIGGER IF EXISTS users_quizquestion_fts_update",
+    "DROP TABLE IF EXISTS users_quizquestion_fts",
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0024_quizquestion_content_hash"),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_SEARCH_INDEX, DROP_SEARCH_INDEX),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.20 on 2026-10-18 19:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0026_questionstats'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='taskevent',
+            index=models.Index(fields=['user', 'status', 'event_date'], name='users_taske_user_id_b43f98_idx'),
+        ),
+    ]
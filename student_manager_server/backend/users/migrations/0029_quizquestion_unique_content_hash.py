@@ -0,0 +1,96 @@
+# Generated by Django 4.2.20 on 2026-10-18 19:48
+
+import hashlib
+import json
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+FIELDS = "question, choice_1, choice_2, choice_3, choice_4"
+NEW_VALUES = "new.question, new.choice_1, new.choice_2, new.choice_3, new.choice_4"
+OLD_VALUES = "old.question, old.choice_1, old.choice_2, old.choice_3, old.choice_4"
+
+# The full-text search triggers of migration 0025, which SQLite drops when
+# AlterField rebuilds users_quizquestion
+CREATE_SEARCH_TRIGGERS = [
+    f"""
+    CREATE TRIGGER users_quizquestion_fts_insert AFTER INSERT ON users_quizquestion
+    BEGIN
+        INSERT INTO users_quizquestion_fts (rowid, {FIELDS})
+        VALUES (new.id, {NEW_VALUES});
+    END
+    """,
+    f"""
+    CREATE TRIGGER users_quizquestion_fts_delete AFTER DELETE ON users_quizquestion
+    BEGIN
+        INSERT INTO users_quizquestion_fts (users_quizquestion_fts, rowid, {FIELDS})
+        VALUES ('delete', old.id, {OLD_VALUES});
+    END
+    """,
+    f"""
+    CREATE TRIGGER users_quizquestion_fts_update
+    AFTER UPDATE OF {FIELDS} ON users_quizquestion
+    BEGIN
+        INSERT INTO users_quizquestion_fts (users_quizquestion_fts, rowid, {FIELDS})
+        VALUES ('delete', old.id, {OLD_VALUES});
+        INSERT INTO users_quizquestion_fts (rowid, {FIELDS})
+        VALUES (new.id, {NEW_VALUES});
+    END
+    """,
+]
+
+DROP_SEARCH_TRIGGERS = [
+    "DROP TRIGGER IF EXISTS users_quizquestion_fts_insert",
+    "DROP TRIGGER IF EXISTS users_quizquestion_fts_delete",
+    "DROP TRIGGER IF EXISTS users_quizquestion_fts_update",
+]
+
+
+def delete_duplicate_questions(apps, schema_editor):
+    """Keep the first of the questions sharing a content hash."""
+    QuizQuestion = apps.get_model("users", "QuizQuestion")
+
+    questions = []
+    for question in QuizQuestion.objects.filter(content_hash="").iterator():
+        content = [question.subject, question.question.strip()] + [
+            choice.strip()
+            for choice in [
+                question.choice_1,
+                question.choice_2,
+                question.choice_3,
+                question.choice_4,
+            ]
+        ]
+        question.content_hash = hashlib.sha256(
+            json.dumps(content, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()
+        questions.append(question)
+    QuizQuestion.objects.bulk_update(questions, ["content_hash"], batch_size=500)
+
+    for duplicate in (
+        QuizQuestion.objects.values("content_hash")
+        .annotate(count=Count("id"), first_id=Min("id"))
+        .filter(count__gt=1)
+    ):
+        QuizQuestion.objects.filter(content_hash=duplicate["content_hash"]).exclude(
+            id=duplicate["first_id"]
+        ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0028_sync_updated_at_tombstone'),
+    ]
+
+    operations = [
+        # Reversed last: the triggers are dropped again by reversing AlterField
+        migrations.RunSQL(migrations.RunSQL.noop, CREATE_SEARCH_TRIGGERS),
+        migrations.RunPython(delete_duplicate_questions, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='quizquestion',
+            name='content_hash',
+            field=models.CharField(default='', editable=False, max_length=64, unique=True),
+        ),
+        migrations.RunSQL(CREATE_SEARCH_TRIGGERS, DROP_SEARCH_TRIGGERS),
+    ]
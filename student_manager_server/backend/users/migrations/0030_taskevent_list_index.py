@@ -0,0 +1,21 @@
+# Generated by Django 4.2.20 on 2026-10-18 19:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0029_quizquestion_unique_content_hash'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='taskevent',
+            name='users_taske_user_id_b43f98_idx',
+        ),
+        migrations.AddIndex(
+            model_name='taskevent',
+            index=models.Index(fields=['user', 'event_date', 'id'], name='users_taske_user_id_ce8697_idx'),
+        ),
+    ]
@@ -1,10 +1,26 @@
 # users/models.py
+import hashlib
 import json
 from django.db import models
 from django.contrib.auth.models import User
 from django.db.models import JSONField
+from django.utils import timezone
 
 
+def question_content_hash(subject, question, choices):
+    """
+    Hex SHA-256 of what makes two questions the same: the subject, the
+    question text and the four choices, with surrounding whitespace ignored.
+    """
+    content = [subject, question.strip()] + [choice.strip() for choice in choices]
+    return hashlib.sha256(
+        json.dumps(content, ensure_ascii=False).encode("utf-8")
+    ).hexdigest()
+
+
+# Full-text searched through users_quizquestion_fts, which triggers on this
+# table keep in sync (migration 0025). SQLite drops triggers when a migration
+# rebuilds the table, so such migrations must create them again.
 class QuizQuestion(models.Model):
     SUBJECT_CHOICES = [
         ("DSA", "Data Structures & Algorithms"),
@@ -26,10 +42,41 @@ class QuizQuestion(models.Model):
     choice_4 = models.CharField(max_length=255)
     correct_answer = models.CharField(max_length=255)
     difficulty_level = models.CharField(max_length=12, choices=DIFFICULTY_CHOICES)
+    # Set on save; imports skip questions whose hash is already stored
+    content_hash = models.CharField(
+        max_length=64, unique=True, editable=False, default=""
+    )
 
     def __str__(self):
         return f"{self.subject} - {self.difficulty_level} - {self.question}"
 
+    @property
+    def choices(self):
+        return [self.choice_1, self.choice_2, self.choice_3, self.choice_4]
+
+    def save(self, *args, **kwargs):
+        self.content_hash = question_content_hash(
+            self.subject, self.question, self.choices
+        )
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "content_hash"}
+        super().save(*args, **kwargs)
+
+
+class QuestionStats(models.Model):
+    question = models.OneToOneField(
+        QuizQuestion, on_delete=models.CASCADE, primary_key=True, related_name="stats"
+    )
+    attempts = models.PositiveIntegerField(default=0)  # Graded answers
+    correct = models.PositiveIntegerField(default=0)
+    difficulty = models.FloatField(
+        default=0.0
+    )  # Running logit estimate within the question's level (see question_stats.py)
+
+    def __str__(self):
+        return f"Stats of question {self.question_id}: {self.correct}/{self.attempts}"
+
 
 class Resource(models.Model):
     SUBJECT_CHOICES = [
@@ -53,6 +100,14 @@ class Resource(models.Model):
         return f"{self.subject} - {self.study_level} - {self.resource}"
 
 
+def parse_score(results):
+    """The number in a quiz results string ("85%" -> 85.0), None if there is none."""
+    try:
+        return float(results.replace("%", "").strip())
+    except (AttributeError, ValueError):
+        return None
+
+
 class QuizResult(models.Model):
     SUBJECT_CHOICES = [
         ("DSA", "Data Structures & Algorithms"),
@@ -69,12 +124,94 @@ class QuizResult(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     subject = models.CharField(max_length=28, choices=SUBJECT_CHOICES)
     level = models.CharField(max_length=12, choices=LEVEL_CHOICES)
-    results = models.TextField()
+    results = models.TextField()  # Percentage string, e.g. "85%"
+    score = models.FloatField(
+        null=True, blank=True
+    )  # results as a number (85.0), for aggregating in the database
+
+    def save(self, *args, **kwargs):
+        # Keep score in sync with results (or results with score when only
+        # the score is given)
+        if self.results:
+            self.score = parse_score(self.results)
+        elif self.score is not None:
+            self.results = f"{self.score:g}%"
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and (
+            "results" in update_fields or "score" in update_fields
+        ):
+            kwargs["update_fields"] = {*update_fields, "results", "score"}
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.user.username} - {self.subject} - {self.level} - {self.results}"
 
 
+class QuizAttempt(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    subject = models.CharField(max_length=28, choices=QuizResult.SUBJECT_CHOICES)
+    level = models.CharField(max_length=12, choices=QuizResult.LEVEL_CHOICES)
+    results = models.TextField()  # Percentage string as submitted, e.g. "85%"
+    score = models.FloatField(null=True, blank=True)  # results as a number
+    attempted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [models.Index(fields=["user", "subject", "attempted_at"])]
+
+    def save(self, *args, **kwargs):
+        # Attempts are a log: they are added, never changed
+        if not self._state.adding:
+            raise ValueError("Quiz attempts are append-only.")
+        if self.score is None:
+            self.score = parse_score(self.results)
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.user.username} - {self.subject} - {self.level} - {self.results} ({self.attempted_at:%Y-%m-%d %H:%M})"
+
+
+class QuizRollup(models.Model):
+    BUCKET_CHOICES = [
+        ("day", "Day"),
+        ("week", "Week"),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    bucket = models.CharField(max_length=4, choices=BUCKET_CHOICES)
+    subject = models.CharField(max_length=28, choices=QuizResult.SUBJECT_CHOICES)
+    level = models.CharField(max_length=12, choices=QuizResult.LEVEL_CHOICES)
+    bucket_start = models.DateField()  # The day, or the Monday of the week
+    attempts = models.PositiveIntegerField(default=0)
+    scored_attempts = models.PositiveIntegerField(
+        default=0
+    )  # Attempts whose results could be read as a number
+    score_total = models.FloatField(default=0)
+    best_score = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "bucket", "subject", "level", "bucket_start"],
+                name="unique_quiz_rollup_bucket",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.subject} - {self.level} - {self.bucket} of {self.bucket_start}"
+
+
+class UserMastery(models.Model):
+    user = models.OneToOneField(
+        User, on_delete=models.CASCADE, primary_key=True, related_name="mastery"
+    )
+    subjects = models.JSONField(
+        default=list
+    )  # First and latest QuizResult of each subject and level (see users/mastery.py)
+
+    def __str__(self):
+        return f"Mastery of {self.user.username}"
+
+
 class TaskEvent(models.Model):
     TASK_TYPE_CHOICES = [
         ("Study", "Study"),
@@ -107,6 +244,16 @@ class TaskEvent(models.Model):
     skip_days = models.JSONField(
         default=list, blank=True, null=True
     )  # Store list of days to skip (e.g., ["Monday", "Wednesday"])
+    # Set on every write; bulk_update callers set it themselves (sync.touch)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Task lists are read in (event_date, id) order, a page at a time
+            models.Index(fields=["user", "event_date", "id"]),
+            # Delta sync reads what changed since the client's cursor
+            models.Index(fields=["user", "updated_at"]),
+        ]
 
     def __str__(self):
         skip_days_str = (
@@ -179,6 +326,19 @@ class StudyPlan(models.Model):
         models.JSONField()
     )  # Store the plan as a JSON object (detailed study sessions)
     event_id = models.ForeignKey(TaskEvent, on_delete=models.CASCADE)
+    generator_params = models.JSONField(
+        null=True, blank=True
+    )  # Inputs the plan was generated from (preferences, quiz results, task)
+    rolling_horizon = models.BooleanField(
+        default=False
+    )  # Days are generated from generator_params; plan keeps replanned past days
+    day_overrides = models.JSONField(
+        default=dict, blank=True
+    )  # Manual edits of the plan, keyed by study_date (None = day removed)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["user", "updated_at"])]
 
     def __str__(self):
         return (
@@ -186,6 +346,43 @@ class StudyPlan(models.Model):
         )
 
 
+class StudyPlanDay(models.Model):
+    """One day of a stored StudyPlan.plan, kept in sync whenever the plan is written."""
+
+    study_plan = models.ForeignKey(
+        StudyPlan, on_delete=models.CASCADE, related_name="days"
+    )
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE
+    )  # Copied from the plan so a user's days can be looked up by date
+    study_date = models.DateField()
+    subject = models.CharField(max_length=100)
+    study_time = models.CharField(max_length=20)
+    total_hours = models.FloatField()
+
+    class Meta:
+        indexes = [models.Index(fields=["user", "study_date"])]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.subject} on {self.study_date}"
+
+
+class StudySession(models.Model):
+    day = models.ForeignKey(
+        StudyPlanDay, on_delete=models.CASCADE, related_name="sessions"
+    )
+    position = models.PositiveSmallIntegerField()  # Order of the session in its day
+    start_time = models.CharField(max_length=5)  # HH:MM, as in the plan JSON
+    end_time = models.CharField(max_length=5)
+    hours_to_study = models.FloatField()
+
+    class Meta:
+        ordering = ["day", "position"]
+
+    def __str__(self):
+        return f"{self.day} {self.start_time}-{self.end_time}"
+
+
 class DeviceToken(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     token = models.CharField(max_length=255, unique=True)
@@ -201,10 +398,37 @@ class Notification(models.Model):
     body = models.TextField()
     timestamp = models.DateTimeField(auto_now_add=True)
     is_read = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-timestamp']
+        indexes = [models.Index(fields=["user", "updated_at"])]
 
     def __str__(self):
         return f"{self.title} - {self.user.username}"
+
+
+class Tombstone(models.Model):
+    """
+    A task, study plan or notification that was deleted, so delta sync can
+    tell clients to drop it. Tasks are normally soft deleted (status
+    "Deleted") and need none.
+    """
+
+    KIND_CHOICES = [
+        ("tasks", "Task"),
+        ("study_plans", "Study plan"),
+        ("notifications", "Notification"),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [models.Index(fields=["user", "deleted_at"])]
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id} deleted at {self.deleted_at}"
     
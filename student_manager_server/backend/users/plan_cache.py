@@ -0,0 +1,158 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .scheduling import (
+    QUIZ_ADJUSTMENTS,
+    STRENGTH_RATINGS,
+    STUDY_START_HOURS,
+    WEAKNESS_RATINGS,
+    plan_study_days,
+)
+
+# Bump when plan_study_days changes in a way the rule tables below don't capture
+PLAN_CACHE_VERSION = 1
+
+RULES_FINGERPRINT = hashlib.sha256(
+    json.dumps(
+        [
+            PLAN_CACHE_VERSION,
+            STRENGTH_RATINGS,
+            WEAKNESS_RATINGS,
+            QUIZ_ADJUSTMENTS,
+            STUDY_START_HOURS,
+        ],
+        sort_keys=True,
+    ).encode()
+).hexdigest()[:16]
+
+
+def plan_cache_key(preferences, quiz_results, task):
+    """
+    Stable hash of exactly the inputs a generated plan depends on.
+    Inputs that produce the same plan (skip_days order, quiz levels that are
+    never scored) hash to the same key.
+    """
+    key_data = {
+        "preferences": {
+            "hours_per_day": preferences["hours_per_day"],
+            "days_per_week": preferences["days_per_week"],
+            "preferred_study_time": preferences["preferred_study_time"],
+            "strengths": preferences.get("strengths") or [],
+            "weaknesses": preferences.get("weaknesses") or [],
+        },
+        "quiz_results": {
+            level: quiz_results.get(level) for level in QUIZ_ADJUSTMENTS
+        },
+        "task": {
+            "subject": task.get("subject"),
+            "study_start_date": task.get("study_start_date"),
+            "exam_date": task.get("exam_date"),
+            "estimated_study_hours": task.get("estimated_study_hours"),
+            "skip_days": sorted(task.get("skip_days") or []),
+        },
+    }
+    digest = hashlib.sha256(
+        json.dumps(key_data, sort_keys=True, default=str).encode()
+    ).hexdigest()
+    return f"study-plan:{RULES_FINGERPRINT}:{digest}"
+
+
+class PlanCache:
+    """
+    Two-tier cache of generated plans: a bounded in-process LRU, backed by an
+    optional Django cache shared between workers. Plans are stored as JSON so
+    every caller gets its own copy.
+    """
+
+    def __init__(self, max_size=1024, cache_alias=None, timeout=None):
+        self.max_size = max_size
+        self.cache_alias = cache_alias
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.local_hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    @property
+    def shared_cache(self):
+        return caches[self.cache_alias] if self.cache_alias else None
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.local_hits += 1
+                return json.loads(self._entries[key])
+
+        if self.shared_cache is not None:
+            plan_json = self.shared_cache.get(key)
+            if plan_json is not None:
+                with self._lock:
+                    self.shared_hits += 1
+                self._store_local(key, plan_json)
+                return json.loads(plan_json)
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key, plan):
+        plan_json = json.dumps(plan)
+        self._store_local(key, plan_json)
+        if self.shared_cache is not None:
+            self.shared_cache.set(key, plan_json, self.timeout)
+
+    def _store_local(self, key, plan_json):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = plan_json
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.local_hits = self.shared_hits = self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.local_hits + self.shared_hits + self.misses
+            return {
+                "local_hits": self.local_hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "hit_rate": (
+                    round((self.local_hits + self.shared_hits) / lookups, 4)
+                    if lookups
+                    else None
+                ),
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "shared_cache": self.cache_alias,
+            }
+
+
+_cache_settings = getattr(settings, "STUDY_PLAN_CACHE", {})
+plan_cache = PlanCache(
+    max_size=_cache_settings.get("MAX_SIZE", 1024),
+    cache_alias=_cache_settings.get("CACHE_ALIAS"),
+    timeout=_cache_settings.get("TIMEOUT"),
+)
+
+
+def cached_plan_study_days(preferences, quiz_results, task):
+    """plan_study_days, returning a stored plan when the inputs were seen before."""
+    key = plan_cache_key(preferences, quiz_results, task)
+    plan = plan_cache.get(key)
+    if plan is None:
+        plan = plan_study_days(preferences, quiz_results, task)
+        plan_cache.set(key, plan)
+    return plan
@@ -0,0 +1,413 @@
+from collections import Counter
+from datetime import date, datetime, timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import StudyPlan, StudyPlanDay, StudySession
+from .scheduling import (
+    StudyPlanError,
+    apply_day_overrides,
+    count_overlaps,
+    find_overlaps,
+    parse_plan_date,
+    plan_layout,
+    plan_study_days,
+)
+
+# Days listed with their conflict count in summarize_session_conflicts
+MAX_CONFLICT_SUMMARY_DAYS = 31
+
+
+def sync_study_plan_days(study_plans, changed_dates):
+    """
+    Rewrite the StudyPlanDay/StudySession rows of the given plans from their
+    plan JSON, which stays what the study plan endpoints return.
+    changed_dates maps a plan id to the study_dates (YYYY-MM-DD) whose day
+    changed (see changed_study_dates and all_study_dates); only those rows
+    are rewritten. Rolling-horizon plans only store their days before
+    "replanned_from" in plan.
+    """
+    study_plans = [
+        study_plan for study_plan in study_plans if changed_dates.get(study_plan.id)
+    ]
+    if not study_plans:
+        return
+
+    stale_days = Q()
+    for study_plan in study_plans:
+        stale_days |= Q(
+            study_plan_id=study_plan.id,
+            study_date__in=sorted(changed_dates[study_plan.id]),
+        )
+    # Deletes their sessions too
+    StudyPlanDay.objects.filter(stale_days).delete()
+
+    days = []
+    day_sessions = []
+    for study_plan in study_plans:
+        for day in study_plan.plan:
+            if day["study_date"] not in changed_dates[study_plan.id]:
+                continue
+            days.append(
+                StudyPlanDay(
+                    study_plan_id=study_plan.id,
+                    user_id=study_plan.user_id,
+                    study_date=datetime.strptime(day["study_date"], "%Y-%m-%d").date(),
+                    subject=day["subject"],
+                    study_time=day["study_time"],
+                    total_hours=day["total_hours"],
+                )
+            )
+            day_sessions.append(day["sessions"])
+
+    StudyPlanDay.objects.bulk_create(days)
+    StudySession.objects.bulk_create(
+        [
+            StudySession(
+                day=day,
+                position=position,
+                start_time=session["start_time"],
+                end_time=session["end_time"],
+                hours_to_study=session["hours_to_study"],
+            )
+            for day, sessions in zip(days, day_sessions)
+            for position, session in enumerate(sessions)
+        ]
+    )
+
+
+def all_study_dates(study_plans):
+    """changed_dates for sync_study_plan_days of plans with no stored days yet."""
+    return {
+        study_plan.id: {day["study_date"] for day in study_plan.plan}
+        for study_plan in study_plans
+    }
+
+
+def changed_study_dates(old_days, new_days):
+    """The study_dates whose day differs between two lists of plan days."""
+    old_by_date = {day["study_date"]: day for day in old_days}
+    new_by_date = {day["study_date"]: day for day in new_days}
+    return {
+        study_date
+        for study_date in old_by_date.keys() | new_by_date.keys()
+        if old_by_date.get(study_date) != new_by_date.get(study_date)
+    }
+
+
+def generated_days(params, date_from=None, date_to=None):
+    """
+    Generate the days of generator_params between date_from and date_to
+    (the whole plan when both are None). Params replanned incrementally
+    generate no days before "replanned_from".
+    """
+    replanned_from = params.get("replanned_from")
+    if replanned_from:
+        replanned_from = date.fromisoformat(replanned_from)
+        if date_from is None or date_from < replanned_from:
+            date_from = replanned_from
+    if date_from is not None and date_to is not None and date_from > date_to:
+        return []
+    try:
+        return plan_study_days(
+            params["preferences"],
+            params["quiz_results"],
+            params["task"],
+            date_from,
+            date_to,
+        )
+    except StudyPlanError:
+        return []
+
+
+def replan_study_plan(study_plan, params, today):
+    """
+    Replan study_plan with new generator_params from today on, keeping the
+    days before today and the days the user edited. Only the days from today
+    are generated; a rolling-horizon plan stores its days before today in
+    plan, as a regular plan does. Returns the study_dates whose stored day
+    changed.
+    Raises StudyPlanError when no plan can be generated from params.
+    """
+    layout = plan_layout(params["preferences"], params["quiz_results"], params["task"])
+    previous = study_plan.generator_params
+    if study_plan.rolling_horizon:
+        past_days = []
+        if previous and today > layout["start_date"].date():
+            # The new params can't generate the days before today, which
+            # are stored instead along with their edits
+            yesterday = today - timedelta(days=1)
+            past_days = rolling_study_plan_days(study_plan, date_to=yesterday)
+            study_plan.plan = study_plan.plan + past_days
+            study_plan.day_overrides = {
+                study_date: day
+                for study_date, day in study_plan.day_overrides.items()
+                if study_date >= today.isoformat()
+            }
+            params = {**params, "replanned_from": today.isoformat()}
+        study_plan.generator_params = params
+        return {day["study_date"] for day in past_days}
+
+    remaining_days = apply_day_overrides(
+        plan_study_days(
+            params["preferences"], params["quiz_results"], params["task"], today
+        ),
+        study_plan.day_overrides,
+        date_from=today,
+    )
+    past_days = []
+    old_remaining_days = []
+    for day in study_plan.plan:
+        if day["study_date"] < today.isoformat():
+            past_days.append(day)
+        else:
+            old_remaining_days.append(day)
+
+    study_plan.generator_params = params
+    study_plan.plan = past_days + remaining_days
+    return changed_study_dates(old_remaining_days, remaining_days)
+
+
+def rolling_study_plan_days(study_plan, date_from=None, date_to=None):
+    """
+    The days of a rolling-horizon plan between date_from and date_to that
+    are generated rather than stored in plan (and StudyPlanDay rows), with
+    the user's edits.
+    """
+    replanned_from = study_plan.generator_params.get("replanned_from")
+    if replanned_from:
+        replanned_from = date.fromisoformat(replanned_from)
+        if date_from is None or date_from < replanned_from:
+            date_from = replanned_from
+    return apply_day_overrides(
+        generated_days(study_plan.generator_params, date_from, date_to),
+        study_plan.day_overrides,
+        date_from,
+        date_to,
+    )
+
+
+def materialize_study_plan(study_plan, date_from=None, date_to=None):
+    """
+    Return the days of a study plan between date_from and date_to (inclusive).
+    Rolling plans only generate the days of that window; without a window they
+    cover the next STUDY_PLAN_WINDOW_DAYS days from today (or from their start).
+    """
+    if study_plan.rolling_horizon and date_from is None and date_to is None:
+        plan_start = parse_plan_date(
+            study_plan.generator_params["task"]["study_start_date"]
+        ).date()
+        date_from = max(timezone.localdate(), plan_start)
+        date_to = date_from + timedelta(days=settings.STUDY_PLAN_WINDOW_DAYS - 1)
+
+    if date_from is None and date_to is None:
+        stored_days = study_plan.plan
+    else:
+        stored_days = [
+            day
+            for day in study_plan.plan
+            if (date_from is None or day["study_date"] >= date_from.isoformat())
+            and (date_to is None or day["study_date"] <= date_to.isoformat())
+        ]
+    if not study_plan.rolling_horizon:
+        return stored_days
+    return stored_days + rolling_study_plan_days(study_plan, date_from, date_to)
+
+
+def all_study_plan_days(study_plan):
+    """Every day of a study plan, generated for rolling-horizon plans."""
+    if not study_plan.rolling_horizon:
+        return study_plan.plan
+    return study_plan.plan + rolling_study_plan_days(study_plan)
+
+
+def day_session_intervals(study_date, sessions):
+    """
+    (start, end) in minutes from the start of the calendar of one day's
+    (start_time, end_time) sessions, in order. Times are HH:MM, so a session
+    starting earlier than the one before it, or ending earlier than it
+    starts, has run past midnight.
+    """
+    day_start = study_date.toordinal() * 1440
+    intervals = []
+    previous_start = day_start
+    for start_time, end_time in sessions:
+        start_hour, start_minute = map(int, start_time.split(":"))
+        end_hour, end_minute = map(int, end_time.split(":"))
+        start = day_start + start_hour * 60 + start_minute
+        if start < previous_start:
+            start += 1440
+        length = (end_hour * 60 + end_minute - start_hour * 60 - start_minute) % 1440
+        intervals.append((start, start + length))
+        previous_start = start
+    return intervals
+
+
+def user_study_sessions(user, date_from=None, date_to=None):
+    """
+    Every study session of the user between date_from and date_to (inclusive,
+    open-ended when None), from the stored days of the plans and the
+    generated days of rolling-horizon plans. Each session carries its
+    (start, end) interval from day_session_intervals.
+    """
+    stored_sessions = StudySession.objects.filter(day__user=user)
+    if date_from:
+        stored_sessions = stored_sessions.filter(day__study_date__gte=date_from)
+    if date_to:
+        stored_sessions = stored_sessions.filter(day__study_date__lte=date_to)
+
+    days = {}
+    for (
+        day_id,
+        study_plan_id,
+        event_id,
+        subject,
+        study_date,
+        start_time,
+        end_time,
+    ) in stored_sessions.order_by("day_id", "position").values_list(
+        "day_id",
+        "day__study_plan_id",
+        "day__study_plan__event_id",
+        "day__subject",
+        "day__study_date",
+        "start_time",
+        "end_time",
+    ):
+        day = days.setdefault(
+            ("stored", day_id),
+            {
+                "study_plan_id": study_plan_id,
+                "event_id": event_id,
+                "subject": subject,
+                "study_date": study_date,
+                "sessions": [],
+            },
+        )
+        day["sessions"].append((start_time, end_time))
+
+    for study_plan in StudyPlan.objects.filter(user=user, rolling_horizon=True):
+        for day in rolling_study_plan_days(study_plan, date_from, date_to):
+            days[("rolling", study_plan.id, day["study_date"])] = {
+                "study_plan_id": study_plan.id,
+                "event_id": study_plan.event_id_id,
+                "subject": day["subject"],
+                "study_date": datetime.strptime(day["study_date"], "%Y-%m-%d").date(),
+                "sessions": [
+                    (session["start_time"], session["end_time"])
+                    for session in day["sessions"]
+                ],
+            }
+
+    sessions = []
+    for day in days.values():
+        intervals = day_session_intervals(day["study_date"], day["sessions"])
+        for (start_time, end_time), interval in zip(day["sessions"], intervals):
+            sessions.append(
+                {
+                    "study_plan_id": day["study_plan_id"],
+                    "event_id": day["event_id"],
+                    "subject": day["subject"],
+                    "study_date": day["study_date"],
+                    "start_time": start_time,
+                    "end_time": end_time,
+                    "interval": interval,
+                }
+            )
+    return sessions
+
+
+def overlapping_sessions(user, study_plan_ids=None, date_from=None, date_to=None):
+    """
+    The (first, second) pairs of overlapping study sessions of the user, from
+    user_study_sessions. When study_plan_ids is given, only the pairs
+    involving one of those plans are returned.
+    """
+    sessions = user_study_sessions(user, date_from, date_to)
+    for first_index, second_index in find_overlaps(
+        [session["interval"] for session in sessions]
+    ):
+        first, second = sessions[first_index], sessions[second_index]
+        if study_plan_ids is None or (
+            first["study_plan_id"] in study_plan_ids
+            or second["study_plan_id"] in study_plan_ids
+        ):
+            yield first, second
+
+
+def find_session_conflicts(user, study_plan_ids=None, date_from=None, date_to=None):
+    """
+    Overlapping pairs of the user's study sessions. When study_plan_ids is
+    given, only the conflicts involving one of those plans are returned.
+    """
+    conflicts = [
+        {
+            "study_date": second["study_date"].isoformat(),
+            "sessions": [
+                {
+                    "study_plan_id": session["study_plan_id"],
+                    "event_id": session["event_id"],
+                    "subject": session["subject"],
+                    "study_date": session["study_date"].isoformat(),
+                    "start_time": session["start_time"],
+                    "end_time": session["end_time"],
+                }
+                for session in (first, second)
+            ],
+        }
+        for first, second in overlapping_sessions(
+            user, study_plan_ids, date_from, date_to
+        )
+    ]
+    conflicts.sort(key=lambda conflict: conflict["study_date"])
+    return conflicts
+
+
+def summarize_session_conflicts(user, study_plans):
+    """
+    How many of the user's study sessions overlap those of study_plans, just
+    saved, between the first and last day of those plans (their current
+    window for rolling-horizon plans), with the number of days that have some and
+    the count of the first MAX_CONFLICT_SUMMARY_DAYS of them. study-plans/conflicts/
+    lists the conflicts themselves for the returned date_from and date_to.
+    """
+    study_dates = set()
+    for study_plan in study_plans:
+        study_dates.update(
+            day["study_date"] for day in materialize_study_plan(study_plan)
+        )
+    if not study_dates:
+        return {
+            "count": 0,
+            "date_from": None,
+            "date_to": None,
+            "day_count": 0,
+            "days": [],
+        }
+
+    date_from = date.fromisoformat(min(study_dates))
+    date_to = date.fromisoformat(max(study_dates))
+    study_plan_ids = {study_plan.id for study_plan in study_plans}
+    sessions = user_study_sessions(user, date_from, date_to)
+    counts = count_overlaps(
+        [session["interval"] for session in sessions],
+        [session["study_plan_id"] in study_plan_ids for session in sessions],
+    )
+    day_counts = Counter()
+    for session, count in zip(sessions, counts):
+        if count:
+            day_counts[session["study_date"]] += count
+    return {
+        "count": sum(day_counts.values()),
+        "date_from": date_from.isoformat(),
+        "date_to": date_to.isoformat(),
+        "day_count": len(day_counts),
+        "days": [
+            {"study_date": study_date.isoformat(), "count": count}
+            for study_date, count in sorted(day_counts.items())[
+                :MAX_CONFLICT_SUMMARY_DAYS
+            ]
+        ],
+    }
@@ -0,0 +1,320 @@
+import random
+import threading
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import QuestionStats, QuizQuestion
+from .question_stats import target_difficulty
+
+VERSION_KEY = "quiz-question-bank:version"
+
+_bank_settings = getattr(settings, "QUIZ_QUESTION_BANK", {})
+RECENT_QUESTIONS = _bank_settings.get("RECENT_QUESTIONS", 50)
+RECENT_TIMEOUT = _bank_settings.get("RECENT_TIMEOUT")
+ADAPTIVE_INDEX_TTL = _bank_settings.get("ADAPTIVE_INDEX_TTL", 300)
+
+# Spread of the difficulty drawn around an adaptive quiz's target
+ADAPTIVE_SPREAD = 0.5
+
+
+def serialize_question(question):
+    """The dict GetQuizQuestions returns for a question."""
+    return {
+        "id": question.id,
+        "question": question.question,
+        "choices": [
+            question.choice_1,
+            question.choice_2,
+            question.choice_3,
+            question.choice_4,
+        ],
+        "correct_answer": question.correct_answer,
+        "difficulty_level": question.difficulty_level,
+    }
+
+
+class DifficultyIndex:
+    """A pool's question indexes sorted by their estimated difficulty."""
+
+    def __init__(self, difficulties):
+        self.order = sorted(range(len(difficulties)), key=difficulties.__getitem__)
+        self.difficulties = [difficulties[index] for index in self.order]
+        self.mean = sum(difficulties) / len(difficulties) if difficulties else 0.0
+        self.built_at = time.monotonic()
+
+
+class QuestionPool:
+    """The questions of one (subject, difficulty_level), in id order."""
+
+    def __init__(self):
+        self.ids = []
+        self.questions = []
+        # Built on the first adaptive quiz, rebuilt after ADAPTIVE_INDEX_TTL
+        self.difficulty_index = None
+
+    def sample(self, k, exclude=frozenset()):
+        """
+        Up to k random questions as (ids, questions), avoiding the ids in
+        exclude unless too few other questions are left. Takes O(k + len(exclude))
+        however many questions the pool has.
+        """
+        size = len(self.ids)
+        if size - len(exclude) >= 2 * k:
+            # Plenty of fresh questions: draw indexes until k fresh ones are found
+            picked = []
+            chosen = set()
+            while len(picked) < k:
+                index = random.randrange(size)
+                if index in chosen or self.ids[index] in exclude:
+                    continue
+                chosen.add(index)
+                picked.append(index)
+        else:
+            # Small pool (size < 2k + len(exclude)): split it into fresh and seen
+            fresh = []
+            seen = []
+            for index, question_id in enumerate(self.ids):
+                (seen if question_id in exclude else fresh).append(index)
+            picked = random.sample(fresh, min(k, len(fresh)))
+            if len(picked) < k:
+                picked += random.sample(seen, min(k - len(picked), len(seen)))
+        return (
+            [self.ids[index] for index in picked],
+            [self.questions[index] for index in picked],
+        )
+
+    def sample_near(self, k, target, exclude=frozenset()):
+        """
+        Up to k questions as (ids, questions), each the nearest in difficulty
+        to a random draw around target, avoiding the ids in exclude unless too
+        few other questions are left. Takes O(log n) per question, plus the
+        chosen and excluded questions it steps over.
+        """
+        index = self.difficulty_index
+        picked = []
+        chosen = set()
+        for _ in range(min(k, len(index.order))):
+            drawn = random.gauss(target, ADAPTIVE_SPREAD)
+            # Fresh questions first; only then the recently seen ones
+            candidate = self.nearest(
+                drawn, lambda i: i in chosen or self.ids[i] in exclude
+            )
+            if candidate is None:
+                candidate = self.nearest(drawn, chosen.__contains__)
+            chosen.add(candidate)
+            picked.append(candidate)
+        return (
+            [self.ids[index] for index in picked],
+            [self.questions[index] for index in picked],
+        )
+
+    def nearest(self, difficulty, skip):
+        """The index of the question nearest in difficulty not skipped, or None."""
+        index = self.difficulty_index
+        size = len(index.order)
+        above = bisect_left(index.difficulties, difficulty)
+        below = above - 1
+        while below >= 0 or above < size:
+            if above == size or (
+                below >= 0
+                and difficulty - index.difficulties[below]
+                <= index.difficulties[above] - difficulty
+            ):
+                candidate = index.order[below]
+                below -= 1
+            else:
+                candidate = index.order[above]
+                above += 1
+            if not skip(candidate):
+                return candidate
+        return None
+
+
+class QuestionBank:
+    """
+    Process-local copy of the quiz questions, serialized and pooled by
+    (subject, difficulty_level). A version counter in an optional Django cache
+    shared between workers tells every process when to drop its copy; the
+    same cache remembers the questions each user saw recently.
+    The returned question dicts are shared, so callers must not modify them.
+    """
+
+    def __init__(self, cache_alias=None):
+        self.cache_alias = cache_alias
+        self._entries = {}
+        # Correct answer by question id, for grading
+        self._answers = {}
+        self._version = None
+        self._lock = threading.Lock()
+
+    @property
+    def shared_cache(self):
+        return caches[self.cache_alias] if self.cache_alias else None
+
+    def shared_version(self):
+        if self.shared_cache is None:
+            return self._version
+        # A clock-based first value, so a counter that was evicted never
+        # comes back at a version some process still holds
+        return self.shared_cache.get_or_set(VERSION_KEY, time.time_ns, None)
+
+    def _sync_version(self, version):
+        # Call with the lock held
+        if version != self._version:
+            self._entries.clear()
+            self._answers.clear()
+            self._version = version
+
+    def pool(self, subject, level):
+        """The QuestionPool of the subject and level."""
+        version = self.shared_version()
+        with self._lock:
+            self._sync_version(version)
+            pool = self._entries.get((subject, level))
+        if pool is not None:
+            return pool
+
+        # Load every level of the subject at once; quizzes often mix levels
+        loaded = {
+            (subject, difficulty_level): QuestionPool()
+            for difficulty_level in [level]
+            + [choice for choice, _ in QuizQuestion.DIFFICULTY_CHOICES]
+        }
+        subject_questions = QuizQuestion.objects.filter(subject=subject)
+        for question in subject_questions.order_by("id"):
+            pool = loaded.setdefault(
+                (subject, question.difficulty_level), QuestionPool()
+            )
+            pool.ids.append(question.id)
+            pool.questions.append(serialize_question(question))
+        with self._lock:
+            # Questions changed while loading: serve them, but don't keep them
+            if version == self._version:
+                self._entries.update(loaded)
+                for pool in loaded.values():
+                    for question in pool.questions:
+                        self._answers[question["id"]] = question["correct_answer"]
+        return loaded[(subject, level)]
+
+    def answer_key(self, question_ids):
+        """
+        Map each of the question ids to its correct answer, from memory when
+        possible; deleted questions are left out.
+        """
+        version = self.shared_version()
+        with self._lock:
+            self._sync_version(version)
+            answers = {
+                question_id: self._answers[question_id]
+                for question_id in question_ids
+                if question_id in self._answers
+            }
+        missing = [
+            question_id for question_id in question_ids if question_id not in answers
+        ]
+        if missing:
+            loaded = dict(
+                QuizQuestion.objects.filter(id__in=missing).values_list(
+                    "id", "correct_answer"
+                )
+            )
+            with self._lock:
+                if version == self._version:
+                    self._answers.update(loaded)
+            answers.update(loaded)
+        return answers
+
+    def indexed_pool(self, subject, level):
+        """The pool of the subject and level, with an up to date DifficultyIndex."""
+        pool = self.pool(subject, level)
+        index = pool.difficulty_index
+        if index is None or time.monotonic() - index.built_at > ADAPTIVE_INDEX_TTL:
+            estimates = dict(
+                QuestionStats.objects.filter(
+                    question__subject=subject, question__difficulty_level=level
+                ).values_list("question_id", "difficulty")
+            )
+            difficulties = [estimates.get(question_id, 0.0) for question_id in pool.ids]
+            pool.difficulty_index = DifficultyIndex(difficulties)
+        return pool
+
+    def sample_quiz(self, subject, counts, user_id=None, scores=None):
+        """
+        Random questions of the subject, counts mapping each level to the
+        number of questions wanted. With a user_id the questions the user saw
+        in their last RECENT_QUESTIONS draws of a level are avoided, and the
+        new ones remembered. With scores (the user's latest score of each
+        level, None when unknown) the quiz is adaptive: questions are drawn
+        near the difficulty the user should answer TARGET_SUCCESS of.
+        """
+        recent = self.recent_question_ids(user_id, subject, counts)
+        sampled = {}
+        questions = []
+        for level, k in counts.items():
+            exclude = frozenset(recent.get(level, ()))
+            if scores is None:
+                sampled[level], level_questions = self.pool(subject, level).sample(
+                    k, exclude
+                )
+            else:
+                pool = self.indexed_pool(subject, level)
+                target = target_difficulty(
+                    scores.get(level), pool.difficulty_index.mean
+                )
+                sampled[level], level_questions = pool.sample_near(
+                    k, target, exclude
+                )
+            questions += level_questions
+        self.remember_questions(user_id, subject, recent, sampled)
+        return questions
+
+    def recent_key(self, user_id, subject, level):
+        return f"quiz-recent:{user_id}:{subject}:{level}"
+
+    def recent_question_ids(self, user_id, subject, levels):
+        if user_id is None or self.shared_cache is None or not RECENT_QUESTIONS:
+            return {}
+        keys = {self.recent_key(user_id, subject, level): level for level in levels}
+        return {
+            keys[key]: question_ids
+            for key, question_ids in self.shared_cache.get_many(keys).items()
+        }
+
+    def remember_questions(self, user_id, subject, recent, sampled):
+        if user_id is None or self.shared_cache is None or not RECENT_QUESTIONS:
+            return
+        self.shared_cache.set_many(
+            {
+                self.recent_key(user_id, subject, level): (
+                    recent.get(level, []) + question_ids
+                )[-RECENT_QUESTIONS:]
+                for level, question_ids in sampled.items()
+            },
+            RECENT_TIMEOUT,
+        )
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+            self._answers.clear()
+            self._version = None
+        if self.shared_cache is not None:
+            try:
+                self.shared_cache.incr(VERSION_KEY)
+            except ValueError:
+                # The counter was evicted or never set
+                self.shared_cache.add(VERSION_KEY, time.time_ns(), None)
+
+
+question_bank = QuestionBank(cache_alias=_bank_settings.get("CACHE_ALIAS"))
+
+
+@receiver(post_save, sender=QuizQuestion)
+@receiver(post_delete, sender=QuizQuestion)
+def invalidate_question_bank(sender, **kwargs):
+    question_bank.invalidate()
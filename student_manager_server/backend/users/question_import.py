@@ -0,0 +1,193 @@
+import csv
+import io
+import json
+from itertools import islice
+
+from .models import QuizQuestion, question_content_hash
+from .question_bank import question_bank
+
+QUESTION_FIELDS = [
+    "subject",
+    "question",
+    "choice_1",
+    "choice_2",
+    "choice_3",
+    "choice_4",
+    "correct_answer",
+    "difficulty_level",
+]
+
+# (max_length, allowed values) of each field, checked on every row
+FIELD_RULES = {
+    name: (
+        QuizQuestion._meta.get_field(name).max_length,
+        {value for value, _ in QuizQuestion._meta.get_field(name).choices or []},
+    )
+    for name in QUESTION_FIELDS
+}
+
+FORMATS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+
+BATCH_SIZE = 2000
+
+# Only the first errors are kept so a bad file can't grow the report unbounded
+MAX_REPORTED_ERRORS = 100
+
+
+class QuestionImportError(ValueError):
+    """Raised when an import file cannot be read at all."""
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def detect_format(file_name):
+    """The import format ("csv" or "ndjson") of a file name, None if unknown."""
+    for extension, file_format in FORMATS.items():
+        if file_name.lower().endswith(extension):
+            return file_format
+    return None
+
+
+def text_lines(binary_file):
+    """Decode an uploaded or opened binary file as UTF-8, one line at a time."""
+    return io.TextIOWrapper(binary_file, encoding="utf-8-sig", newline="")
+
+
+def ndjson_rows(lines):
+    """Yield (line_number, row, error) for every non-blank line of NDJSON."""
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line), None
+        except ValueError as e:
+            yield line_number, None, f"Invalid JSON: {e}"
+
+
+def csv_rows(lines):
+    """Yield (line_number, row, error) for every record of a CSV with a header."""
+    reader = csv.DictReader(lines)
+    fieldnames = reader.fieldnames or []
+    missing = [name for name in QUESTION_FIELDS if name not in fieldnames]
+    if missing:
+        raise QuestionImportError(f"CSV header is missing: {', '.join(missing)}")
+    try:
+        for row in reader:
+            yield reader.line_num, row, None
+    except csv.Error as e:
+        raise QuestionImportError(f"Line {reader.line_num}: {e}")
+
+
+def import_rows(lines, file_format):
+    if file_format == "csv":
+        return csv_rows(lines)
+    if file_format == "ndjson":
+        return ndjson_rows(lines)
+    raise QuestionImportError(f"Unsupported format: {file_format}")
+
+
+def clean_row(row):
+    """
+    Check a row against the QuizQuestion fields the way QuizQuestionSerializer
+    would (values trimmed, required, not blank, within max_length, valid
+    choices) without its per-field overhead. Returns (fields, errors).
+    """
+    if not isinstance(row, dict):
+        return None, {"non_field_errors": ["Expected an object."]}
+
+    # NDJSON rows may list the answers as "choices", like GetQuizQuestions does
+    choices = row.get("choices")
+    if isinstance(choices, list) and len(choices) == 4:
+        row = {**row}
+        for number, choice in enumerate(choices, start=1):
+            row[f"choice_{number}"] = choice
+
+    fields = {}
+    errors = {}
+    for name, (max_length, allowed) in FIELD_RULES.items():
+        if name not in row:
+            errors[name] = ["This field is required."]
+            continue
+        value = row[name]
+        if value is None:
+            errors[name] = ["This field may not be null."]
+            continue
+        if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+            errors[name] = ["Not a valid string."]
+            continue
+        value = str(value).strip()
+        if not value:
+            errors[name] = ["This field may not be blank."]
+        elif max_length and len(value) > max_length:
+            errors[name] = [
+                f"Ensure this field has no more than {max_length} characters."
+            ]
+        elif allowed and value not in allowed:
+            errors[name] = [f'"{value}" is not a valid choice.']
+        else:
+            fields[name] = value
+    return fields, errors
+
+
+def import_questions(rows, batch_size=BATCH_SIZE):
+    """
+    Validate and insert quiz questions from (line_number, row, error) tuples,
+    one batch at a time so memory stays bounded whatever the file size.
+    Questions whose subject, text and choices are already stored (or appear
+    earlier in the file) are skipped, so an interrupted import can simply be
+    run again. Returns a report of what was created and skipped.
+    """
+    report = {"created": 0, "duplicates": 0, "invalid": 0, "errors": []}
+    try:
+        for batch in chunked(rows, batch_size):
+            questions = {}
+            for line_number, row, error in batch:
+                if error is not None:
+                    fields, errors = None, {"non_field_errors": [error]}
+                else:
+                    fields, errors = clean_row(row)
+                if errors:
+                    report["invalid"] += 1
+                    if len(report["errors"]) < MAX_REPORTED_ERRORS:
+                        report["errors"].append(
+                            {"line": line_number, "errors": errors}
+                        )
+                    continue
+
+                content_hash = question_content_hash(
+                    fields["subject"],
+                    fields["question"],
+                    [fields[f"choice_{i}"] for i in range(1, 5)],
+                )
+                if content_hash in questions:
+                    report["duplicates"] += 1
+                    continue
+                questions[content_hash] = QuizQuestion(
+                    content_hash=content_hash, **fields
+                )
+
+            # Earlier batches are already stored, so this also catches
+            # duplicates within the file
+            existing = set(
+                QuizQuestion.objects.filter(content_hash__in=list(questions))
+                .values_list("content_hash", flat=True)
+                .distinct()
+            )
+            new_questions = [
+                question
+                for content_hash, question in questions.items()
+                if content_hash not in existing
+            ]
+            # Questions another import stored meanwhile are skipped too
+            QuizQuestion.objects.bulk_create(new_questions, ignore_conflicts=True)
+            report["created"] += len(new_questions)
+            report["duplicates"] += len(questions) - len(new_questions)
+    finally:
+        # bulk_create sends no post_save signals
+        if report["created"]:
+            question_bank.invalidate()
+    return report
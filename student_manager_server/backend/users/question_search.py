@@ -0,0 +1,83 @@
+import re
+
+from django.db import connection
+
+from .models import QuizQuestion
+from .question_bank import serialize_question
+
+# FTS5 index of the question text and choices, kept in sync by the triggers
+# of migration 0025
+SEARCH_TABLE = "users_quizquestion_fts"
+
+# bm25 weight of each indexed column: matches in the question count double
+RANK = f"bm25({SEARCH_TABLE}, 2.0, 1.0, 1.0, 1.0, 1.0)"
+
+# Ranking costs about a microsecond per match, so a query matching much of
+# the bank only ranks its most recent matches
+MAX_RANKED_MATCHES = 2000
+
+
+def match_expression(text):
+    """
+    FTS5 query matching every word of text, the last one also as a prefix
+    (search-as-you-type), None when text has no words. Words are quoted, so
+    user input can never be read as FTS5 syntax.
+    """
+    words = re.findall(r"\w+", text)
+    if not words:
+        return None
+    expression = " ".join(f'"{word}"' for word in words)
+    # A single character would expand to most of the index
+    if len(words[-1]) > 1:
+        expression += "*"
+    return expression
+
+
+def search_questions(text, subject=None, level=None, limit=20, offset=0):
+    """
+    Questions matching text, best match first, as a list of QuizQuestions.
+    When more than MAX_RANKED_MATCHES questions match, only the most recently
+    added ones are ranked and returned.
+    """
+    expression = match_expression(text)
+    if expression is None:
+        return []
+
+    filters = ""
+    params = [expression]
+    if subject:
+        filters += " AND question.subject = %s"
+        params.append(subject)
+    if level:
+        filters += " AND question.difficulty_level = %s"
+        params.append(level)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            SELECT id FROM (
+                SELECT question.id, {RANK} AS score
+                FROM {SEARCH_TABLE}
+                JOIN users_quizquestion AS question
+                    ON question.id = {SEARCH_TABLE}.rowid
+                WHERE {SEARCH_TABLE} MATCH %s{filters}
+                ORDER BY {SEARCH_TABLE}.rowid DESC
+                LIMIT {MAX_RANKED_MATCHES}
+            )
+            ORDER BY score, id
+            LIMIT %s OFFSET %s
+            """,
+            params + [limit, offset],
+        )
+        question_ids = [row[0] for row in cursor.fetchall()]
+
+    questions = QuizQuestion.objects.in_bulk(question_ids)
+    return [
+        questions[question_id]
+        for question_id in question_ids
+        if question_id in questions
+    ]
+
+
+def serialize_search_result(question):
+    return {"subject": question.subject, **serialize_question(question)}
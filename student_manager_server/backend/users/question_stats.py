@@ -0,0 +1,94 @@
+import math
+
+from django.db.models import F
+
+from .models import QuestionStats
+
+# How far one answer moves a question's difficulty estimate
+DIFFICULTY_STEP = 0.3
+
+# Success rate adaptive quizzes aim for
+TARGET_SUCCESS = 0.7
+
+# Scores are clamped to this range before taking logits
+MIN_RATE = 0.05
+MAX_RATE = 0.95
+
+
+def logit(rate):
+    rate = min(max(rate, MIN_RATE), MAX_RATE)
+    return math.log(rate / (1 - rate))
+
+
+def expected_success(ability, difficulty):
+    """Chance a user of this ability answers a question of this difficulty."""
+    return 1 / (1 + math.exp(difficulty - ability))
+
+
+def quiz_ability(score, difficulties):
+    """
+    Ability a quiz score (0-100) shows: the mean difficulty of the quiz's
+    questions, plus the logit of the score.
+    """
+    return sum(difficulties) / len(difficulties) + logit(score / 100)
+
+
+def target_difficulty(score, mean_difficulty):
+    """
+    Difficulty of the questions a user with this latest score (None when
+    unknown) answers correctly TARGET_SUCCESS of the time, on the scale of a
+    pool whose questions average mean_difficulty.
+    """
+    if score is None:
+        return mean_difficulty
+    return mean_difficulty + logit(score / 100) - logit(TARGET_SUCCESS)
+
+
+def record_question_outcomes(quizzes):
+    """
+    Add graded answers to the per-question counters and move each question's
+    difficulty estimate (Elo style) towards what the answers show.
+    quizzes lists (score, graded question ids, correct question ids) per
+    graded quiz. Run it in a transaction: the expected outcomes come from the
+    estimates stored when it runs, so the updates feed back into the next
+    grading, and the counters are incremented in place, so concurrent
+    gradings never lose each other's answers.
+    """
+    question_ids = {
+        question_id for _, graded_ids, _ in quizzes for question_id in graded_ids
+    }
+    if not question_ids:
+        return
+
+    # Created first, so their rows are locked (or, on SQLite, the database
+    # is written to) before the estimates are read
+    QuestionStats.objects.bulk_create(
+        [QuestionStats(question_id=question_id) for question_id in question_ids],
+        ignore_conflicts=True,
+    )
+    difficulties = dict(
+        QuestionStats.objects.select_for_update()
+        .filter(question_id__in=question_ids)
+        .values_list("question_id", "difficulty")
+    )
+
+    deltas = {}
+    for score, graded_ids, correct_ids in quizzes:
+        ability = quiz_ability(
+            score, [difficulties[question_id] for question_id in graded_ids]
+        )
+        correct_ids = set(correct_ids)
+        for question_id in graded_ids:
+            correct = question_id in correct_ids
+            expected = expected_success(ability, difficulties[question_id])
+            delta = deltas.setdefault(question_id, [0, 0, 0.0])
+            delta[0] += 1
+            delta[1] += correct
+            delta[2] += DIFFICULTY_STEP * (expected - correct)
+
+    for question_id, (attempts, correct, difficulty) in deltas.items():
+        QuestionStats.objects.filter(question_id=question_id).update(
+            attempts=F("attempts") + attempts,
+            correct=F("correct") + correct,
+            difficulty=F("difficulty") + difficulty,
+        )
@@ -0,0 +1,150 @@
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+
+from .models import QuizQuestion
+from .question_bank import question_bank
+
+_bundle_settings = getattr(settings, "QUIZ_BUNDLES", {})
+BUNDLE_DIR = Path(
+    _bundle_settings.get("DIR", Path(settings.BASE_DIR) / "quiz_bundles")
+)
+
+# Cache-Control of a bundle requested by its current version (?v=), which
+# never changes; anything else must be revalidated with its ETag
+IMMUTABLE = "private, max-age=31536000, immutable"
+REVALIDATE = "private, no-cache"
+
+
+def bundle_keys():
+    """Every (subject, level) a bundle is built for."""
+    return [
+        (subject, level)
+        for subject, _ in QuizQuestion.SUBJECT_CHOICES
+        for level, _ in QuizQuestion.DIFFICULTY_CHOICES
+    ]
+
+
+class Bundle:
+    """The questions of one (subject, level) as gzipped JSON."""
+
+    def __init__(self, subject, level, version, count, body, pool):
+        self.subject = subject
+        self.level = level
+        # Hash of the uncompressed JSON: the file name suffix and the ETag
+        self.version = version
+        self.count = count
+        self.body = body
+        # The question bank pool the bundle was rendered from
+        self.pool = pool
+
+    @property
+    def file_name(self):
+        return f"{self.subject}-{self.level}.{self.version}.json.gz"
+
+
+class QuizBundles:
+    """
+    Prebuilt bundles of the question bank, written to BUNDLE_DIR and kept in
+    memory. A bundle is rendered again on first use after the question bank
+    reloads its pool (any question saved, deleted or imported); when its
+    content is the same, the file on disk is reused and the version (ETag)
+    stays the same.
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self._bundles = {}
+        self._lock = threading.Lock()
+
+    def get(self, subject, level):
+        pool = question_bank.pool(subject, level)
+        with self._lock:
+            bundle = self._bundles.get((subject, level))
+        if bundle is not None and bundle.pool is pool:
+            return bundle
+        return self.build(subject, level, pool)
+
+    def all(self):
+        return [self.get(subject, level) for subject, level in bundle_keys()]
+
+    def build(self, subject, level, pool=None):
+        """Render the bundle from the question bank and write it if it is new."""
+        if pool is None:
+            pool = question_bank.pool(subject, level)
+        questions = pool.questions
+        payload = json.dumps(
+            {"subject": subject, "level": level, "questions": questions},
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+        version = hashlib.sha256(payload).hexdigest()[:20]
+        bundle = Bundle(subject, level, version, len(questions), None, pool)
+
+        path = self.directory / bundle.file_name
+        try:
+            bundle.body = path.read_bytes()
+        except FileNotFoundError:
+            # mtime=0 so the same questions always give the same bytes
+            bundle.body = gzip.compress(payload, compresslevel=9, mtime=0)
+            self.write(path, bundle.body)
+            self.remove_old_versions(bundle)
+
+        with self._lock:
+            self._bundles[(subject, level)] = bundle
+        return bundle
+
+    def write(self, path, body):
+        # Write then rename, so readers never see a partial file
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            dir=self.directory, suffix=".tmp", delete=False
+        ) as temporary:
+            temporary.write(body)
+        os.replace(temporary.name, path)
+
+    def remove_old_versions(self, bundle):
+        for path in self.directory.glob(f"{bundle.subject}-{bundle.level}.*.json.gz"):
+            if path.name != bundle.file_name:
+                path.unlink(missing_ok=True)
+
+
+quiz_bundles = QuizBundles(BUNDLE_DIR)
+
+
+def accepts_gzip(request):
+    return "gzip" in request.headers.get("Accept-Encoding", "").lower()
+
+
+def bundle_response(request, etag, body, cache_control, gzipped=False):
+    """
+    Serve body (JSON, gzip compressed when gzipped) with a strong ETag, or a
+    304 when the client already holds it. Gzipped bodies are sent as they are
+    to clients accepting gzip and decompressed for the others.
+    """
+    if gzipped and not accepts_gzip(request):
+        body = gzip.decompress(body)
+        etag += "-identity"
+        gzipped = False
+    etag = f'"{etag}"'
+
+    if_none_match = parse_etags(request.headers.get("If-None-Match", ""))
+    if etag in if_none_match or "*" in if_none_match:
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(body, content_type="application/json")
+        if gzipped:
+            response["Content-Encoding"] = "gzip"
+    response["ETag"] = etag
+    response["Cache-Control"] = cache_control
+    patch_vary_headers(response, ["Accept-Encoding"])
+    return response
@@ -0,0 +1,162 @@
+import uuid
+
+from django.conf import settings
+from django.db import transaction
+
+from .mastery import record_quiz_results
+from .models import QuizResult
+from .question_bank import question_bank
+from .question_stats import record_question_outcomes
+from .quiz_history import record_quiz_attempts
+
+SESSION_TIMEOUT = getattr(settings, "QUIZ_QUESTION_BANK", {}).get(
+    "SESSION_TIMEOUT", 60 * 60 * 6
+)
+
+# Submissions graded per request at most
+MAX_SUBMISSIONS = 1000
+
+
+def session_key(session_id):
+    return f"quiz-session:{session_id}"
+
+
+def start_quiz_session(user_id, subject, level, questions):
+    """
+    Remember which questions a quiz served so its answers can be graded by
+    grade_submissions. Returns the session id, or None when the question bank
+    has no shared cache to keep sessions in.
+    """
+    if question_bank.shared_cache is None:
+        return None
+    session_id = uuid.uuid4().hex
+    question_bank.shared_cache.set(
+        session_key(session_id),
+        {
+            "user_id": user_id,
+            "subject": subject,
+            "level": level,
+            "question_ids": [question["id"] for question in questions],
+        },
+        SESSION_TIMEOUT,
+    )
+    return session_id
+
+
+def grade_answers(question_ids, answers, answer_key):
+    """
+    Grade answers ({question id: chosen answer}, ids as JSON object keys)
+    against the answer key. Questions deleted since the quiz started, which
+    are missing from the key, are not counted. Returns the ids of the graded
+    questions and of those answered correctly.
+    """
+    answers = {str(question_id): answer for question_id, answer in answers.items()}
+    graded_ids = [
+        question_id for question_id in question_ids if question_id in answer_key
+    ]
+    correct_ids = [
+        question_id
+        for question_id in graded_ids
+        if isinstance(answers.get(str(question_id)), str)
+        and answers[str(question_id)].strip() == answer_key[question_id].strip()
+    ]
+    return graded_ids, correct_ids
+
+
+def grade_submissions(user_id, submissions):
+    """
+    Grade the user's quiz submissions ({"session_id", "answers"} dicts) and
+    save each graded one as a QuizResult, with the mastery summary and
+    attempt history, and the per-question statistics, in one transaction.
+    Sessions are single-use: each is claimed by deleting it from the cache
+    before it is graded, so concurrent submissions of the same session are
+    graded once.
+    Returns a result or error dict per submission, in order.
+    """
+    cache = question_bank.shared_cache
+    session_ids = {submission["session_id"] for submission in submissions}
+    sessions = (
+        cache.get_many([session_key(session_id) for session_id in session_ids])
+        if cache is not None
+        else {}
+    )
+    answer_key = question_bank.answer_key(
+        {
+            question_id
+            for session in sessions.values()
+            for question_id in session["question_ids"]
+        }
+    )
+
+    outcomes = []
+    quiz_results = []
+    graded_quizzes = []
+    claimed_sessions = {}
+    for submission in submissions:
+        session_id = submission["session_id"]
+        session = sessions.get(session_key(session_id))
+        if session is None or session["user_id"] != user_id:
+            outcomes.append(
+                {"session_id": session_id, "error": "Unknown or expired quiz session."}
+            )
+            continue
+        graded_ids, correct_ids = grade_answers(
+            session["question_ids"], submission["answers"], answer_key
+        )
+        total = len(graded_ids)
+        if not total:
+            outcomes.append(
+                {"session_id": session_id, "error": "No questions left to grade."}
+            )
+            continue
+        # Only one of the requests grading the session deletes it
+        if not cache.delete(session_key(session_id)):
+            outcomes.append(
+                {"session_id": session_id, "error": "Quiz session already graded."}
+            )
+            continue
+        claimed_sessions[session_key(session_id)] = session
+
+        score = round(len(correct_ids) / total * 100, 2)
+        quiz_result = QuizResult(
+            user_id=user_id,
+            subject=session["subject"],
+            level=session["level"],
+            results=f"{score:g}%",
+            score=score,
+        )
+        quiz_results.append(quiz_result)
+        graded_quizzes.append((score, graded_ids, correct_ids))
+        outcomes.append(
+            {
+                "session_id": session_id,
+                "quiz_result": quiz_result,
+                "correct": len(correct_ids),
+                "total": total,
+                "correct_question_ids": correct_ids,
+            }
+        )
+
+    if quiz_results:
+        try:
+            with transaction.atomic():
+                QuizResult.objects.bulk_create(quiz_results)
+                record_quiz_results(quiz_results)
+                record_quiz_attempts(quiz_results)
+                record_question_outcomes(graded_quizzes)
+        except Exception:
+            # Nothing was saved, so the sessions can be submitted again
+            cache.set_many(claimed_sessions, SESSION_TIMEOUT)
+            raise
+
+    for outcome in outcomes:
+        quiz_result = outcome.pop("quiz_result", None)
+        if quiz_result is not None:
+            outcome.update(
+                quiz_result_id=quiz_result.id,
+                subject=quiz_result.subject,
+                level=quiz_result.level,
+                results=quiz_result.results,
+                score=quiz_result.score,
+            )
+    return outcomes
@@ -0,0 +1,126 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from .models import QuizAttempt, QuizRollup
+
+
+def bucket_starts(attempted_on):
+    """The (bucket, bucket_start) rollups a day falls in; weeks start on Monday."""
+    return [
+        ("day", attempted_on),
+        ("week", attempted_on - timedelta(days=attempted_on.weekday())),
+    ]
+
+
+def record_quiz_attempt(quiz_result):
+    """
+    Append a QuizAttempt for a QuizResult that was just saved and add it to
+    its daily and weekly rollups. Call it in the transaction of the write.
+    """
+    attempt = QuizAttempt.objects.create(
+        user_id=quiz_result.user_id,
+        subject=quiz_result.subject,
+        level=quiz_result.level,
+        results=quiz_result.results,
+        score=quiz_result.score,
+    )
+
+    attempted_on = timezone.localdate(attempt.attempted_at)
+    for bucket, bucket_start in bucket_starts(attempted_on):
+        rollup, _ = QuizRollup.objects.select_for_update().get_or_create(
+            user_id=attempt.user_id,
+            bucket=bucket,
+            subject=attempt.subject,
+            level=attempt.level,
+            bucket_start=bucket_start,
+        )
+        add_to_rollup(rollup, attempt)
+        rollup.save()
+    return attempt
+
+
+def record_quiz_attempts(quiz_results):
+    """
+    record_quiz_attempt for many QuizResults at once, in a fixed number of
+    queries however many users and buckets they touch.
+    """
+    attempts = QuizAttempt.objects.bulk_create(
+        [
+            QuizAttempt(
+                user_id=quiz_result.user_id,
+                subject=quiz_result.subject,
+                level=quiz_result.level,
+                results=quiz_result.results,
+                score=quiz_result.score,
+            )
+            for quiz_result in quiz_results
+        ]
+    )
+
+    attempt_buckets = [
+        (attempt, bucket, bucket_start)
+        for attempt in attempts
+        for bucket, bucket_start in bucket_starts(
+            timezone.localdate(attempt.attempted_at)
+        )
+    ]
+    rollups = {
+        (
+            rollup.user_id,
+            rollup.bucket,
+            rollup.subject,
+            rollup.level,
+            rollup.bucket_start,
+        ): rollup
+        for rollup in QuizRollup.objects.select_for_update().filter(
+            user_id__in={attempt.user_id for attempt in attempts},
+            bucket_start__in={bucket_start for _, _, bucket_start in attempt_buckets},
+        )
+    }
+    touched = {}
+    for attempt, bucket, bucket_start in attempt_buckets:
+        key = (attempt.user_id, bucket, attempt.subject, attempt.level, bucket_start)
+        if key not in rollups:
+            rollups[key] = QuizRollup(
+                user_id=attempt.user_id,
+                bucket=bucket,
+                subject=attempt.subject,
+                level=attempt.level,
+                bucket_start=bucket_start,
+            )
+        touched[key] = rollups[key]
+        add_to_rollup(rollups[key], attempt)
+
+    QuizRollup.objects.bulk_update(
+        [rollup for rollup in touched.values() if rollup.pk is not None],
+        ["attempts", "scored_attempts", "score_total", "best_score"],
+    )
+    QuizRollup.objects.bulk_create(
+        [rollup for rollup in touched.values() if rollup.pk is None]
+    )
+    return attempts
+
+
+def add_to_rollup(rollup, attempt):
+    rollup.attempts += 1
+    if attempt.score is not None:
+        rollup.scored_attempts += 1
+        rollup.score_total += attempt.score
+        if rollup.best_score is None or attempt.score > rollup.best_score:
+            rollup.best_score = attempt.score
+
+
+def serialize_rollup(rollup):
+    return {
+        "bucket_start": rollup.bucket_start.isoformat(),
+        "subject": rollup.subject,
+        "level": rollup.level,
+        "attempts": rollup.attempts,
+        "average_score": (
+            round(rollup.score_total / rollup.scored_attempts, 2)
+            if rollup.scored_attempts
+            else None
+        ),
+        "best_score": rollup.best_score,
+    }
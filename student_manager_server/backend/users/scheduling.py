@@ -0,0 +1,520 @@
+"""
+Study plan scheduling.
+
+Everything in this module works on plain Python values (dicts, lists,
+strings and datetimes) and does not import Django, so plans can be
+generated in worker processes or benchmarked on their own.
+"""
+
+import heapq
+import math
+from datetime import datetime, timedelta
+
+WEEKDAYS = [
+    "Monday",
+    "Tuesday",
+    "Wednesday",
+    "Thursday",
+    "Friday",
+    "Saturday",
+    "Sunday",
+]
+
+# Hour at which the first session of the day starts for each preferred_study_time
+STUDY_START_HOURS = {
+    "Morning": 6,
+    "Day": 12,
+    "Night": 21,
+}
+DEFAULT_STUDY_START_HOUR = 8
+
+MAX_SESSION_LENGTH = 1.5
+MAX_SESSIONS_PER_DAY = 2
+MAX_STUDY_HOURS_PER_DAY = 4.0
+
+STUDY_TYPE = "exam preparation"
+
+STRENGTH_RATINGS = {
+    "Can work more than 3 hours continuously": 5,
+    "Good at organizing tasks and time": 4,
+    "Quick learner": 4,
+    "Can stay focused for extended periods": 5,
+    "Good at retaining information through reading": 3,
+}
+
+WEAKNESS_RATINGS = {
+    "Easily distracted": 5,
+    "Tend to procrastinate often": 5,
+    "Find it hard to start studying without motivation": 4,
+    "Struggle with organizing tasks": 4,
+    "Have difficulty managing stress": 3,
+}
+
+# Quiz level scored above 60% -> factor applied to the daily study hours
+QUIZ_ADJUSTMENTS = {
+    "Advanced": 0.7,
+    "Intermediate": 0.8,
+    "Beginner": 0.9,
+}
+
+
+class StudyPlanError(ValueError):
+    """Raised when a study plan cannot be generated from the given inputs."""
+
+
+def weekday_mask(skip_days):
+    """Return a Monday-first tuple of 7 booleans, True for days open for study."""
+    skip_days = skip_days or []
+    return tuple(day not in skip_days for day in WEEKDAYS)
+
+
+def week_offsets(start_date, mask):
+    """Offsets (0-6) from start_date of the open days in its first week."""
+    first_weekday = start_date.weekday()
+    return [offset for offset in range(7) if mask[(first_weekday + offset) % 7]]
+
+
+def count_open_days(start_date, total_days, mask):
+    """Count the open days in the total_days days starting at start_date."""
+    offsets = week_offsets(start_date, mask)
+    full_weeks, remainder = divmod(total_days, 7)
+    return full_weeks * len(offsets) + sum(1 for offset in offsets if offset < remainder)
+
+
+def open_day_offsets(
+    start_date, total_days, mask, limit=None, first_offset=0, last_offset=None
+):
+    """
+    Return the day offsets from start_date of the first `limit` open days
+    that fall within total_days, computed a week at a time.
+    first_offset/last_offset (inclusive) restrict the result to a window
+    without laying out the days before it.
+    """
+    offsets = week_offsets(start_date, mask)
+    if not offsets:
+        return []
+
+    count = count_open_days(start_date, total_days, mask)
+    if limit is not None:
+        count = max(min(count, limit), 0)
+    if last_offset is not None:
+        count = min(count, count_open_days(start_date, max(last_offset + 1, 0), mask))
+    first_index = count_open_days(start_date, max(first_offset, 0), mask)
+
+    first_week, first_position = divmod(first_index, len(offsets))
+    weeks = -(-count // len(offsets))
+    return [
+        week * 7 + offset for week in range(first_week, weeks) for offset in offsets
+    ][first_position : max(count - first_week * len(offsets), 0)]
+
+
+def session_template(start_date, preferred_study_time, study_hours_per_day):
+    """
+    Build the sessions for one study day.
+    Every study day shares the same time of day as start_date, so the
+    sessions only need to be computed once per plan.
+    Returns a tuple: (sessions, total_hours).
+    """
+    start_hour = STUDY_START_HOURS.get(preferred_study_time, DEFAULT_STUDY_START_HOUR)
+    current_time = start_date.replace(hour=start_hour, minute=0)
+
+    sessions_per_day = min(
+        max(1, math.ceil(study_hours_per_day / MAX_SESSION_LENGTH)),
+        MAX_SESSIONS_PER_DAY,
+    )
+    session_hours = min(study_hours_per_day / sessions_per_day, MAX_SESSION_LENGTH)
+
+    sessions = []
+    for session in range(sessions_per_day):
+        session_end_time = current_time + timedelta(hours=session_hours)
+        sessions.append(
+            {
+                "start_time": current_time.strftime("%H:%M"),
+                "end_time": session_end_time.strftime("%H:%M"),
+                "hours_to_study": round(session_hours, 2),
+            }
+        )
+        current_time = session_end_time + timedelta(minutes=30)
+
+    return sessions, round(session_hours * sessions_per_day, 2)
+
+
+def build_study_days(
+    start_date,
+    total_days,
+    skip_days,
+    day_limit,
+    subject,
+    preferred_study_time,
+    study_hours_per_day,
+    first_offset=0,
+    last_offset=None,
+):
+    """
+    Lay out the study days of a plan: the first `day_limit` days within
+    total_days of start_date whose weekday is not in skip_days, optionally
+    only those between first_offset and last_offset days from start_date.
+    """
+    mask = weekday_mask(skip_days)
+    sessions, total_hours = session_template(
+        start_date, preferred_study_time, study_hours_per_day
+    )
+    first_day = start_date.date()
+
+    return [
+        {
+            "study_date": (first_day + timedelta(days=offset)).isoformat(),
+            "sessions": [dict(session) for session in sessions],
+            "subject": subject,
+            "study_time": preferred_study_time,
+            "total_hours": total_hours,
+        }
+        for offset in open_day_offsets(
+            start_date, total_days, mask, day_limit, first_offset, last_offset
+        )
+    ]
+
+
+def parse_plan_date(value):
+    """Parse an ISO 8601 date string, accepting a trailing Z for UTC."""
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def percentage_to_float(percentage_str):
+    """Convert a quiz results string such as "85%" to 85.0."""
+    return float(percentage_str.replace("%", "").strip()) if percentage_str else 0.0
+
+
+def adjusted_study_hours(hours_per_day, quiz_results):
+    """
+    Daily study hours after applying the quiz adjustment.
+    quiz_results maps a level to its results string (e.g. {"Advanced": "85%"}).
+    """
+    study_hours_per_day = min(hours_per_day, MAX_STUDY_HOURS_PER_DAY)
+
+    adjustments = [
+        factor
+        for level, factor in QUIZ_ADJUSTMENTS.items()
+        if quiz_results.get(level)
+        and percentage_to_float(quiz_results[level]) > 60
+    ]
+    if adjustments:
+        return study_hours_per_day * min(adjustments)
+    return min(study_hours_per_day + 0.5, MAX_STUDY_HOURS_PER_DAY)
+
+
+def strength_adjusted_hours(hours_per_session, strengths, weaknesses):
+    """Scale session hours by the user's rated strengths and weaknesses."""
+    adjusted_hours = hours_per_session
+    for strength in strengths:
+        if strength in STRENGTH_RATINGS:
+            adjusted_hours *= 1 + (STRENGTH_RATINGS[strength] * 0.05)
+
+    for weakness in weaknesses:
+        if weakness in WEAKNESS_RATINGS:
+            adjusted_hours *= 1 - (WEAKNESS_RATINGS[weakness] * 0.05)
+
+    return min(adjusted_hours, MAX_SESSION_LENGTH)
+
+
+def plan_layout(preferences, quiz_results, task):
+    """
+    Validate the inputs of a plan and work out its layout: the keyword
+    arguments build_study_days needs to lay out any of its days.
+
+    preferences: dict with hours_per_day, days_per_week, preferred_study_time,
+        strengths and weaknesses.
+    quiz_results: dict mapping a level to its results string for the subject.
+    task: dict with subject, study_start_date and exam_date (ISO 8601 strings),
+        estimated_study_hours and skip_days.
+
+    Raises StudyPlanError when no plan can be generated from the inputs.
+    """
+    try:
+        study_start_date = parse_plan_date(task.get("study_start_date"))
+        exam_date = parse_plan_date(task.get("exam_date"))
+    except (ValueError, TypeError) as e:
+        raise StudyPlanError(f"Invalid date format: {str(e)}")
+
+    if study_start_date >= exam_date:
+        raise StudyPlanError("Study start date must be before exam date.")
+
+    skip_days = task.get("skip_days") or []
+    study_hours_per_day = adjusted_study_hours(
+        preferences["hours_per_day"], quiz_results
+    )
+
+    total_days = (exam_date - study_start_date).days  # Exclude exam_date
+    if total_days < 1:
+        raise StudyPlanError("No days available for study plan before exam date.")
+
+    open_days = count_open_days(study_start_date, total_days, weekday_mask(skip_days))
+    available_days = open_days * (preferences["days_per_week"] / 7)
+    if available_days < 1:
+        raise StudyPlanError("No available days for study plan after skipping days.")
+
+    # The adjusted session length is not applied to the sessions yet, but
+    # estimated_study_hours still has to be a number for a plan to be made.
+    strength_adjusted_hours(
+        task.get("estimated_study_hours") / available_days,
+        preferences.get("strengths") or [],
+        preferences.get("weaknesses") or [],
+    )
+
+    return {
+        "start_date": study_start_date,
+        "total_days": total_days,
+        "skip_days": skip_days,
+        "day_limit": int(available_days),
+        "subject": task.get("subject"),
+        "preferred_study_time": preferences["preferred_study_time"],
+        "study_hours_per_day": study_hours_per_day,
+    }
+
+
+def plan_study_days(preferences, quiz_results, task, date_from=None, date_to=None):
+    """
+    Generate the study days of a plan (see plan_layout for the inputs).
+    date_from/date_to (inclusive dates) only lay out the days of that window,
+    so the cost grows with the window rather than with the plan.
+    Raises StudyPlanError when no plan can be generated from the inputs.
+    """
+    layout = plan_layout(preferences, quiz_results, task)
+    first_day = layout["start_date"].date()
+    return build_study_days(
+        **layout,
+        first_offset=(date_from - first_day).days if date_from else 0,
+        last_offset=(date_to - first_day).days if date_to else None,
+    )
+
+
+def preference_inputs(user_preference):
+    """
+    Plain dict of the UserPreference fields plan_study_days depends on, from
+    a UserPreference or anything with the same attributes.
+    """
+    return {
+        "hours_per_day": user_preference.hours_per_day,
+        "days_per_week": user_preference.days_per_week,
+        "preferred_study_time": user_preference.preferred_study_time,
+        "strengths": user_preference.get_strengths(),
+        "weaknesses": user_preference.get_weaknesses(),
+    }
+
+
+def task_inputs(task_data, skip_days):
+    """Plain dict of the task fields plan_study_days depends on."""
+    return {
+        "subject": task_data.get("subject"),
+        "study_start_date": task_data.get("study_start_date"),
+        "exam_date": task_data.get("exam_date"),
+        "estimated_study_hours": task_data.get("estimated_study_hours"),
+        "skip_days": skip_days,
+    }
+
+
+def generator_params(preferences, quiz_results, task):
+    """The inputs of a plan, stored so its days can be generated on demand."""
+    return {
+        "preferences": preferences,
+        "quiz_results": quiz_results,
+        "task": task,
+    }
+
+
+def apply_day_overrides(days, overrides, date_from=None, date_to=None):
+    """
+    Merge user edits into generated days. overrides maps a study_date
+    (YYYY-MM-DD) to its edited day, or to None when the day was removed.
+    Only overrides between date_from and date_to are applied.
+    """
+    if not overrides:
+        return days
+
+    days_by_date = {day["study_date"]: day for day in days}
+    for study_date, day in overrides.items():
+        if date_from and study_date < date_from.isoformat():
+            continue
+        if date_to and study_date > date_to.isoformat():
+            continue
+        if day is None:
+            days_by_date.pop(study_date, None)
+        else:
+            days_by_date[study_date] = day
+    return [days_by_date[study_date] for study_date in sorted(days_by_date)]
+
+
+def format_minutes(minutes):
+    """Format minutes since midnight as HH:MM, wrapping past midnight."""
+    minutes = int(minutes)
+    return f"{minutes // 60 % 24:02d}:{minutes % 60:02d}"
+
+
+def schedule_user_tasks(preferences, tasks):
+    """
+    Plan all of a user's pending tasks together, so sessions of different
+    tasks never overlap and the hours studied on a day stay within
+    hours_per_day.
+
+    Each day's hours go to the open tasks earliest-deadline-first (higher
+    priority first on the same deadline), taken from a heap of the tasks
+    whose study window covers that day. A task gets at most
+    MAX_SESSIONS_PER_DAY sessions of MAX_SESSION_LENGTH hours a day, and no
+    session starts after midnight. The cost is O((days + sessions) log tasks).
+
+    tasks: dicts with id, subject, study_start_date, exam_date (ISO 8601),
+        estimated_study_hours, priority and skip_days.
+    Returns a tuple: (plans, unscheduled_hours), both keyed by task id; the
+    latter holds the hours that did not fit before the exam.
+    """
+    capacity = min(preferences["hours_per_day"], 24.0)
+    study_time = preferences["preferred_study_time"]
+    day_start = STUDY_START_HOURS.get(study_time, DEFAULT_STUDY_START_HOUR) * 60
+    max_daily_task_hours = MAX_SESSION_LENGTH * MAX_SESSIONS_PER_DAY
+
+    plans = {}
+    remaining = {}
+    tasks_by_id = {}
+    windows = []
+    for task in tasks:
+        plans[task["id"]] = []
+        remaining[task["id"]] = task.get("estimated_study_hours") or 0.0
+        tasks_by_id[task["id"]] = task
+        try:
+            study_start_date = parse_plan_date(task["study_start_date"])
+            exam_date = parse_plan_date(task["exam_date"])
+        except (ValueError, TypeError, AttributeError):
+            continue
+        total_days = (exam_date - study_start_date).days  # Exclude exam_date
+        if total_days >= 1 and remaining[task["id"]] > 0 and capacity > 0:
+            first_day = study_start_date.date()
+            windows.append(
+                (first_day, first_day + timedelta(days=total_days - 1), task)
+            )
+    windows.sort(key=lambda window: window[0])
+
+    heap = []
+    next_window = 0
+    current_day = None
+    while next_window < len(windows) or heap:
+        # Jump straight to the next start date when no task is open
+        if not heap:
+            current_day = max(current_day or windows[0][0], windows[next_window][0])
+        while next_window < len(windows) and windows[next_window][0] <= current_day:
+            first_day, last_day, task = windows[next_window]
+            heapq.heappush(heap, (last_day, -(task.get("priority") or 0), task["id"]))
+            next_window += 1
+
+        weekday_name = WEEKDAYS[current_day.weekday()]
+        hours_left = capacity
+        minute = day_start
+        deferred = []
+        # Sessions start before midnight so each belongs to its study_date
+        while heap and hours_left > 1e-9 and minute < 1440:
+            entry = heapq.heappop(heap)
+            last_day, _, task_id = entry
+            if last_day < current_day:
+                continue  # Exam reached; what is left stays unscheduled
+            task = tasks_by_id[task_id]
+            if weekday_name in (task.get("skip_days") or []):
+                deferred.append(entry)
+                continue
+
+            hours = min(remaining[task_id], hours_left, max_daily_task_hours)
+            sessions_per_day = min(
+                max(1, math.ceil(hours / MAX_SESSION_LENGTH)), MAX_SESSIONS_PER_DAY
+            )
+            session_hours = hours / sessions_per_day
+            sessions = []
+            for session in range(sessions_per_day):
+                end_minute = minute + session_hours * 60
+                sessions.append(
+                    {
+                        "start_time": format_minutes(minute),
+                        "end_time": format_minutes(end_minute),
+                        "hours_to_study": round(session_hours, 2),
+                    }
+                )
+                minute = end_minute + 30
+            plans[task_id].append(
+                {
+                    "study_date": current_day.isoformat(),
+                    "sessions": sessions,
+                    "subject": task.get("subject"),
+                    "study_time": study_time,
+                    "total_hours": round(hours, 2),
+                }
+            )
+
+            remaining[task_id] -= hours
+            hours_left -= hours
+            if remaining[task_id] > 1e-9:
+                deferred.append(entry)
+
+        for entry in deferred:
+            heapq.heappush(heap, entry)
+        current_day += timedelta(days=1)
+
+    unscheduled_hours = {
+        task_id: round(max(hours, 0.0), 2) for task_id, hours in remaining.items()
+    }
+    return plans, unscheduled_hours
+
+
+def find_overlaps(intervals):
+    """
+    Return the index pairs of overlapping (start, end) intervals; empty
+    intervals never overlap anything. A sweep
+    over the intervals sorted by start keeps the ones still open in a heap
+    by end, so it runs in O((n + k) log n) for n intervals and k overlaps.
+    """
+    order = sorted(
+        (index for index, (start, end) in enumerate(intervals) if end > start),
+        key=lambda index: intervals[index][0],
+    )
+    open_intervals = []
+    overlaps = []
+    for index in order:
+        start, end = intervals[index]
+        while open_intervals and open_intervals[0][0] <= start:
+            heapq.heappop(open_intervals)
+        overlaps.extend((other, index) for _, other in open_intervals)
+        heapq.heappush(open_intervals, (end, index))
+    return overlaps
+
+
+def count_overlaps(intervals, involved):
+    """
+    The sweep of find_overlaps, counting instead of listing the pairs: for
+    each interval, the number of intervals that started before it and
+    overlap it, counting only the pairs where at least one interval is
+    involved (a list of booleans, one per interval). Runs in O(n log n).
+    """
+    order = sorted(
+        (index for index, (start, end) in enumerate(intervals) if end > start),
+        key=lambda index: intervals[index][0],
+    )
+    counts = [0] * len(intervals)
+    open_intervals = []
+    open_involved = 0
+    for index in order:
+        start, end = intervals[index]
+        while open_intervals and open_intervals[0][0] <= start:
+            _, other = heapq.heappop(open_intervals)
+            open_involved -= involved[other]
+        counts[index] = len(open_intervals) if involved[index] else open_involved
+        heapq.heappush(open_intervals, (end, index))
+        open_involved += involved[index]
+    return counts
+
+
+def plan_task(job):
+    """
+    Process pool entry point: job is a (task_id, preferences, quiz_results, task)
+    tuple. Returns (task_id, plan, error) with exactly one of plan/error set.
+    """
+    task_id, preferences, quiz_results, task = job
+    try:
+        return task_id, plan_study_days(preferences, quiz_results, task), None
+    except (StudyPlanError, TypeError, ZeroDivisionError) as e:
+        return task_id, None, str(e)
@@ -104,6 +104,15 @@ class TaskEventSerializer(serializers.ModelSerializer):
         return data
 
 
+class BulkTaskEventSerializer(TaskEventSerializer):
+    """
+    TaskEventSerializer for the requesting user's own tasks: the user comes
+    from the request instead of being looked up again for every task.
+    """
+
+    user = serializers.HiddenField(default=serializers.CurrentUserDefault())
+
+
 class UserPreferenceSerializer(serializers.ModelSerializer):
     strengths = serializers.ListField(
         child=serializers.CharField(max_length=255), allow_empty=True, required=False
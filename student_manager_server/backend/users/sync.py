@@ -0,0 +1,110 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db.models import Q, QuerySet
+from django.db.models.signals import post_delete
+from django.utils import timezone
+
+from .models import Notification, StudyPlan, TaskEvent, Tombstone
+from .plan_days import materialize_study_plan
+from .serializers import NotificationSerializer, TaskEventSerializer
+
+# How far back from the client's cursor changes are read again. A row gets
+# its updated_at before its transaction commits, so a sync running in
+# between doesn't see it yet; reading a little behind the cursor catches it
+# on the next sync. Clients upsert by id, so the repeats are harmless.
+SYNC_OVERLAP = timedelta(seconds=getattr(settings, "SYNC_OVERLAP_SECONDS", 60))
+
+TOMBSTONE_KINDS = {
+    TaskEvent: "tasks",
+    StudyPlan: "study_plans",
+    Notification: "notifications",
+}
+
+
+def touch(instances):
+    """
+    Set updated_at on instances about to be saved with bulk_update, which
+    skips auto_now; "updated_at" must be among the fields it updates.
+    """
+    now = timezone.now()
+    for instance in instances:
+        instance.updated_at = now
+    return instances
+
+
+def serialize_sync_plan(study_plan):
+    # What study-plans/ returns for the plan, with its id for deletions
+    return {
+        "id": study_plan.id,
+        "event_id": study_plan.event_id_id,
+        "plan": materialize_study_plan(study_plan),
+    }
+
+
+def changes_since(user, since=None):
+    """
+    The user's tasks, study plans and notifications created or changed after
+    since, and the ids of those deleted after it; everything when since is
+    None. The returned cursor is passed back as since on the next sync.
+    Rolling-horizon plans are returned for their current window, which moves
+    with the date rather than with updated_at, so a delta always has them.
+    """
+    cursor = timezone.now()
+    tasks = TaskEvent.objects.filter(user=user)
+    study_plans = StudyPlan.objects.filter(user=user)
+    notifications = Notification.objects.filter(user=user)
+    deleted = {kind: [] for kind, _ in Tombstone.KIND_CHOICES}
+    if since is not None:
+        changed_after = since - SYNC_OVERLAP
+        tasks = tasks.filter(updated_at__gt=changed_after)
+        study_plans = study_plans.filter(
+            Q(updated_at__gt=changed_after) | Q(rolling_horizon=True)
+        )
+        notifications = notifications.filter(updated_at__gt=changed_after)
+        tombstones = Tombstone.objects.filter(
+            user=user, deleted_at__gt=changed_after
+        ).order_by("deleted_at", "id")
+        for kind, object_id in tombstones.values_list("kind", "object_id"):
+            deleted[kind].append(object_id)
+
+    changed_tasks = []
+    for task in tasks.order_by("id"):
+        if task.status == "Deleted":
+            # Soft deleted: a full sync leaves it out, a delta drops it
+            if since is not None:
+                deleted["tasks"].append(task.id)
+        else:
+            changed_tasks.append(task)
+
+    return {
+        # UTC with a Z, so the cursor needs no escaping in a query string
+        "cursor": cursor.isoformat().replace("+00:00", "Z"),
+        "full": since is None,
+        "tasks": TaskEventSerializer(changed_tasks, many=True).data,
+        "study_plans": [
+            serialize_sync_plan(study_plan)
+            for study_plan in study_plans.order_by("id")
+        ],
+        "notifications": NotificationSerializer(notifications, many=True).data,
+        "deleted": deleted,
+    }
+
+
+def record_tombstone(sender, instance, origin=None, **kwargs):
+    # Rows deleted along with their user need no tombstone, and one would
+    # point at the user being deleted
+    if isinstance(origin, User) or (
+        isinstance(origin, QuerySet) and origin.model is User
+    ):
+        return
+    Tombstone.objects.create(
+        user_id=instance.user_id,
+        kind=TOMBSTONE_KINDS[sender],
+        object_id=instance.pk,
+    )
+
+
+for model in TOMBSTONE_KINDS:
+    post_delete.connect(record_tombstone, sender=model)
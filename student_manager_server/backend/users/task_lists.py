@@ -0,0 +1,70 @@
+import base64
+import json
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+from .list_serializers import task_list_serializer
+from .models import TaskEvent
+
+TASK_PAGE_SIZE = getattr(settings, "TASK_LIST_PAGE_SIZE", 50)
+MAX_TASK_PAGE_SIZE = getattr(settings, "TASK_LIST_MAX_PAGE_SIZE", 500)
+
+
+class TaskCursorError(ValueError):
+    pass
+
+
+def encode_cursor(task):
+    """Cursor of the position after a task as task_list_serializer gives it."""
+    position = json.dumps([task["event_date"], task["id"]])
+    return base64.urlsafe_b64encode(position.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """The (event_date, id) a cursor from encode_cursor points after."""
+    try:
+        event_date, task_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        event_date = parse_datetime(event_date)
+    except (TypeError, ValueError):
+        event_date = task_id = None
+    if event_date is None or not isinstance(task_id, int):
+        raise TaskCursorError("Invalid cursor.")
+    return event_date, task_id
+
+
+def user_tasks(user, excluded):
+    """Every task of the user but those with an excluded status, by (event_date, id)."""
+    return (
+        TaskEvent.objects.filter(user=user)
+        .exclude(status__in=excluded)
+        .order_by("event_date", "id")
+    )
+
+
+def task_page(user, excluded, cursor=None, page_size=TASK_PAGE_SIZE):
+    """
+    The user's tasks but those with an excluded status, in (event_date, id)
+    order, page_size at a time from the position cursor points after.
+    Returns the page's tasks, serialized by task_list_serializer, and the
+    cursor of the next page (None on the last page).
+    The page is read with one query: the (user, event_date, id) index gives
+    the order, so it reads the index from the cursor on and stops after
+    page_size + 1 listed tasks, however many tasks the user has.
+    """
+    tasks = user_tasks(user, excluded)
+    if cursor:
+        event_date, task_id = decode_cursor(cursor)
+        # The redundant event_date__gte lets SQLite seek the index to the
+        # cursor instead of scanning the user's tasks from the first one
+        tasks = tasks.filter(event_date__gte=event_date).filter(
+            Q(event_date__gt=event_date) | Q(event_date=event_date, id__gt=task_id)
+        )
+
+    page = task_list_serializer.serialize(tasks[: page_size + 1])
+    next_cursor = None
+    if len(page) > page_size:
+        page = page[:page_size]
+        next_cursor = encode_cursor(page[-1])
+    return page, next_cursor
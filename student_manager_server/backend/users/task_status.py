@@ -0,0 +1,86 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Notification, TaskEvent
+
+TASK_STATUSES = [status for status, _ in TaskEvent.STATUS_CHOICES]
+
+# Status changes applied per request at most
+MAX_STATUS_CHANGES = 1000
+
+
+def clean_status_changes(changes):
+    """
+    Validate a list of {"id", "status"} changes. Returns the {task id:
+    status} they ask for and a list of {"index", "error"} for the invalid
+    ones; a task may only be listed once.
+    """
+    statuses = {}
+    errors = []
+    for index, change in enumerate(changes):
+        if not isinstance(change, dict):
+            errors.append({"index": index, "error": "Expected an object."})
+            continue
+        task_id = change.get("id")
+        new_status = change.get("status")
+        if not isinstance(task_id, int) or isinstance(task_id, bool):
+            errors.append({"index": index, "error": "id must be an integer."})
+        elif new_status not in TASK_STATUSES:
+            errors.append({"index": index, "error": "Invalid status value."})
+        elif task_id in statuses:
+            errors.append(
+                {"index": index, "error": f"Task {task_id} is listed twice."}
+            )
+        else:
+            statuses[task_id] = new_status
+    return statuses, errors
+
+
+def apply_status_changes(user, statuses):
+    """
+    Set the status of the user's tasks ({task id: status}) and notify the
+    user of each change, like TaskStatusUpdateView does for one task. Tasks
+    already in their status are left alone. Ownership is checked with one
+    query, each status is set with one UPDATE and the notifications are
+    inserted at once, all in one transaction.
+    Returns the ids of the changed and unchanged tasks, or None (and nothing
+    is changed) when some of the tasks aren't the user's.
+    """
+    with transaction.atomic():
+        tasks = (
+            TaskEvent.objects.select_for_update()
+            .filter(user=user, id__in=statuses)
+            .values_list("id", "task_name", "status")
+        )
+        tasks = {task_id: (task_name, status) for task_id, task_name, status in tasks}
+        if len(tasks) != len(statuses):
+            return None
+
+        changed_ids = defaultdict(list)
+        notifications = []
+        for task_id, new_status in statuses.items():
+            task_name, old_status = tasks[task_id]
+            if new_status == old_status:
+                continue
+            changed_ids[new_status].append(task_id)
+            notifications.append(
+                Notification(
+                    user=user,
+                    title="Task Status Updated",
+                    body=f"Task '{task_name}' is now {new_status}",
+                )
+            )
+
+        # update() skips auto_now, so updated_at is set here for delta sync
+        now = timezone.now()
+        for new_status, task_ids in changed_ids.items():
+            TaskEvent.objects.filter(id__in=task_ids).update(
+                status=new_status, updated_at=now
+            )
+        Notification.objects.bulk_create(notifications)
+
+    updated = sorted(task_id for ids in changed_ids.values() for task_id in ids)
+    unchanged = sorted(set(statuses) - set(updated))
+    return updated, unchanged
@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta, timezone
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from rest_framework.renderers import JSONRenderer
+
+from users.list_serializers import (
+    CompletedTaskSerializer,
+    completed_task_serializer,
+    notification_list_serializer,
+    task_list_serializer,
+)
+from users.models import Notification, TaskEvent
+from users.serializers import NotificationSerializer, TaskEventSerializer
+
+
+class ValuesSerializerTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(username="student", password="pw")
+        start = datetime(2030, 1, 7, 9, 0, 0, 123456, tzinfo=timezone.utc)
+        TaskEvent.objects.bulk_create(
+            [
+                TaskEvent(
+                    user=user,
+                    task_name=f"Task {i}",
+                    subject="DSA",
+                    task_type="Exam",
+                    start_date=start + timedelta(hours=i),
+                    event_date=start + timedelta(days=i),
+                    estimated_study_hours=i / 2,
+                    notes="",
+                    priority=i % 3,
+                    status=["Pending", "Complete"][i % 2],
+                    skip_days=["Sunday"] if i % 2 else None,
+                )
+                for i in range(6)
+            ]
+        )
+        Notification.objects.bulk_create(
+            [
+                Notification(user=user, title=f"Title {i}", body="", is_read=i % 2)
+                for i in range(3)
+            ]
+        )
+
+    def assert_same_json(self, serializer, serializer_class, queryset):
+        self.assertEqual(
+            JSONRenderer().render(serializer.serialize(queryset)),
+            JSONRenderer().render(serializer_class(queryset, many=True).data),
+        )
+
+    @override_settings(TIME_ZONE="Asia/Kolkata")
+    def test_output_matches_the_serializers(self):
+        tasks = TaskEvent.objects.order_by("id")
+        self.assert_same_json(task_list_serializer, TaskEventSerializer, tasks)
+        self.assert_same_json(
+            completed_task_serializer, CompletedTaskSerializer, tasks
+        )
+        self.assert_same_json(
+            notification_list_serializer,
+            NotificationSerializer,
+            Notification.objects.order_by("id"),
+        )
@@ -0,0 +1,277 @@
+from datetime import datetime, timedelta, timezone
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone as django_timezone
+from rest_framework.test import APITestCase
+
+from users.models import StudyPlan, StudyPlanDay, TaskEvent, UserPreference
+from users.plan_days import all_study_plan_days, user_study_sessions
+from users.scheduling import plan_task
+
+PLAN_START = datetime(2030, 1, 7, 9, 0, tzinfo=timezone.utc)
+
+
+def stored_days(study_plan):
+    """The plan days as the StudyPlanDay/StudySession rows store them."""
+    return sorted(
+        (
+            day.study_date.isoformat(),
+            day.subject,
+            day.study_time,
+            day.total_hours,
+            tuple(
+                (session.start_time, session.end_time, session.hours_to_study)
+                for session in day.sessions.order_by("position")
+            ),
+        )
+        for day in StudyPlanDay.objects.filter(study_plan=study_plan)
+    )
+
+
+def plan_json_days(study_plan):
+    return sorted(
+        (
+            day["study_date"],
+            day["subject"],
+            day["study_time"],
+            day["total_hours"],
+            tuple(
+                (session["start_time"], session["end_time"], session["hours_to_study"])
+                for session in day["sessions"]
+            ),
+        )
+        for day in study_plan.plan
+    )
+
+
+class StudyPlanTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="student", password="pw")
+        self.preferences = UserPreference.objects.create(
+            user=self.user,
+            hours_per_day=3,
+            days_per_week=5,
+            preferred_study_time="Night",
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def create_tasks(self, count, days=30, start=PLAN_START):
+        return TaskEvent.objects.bulk_create(
+            [
+                TaskEvent(
+                    user=self.user,
+                    task_name=f"Task {i}",
+                    subject="DSA",
+                    task_type="Exam",
+                    start_date=start,
+                    event_date=start + timedelta(days=days),
+                    estimated_study_hours=days / 2,
+                    notes="",
+                    priority=1,
+                )
+                for i in range(count)
+            ]
+        )
+
+    def update_study_plans(self, **data):
+        response = self.client.post(
+            "/api/update-study-plans/", {"subject": "DSA", **data}, format="json"
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+
+class SyncStudyPlanDaysTests(StudyPlanTestCase):
+    def test_unchanged_plans_keep_their_rows(self):
+        self.create_tasks(3)
+        self.update_study_plans()
+        day_ids = set(StudyPlanDay.objects.values_list("id", flat=True))
+
+        self.update_study_plans()
+
+        self.assertEqual(set(StudyPlanDay.objects.values_list("id", flat=True)), day_ids)
+
+    def test_changed_days_are_rewritten(self):
+        self.create_tasks(3)
+        self.update_study_plans()
+
+        self.preferences.preferred_study_time = "Morning"
+        self.preferences.days_per_week = 3
+        self.preferences.save()
+        self.update_study_plans()
+
+        for study_plan in StudyPlan.objects.all():
+            self.assertEqual(stored_days(study_plan), plan_json_days(study_plan))
+
+
+class UpdateStudyPlansQueryTests(StudyPlanTestCase):
+    # Loading the tasks, preferences, mastery and plans, the conflict check
+    # and the transaction, whatever the number of plans
+    MAX_QUERIES = 10
+
+    def count_queries(self, **data):
+        with CaptureQueriesContext(connection) as queries:
+            self.update_study_plans(**data)
+        return len(queries)
+
+    def assert_queries_bounded(self, **data):
+        self.create_tasks(1, days=30)
+        self.update_study_plans(**data)
+        few_plans = self.count_queries(**data)
+
+        self.create_tasks(7, days=365)
+        self.update_study_plans(**data)
+        many_plans = self.count_queries(**data)
+
+        self.assertEqual(many_plans, few_plans)
+        self.assertLessEqual(many_plans, self.MAX_QUERIES)
+
+    def test_rebuild_queries_do_not_grow_with_plans(self):
+        self.assert_queries_bounded()
+
+    def test_incremental_replan_queries_do_not_grow_with_plans(self):
+        self.assert_queries_bounded(incremental=True)
+
+    def test_unchanged_plans_are_not_written(self):
+        self.create_tasks(3)
+        self.update_study_plans()
+        updated_at = dict(StudyPlan.objects.values_list("id", "updated_at"))
+
+        self.update_study_plans()
+
+        self.assertEqual(
+            dict(StudyPlan.objects.values_list("id", "updated_at")), updated_at
+        )
+
+
+class UpdateRollingStudyPlanTests(StudyPlanTestCase):
+    def setUp(self):
+        super().setUp()
+        (self.task,) = self.create_tasks(1, days=60)
+        self.update_study_plans()
+        StudyPlanDay.objects.all().delete()
+        StudyPlan.objects.update(rolling_horizon=True, plan=[])
+
+    def plan_window(self):
+        response = self.client.get(
+            f"/api/study-plan-data/{self.task.id}/",
+            {"from": "2030-01-07", "to": "2030-01-20"},
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def put_plan(self, plan):
+        response = self.client.put(
+            f"/api/study-plan/update/{self.task.id}/", {"plan": plan}, format="json"
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+
+    def test_unchanged_days_are_not_overrides(self):
+        self.put_plan(self.plan_window())
+
+        self.assertEqual(StudyPlan.objects.get().day_overrides, {})
+
+    def test_only_edited_days_are_overrides(self):
+        plan = self.plan_window()
+        plan[1]["study_time"] = "Morning"
+        removed_day = plan.pop(2)
+
+        self.put_plan(plan)
+
+        self.assertEqual(
+            StudyPlan.objects.get().day_overrides,
+            {plan[1]["study_date"]: plan[1], removed_day["study_date"]: None},
+        )
+        self.assertEqual(self.plan_window(), plan)
+
+
+class ReplanRollingStudyPlanTests(StudyPlanTestCase):
+    def setUp(self):
+        super().setUp()
+        self.today = django_timezone.localdate()
+        (self.task,) = self.create_tasks(
+            1, days=60, start=django_timezone.now() - timedelta(days=30)
+        )
+        self.update_study_plans()
+        StudyPlanDay.objects.all().delete()
+        StudyPlan.objects.update(rolling_horizon=True, plan=[])
+
+    def replan(self):
+        self.preferences.hours_per_day += 1
+        self.preferences.save()
+        self.update_study_plans(incremental=True)
+        return StudyPlan.objects.get()
+
+    def past_days(self, study_plan):
+        return [
+            day
+            for day in all_study_plan_days(study_plan)
+            if day["study_date"] < self.today.isoformat()
+        ]
+
+    def test_past_days_are_stored(self):
+        past_days = self.past_days(StudyPlan.objects.get())
+
+        study_plan = self.replan()
+
+        self.assertTrue(past_days)
+        self.assertEqual(study_plan.plan, past_days)
+        self.assertEqual(stored_days(study_plan), plan_json_days(study_plan))
+        self.assertEqual(study_plan.day_overrides, {})
+        self.assertEqual(self.replan().plan, past_days)
+
+    def test_sessions_are_not_counted_twice(self):
+        study_plan = self.replan()
+
+        self.assertEqual(
+            len(user_study_sessions(self.user)),
+            sum(len(day["sessions"]) for day in all_study_plan_days(study_plan)),
+        )
+
+    def test_edited_past_days_are_stored(self):
+        study_plan = self.replan()
+        plan = [dict(day) for day in study_plan.plan]
+        plan[0]["study_time"] = "Morning"
+
+        response = self.client.put(
+            f"/api/study-plan/update/{self.task.id}/", {"plan": plan}, format="json"
+        )
+
+        self.assertEqual(response.status_code, 200, response.content)
+        study_plan.refresh_from_db()
+        self.assertEqual(study_plan.plan, plan)
+        self.assertEqual(study_plan.day_overrides, {})
+        self.assertEqual(stored_days(study_plan), plan_json_days(study_plan))
+
+
+class ReplanAllTests(StudyPlanTestCase):
+    def test_rolling_plans_are_not_planned_in_full(self):
+        regular_task, rolling_task = self.create_tasks(2)
+        self.update_study_plans()
+        StudyPlanDay.objects.filter(study_plan__event_id=rolling_task).delete()
+        StudyPlan.objects.filter(event_id=rolling_task).update(
+            rolling_horizon=True, plan=[]
+        )
+        self.preferences.hours_per_day = 2
+        self.preferences.save()
+
+        with mock.patch(
+            "users.management.commands.replan_all.plan_task", wraps=plan_task
+        ) as planned:
+            call_command("replan_all", workers=1, stdout=StringIO())
+
+        self.assertEqual(
+            [job[0] for (job,), _ in planned.call_args_list], [regular_task.id]
+        )
+        regular_plan = StudyPlan.objects.get(event_id=regular_task)
+        rolling_plan = StudyPlan.objects.get(event_id=rolling_task)
+        self.assertEqual(stored_days(regular_plan), plan_json_days(regular_plan))
+        for study_plan in (regular_plan, rolling_plan):
+            self.assertEqual(
+                study_plan.generator_params["preferences"]["hours_per_day"], 2
+            )
@@ -0,0 +1,96 @@
+import gzip
+import json
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth.models import User
+from rest_framework.test import APITestCase
+
+from users.models import QuizQuestion
+from users.quiz_bundles import IMMUTABLE, REVALIDATE, quiz_bundles
+
+BUNDLE_URL = "/api/questions/bundles/DSA/Beginner/"
+
+
+class QuizBundleTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="student", password="pw")
+        self.client.force_authenticate(user=self.user)
+        self.add_question(1)
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        patcher = mock.patch.multiple(
+            quiz_bundles, directory=Path(directory.name), _bundles={}
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def add_question(self, number):
+        QuizQuestion.objects.create(
+            subject="DSA",
+            question=f"Question {number}?",
+            choice_1="a",
+            choice_2="b",
+            choice_3="c",
+            choice_4="d",
+            correct_answer="a",
+            difficulty_level="Beginner",
+        )
+
+    def get_bundle(self, etag=None, gzipped=True, **params):
+        headers = {}
+        if gzipped:
+            headers["HTTP_ACCEPT_ENCODING"] = "gzip, deflate"
+        if etag:
+            headers["HTTP_IF_NONE_MATCH"] = etag
+        return self.client.get(BUNDLE_URL, params, **headers)
+
+    def test_unchanged_bundle_is_not_modified(self):
+        response = self.get_bundle()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        questions = json.loads(gzip.decompress(response.content))["questions"]
+        self.assertEqual(len(questions), 1)
+
+        not_modified = self.get_bundle(response["ETag"])
+
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.content, b"")
+        self.assertEqual(not_modified["ETag"], response["ETag"])
+        self.assertEqual(not_modified["Cache-Control"], REVALIDATE)
+
+    def test_uncompressed_bundle_has_its_own_etag(self):
+        gzipped = self.get_bundle()
+
+        response = self.get_bundle(gzipped["ETag"], gzipped=False)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("Content-Encoding", response)
+        self.assertEqual(
+            json.loads(response.content), json.loads(gzip.decompress(gzipped.content))
+        )
+        not_modified = self.get_bundle(response["ETag"], gzipped=False)
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_changed_bundle_is_sent_again(self):
+        etag = self.get_bundle()["ETag"]
+        self.add_question(2)
+
+        response = self.get_bundle(etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_current_version_is_immutable(self):
+        manifest = self.client.get("/api/questions/bundles/").json()
+        (bundle,) = [
+            bundle
+            for bundle in manifest["bundles"]
+            if (bundle["subject"], bundle["level"]) == ("DSA", "Beginner")
+        ]
+
+        current = self.get_bundle(v=bundle["version"])
+        self.assertEqual(current["Cache-Control"], IMMUTABLE)
+        self.assertEqual(self.get_bundle(v="old")["Cache-Control"], REVALIDATE)
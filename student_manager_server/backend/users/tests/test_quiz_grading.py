@@ -0,0 +1,76 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from rest_framework.test import APITestCase
+
+from users.models import QuizQuestion, QuizResult
+from users.quiz_grading import grade_submissions, start_quiz_session
+
+
+class GradeQuizTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="student", password="pw")
+        self.client.force_authenticate(user=self.user)
+        self.questions = [
+            QuizQuestion.objects.create(
+                subject="DSA",
+                question=f"Question {i}?",
+                choice_1=f"a{i}",
+                choice_2=f"b{i}",
+                choice_3=f"c{i}",
+                choice_4=f"d{i}",
+                correct_answer=f"a{i}",
+                difficulty_level="Beginner",
+            )
+            for i in range(4)
+        ]
+
+    def submission(self):
+        session_id = start_quiz_session(
+            self.user.id,
+            "DSA",
+            "Beginner",
+            [{"id": question.id} for question in self.questions],
+        )
+        answers = {str(question.id): question.choice_1 for question in self.questions}
+        answers[str(self.questions[0].id)] = self.questions[0].choice_2
+        return {"session_id": session_id, "answers": answers}
+
+    def grade(self, data):
+        return self.client.post("/api/quiz/grade/", data, format="json")
+
+    def test_replayed_submission_is_not_graded_again(self):
+        submission = self.submission()
+
+        response = self.grade(submission)
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual((response.json()["correct"], response.json()["total"]), (3, 4))
+
+        response = self.grade(submission)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(QuizResult.objects.count(), 1)
+
+    def test_session_is_graded_once_within_a_batch(self):
+        submission = self.submission()
+
+        response = self.grade({"submissions": [submission, submission]})
+
+        self.assertEqual(response.status_code, 200, response.content)
+        first, second = response.json()["results"]
+        self.assertEqual(first["score"], 75)
+        self.assertEqual(second["error"], "Quiz session already graded.")
+        self.assertEqual(QuizResult.objects.count(), 1)
+
+    def test_session_can_be_submitted_again_when_saving_fails(self):
+        submission = self.submission()
+
+        with mock.patch(
+            "users.quiz_grading.record_quiz_results", side_effect=RuntimeError
+        ):
+            with self.assertRaises(RuntimeError):
+                grade_submissions(self.user.id, [submission])
+        self.assertFalse(QuizResult.objects.exists())
+
+        (outcome,) = grade_submissions(self.user.id, [submission])
+        self.assertEqual(outcome["score"], 75)
+        self.assertEqual(QuizResult.objects.count(), 1)
@@ -0,0 +1,60 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+from django.test import SimpleTestCase
+
+from users.management.commands.bench_calendar import (
+    legacy_study_days,
+    vectorized_study_days,
+)
+from users.scheduling import count_overlaps, find_overlaps
+
+WEEKDAYS = [
+    "Monday",
+    "Tuesday",
+    "Wednesday",
+    "Thursday",
+    "Friday",
+    "Saturday",
+    "Sunday",
+]
+
+
+class StudyDaysTests(SimpleTestCase):
+    def test_matches_the_legacy_loop(self):
+        rng = random.Random(3)
+        start = datetime(2025, 5, 3, 9, 41, 27, 512000, tzinfo=timezone.utc)
+        for _ in range(300):
+            total_days = rng.randint(1, 400)
+            study_start_date = start + timedelta(
+                days=rng.randint(0, 365), minutes=rng.randint(0, 1439)
+            )
+            args = (
+                study_start_date,
+                total_days,
+                rng.sample(WEEKDAYS, rng.randint(0, 6)),
+                rng.randint(0, total_days),
+                rng.choice(["DSA", "OOP", "SE"]),
+                rng.choice(["Morning", "Day", "Night", "Any"]),
+                rng.choice([0.25, 0.85, 1.5, 2.0, 3.3, 8.0]),
+            )
+
+            self.assertEqual(vectorized_study_days(*args), legacy_study_days(*args))
+
+
+class CountOverlapsTests(SimpleTestCase):
+    def test_matches_the_pairs_of_find_overlaps(self):
+        rng = random.Random(7)
+        for _ in range(50):
+            intervals = []
+            for _ in range(rng.randint(0, 60)):
+                start = rng.randint(0, 500)
+                intervals.append((start, start + rng.randint(0, 90)))
+            involved = [rng.random() < 0.3 for _ in intervals]
+
+            expected = [0] * len(intervals)
+            for first, second in find_overlaps(intervals):
+                if involved[first] or involved[second]:
+                    expected[second] += 1
+
+            self.assertEqual(count_overlaps(intervals, involved), expected)
@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta, timezone
+
+from django.contrib.auth.models import User
+from django.utils import timezone as django_timezone
+from rest_framework.test import APITestCase
+
+from users.models import Notification, StudyPlan, TaskEvent, Tombstone
+
+EVENT_START = datetime(2030, 1, 7, 9, 0, tzinfo=timezone.utc)
+
+
+class SyncTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="student", password="pw")
+        self.client.force_authenticate(user=self.user)
+        self.tasks = [
+            TaskEvent.objects.create(
+                user=self.user,
+                task_name=f"Task {i}",
+                subject="DSA",
+                task_type="Exam",
+                start_date=EVENT_START,
+                event_date=EVENT_START + timedelta(days=30),
+                estimated_study_hours=10,
+                notes="",
+                priority=1,
+            )
+            for i in range(3)
+        ]
+        self.study_plan = StudyPlan.objects.create(
+            user=self.user,
+            subject="DSA",
+            study_type="Exam Preparation",
+            plan=[],
+            event_id=self.tasks[2],
+        )
+        self.notifications = [
+            Notification.objects.create(user=self.user, title=f"Title {i}", body="")
+            for i in range(2)
+        ]
+
+    def sync(self, since=None):
+        response = self.client.get("/api/sync/", {"since": since} if since else {})
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_full_sync(self):
+        changes = self.sync()
+
+        self.assertTrue(changes["full"])
+        self.assertEqual(
+            [task["id"] for task in changes["tasks"]], [task.id for task in self.tasks]
+        )
+        self.assertEqual(
+            [study_plan["id"] for study_plan in changes["study_plans"]],
+            [self.study_plan.id],
+        )
+        self.assertEqual(len(changes["notifications"]), 2)
+
+    def test_delta_after_update_and_delete(self):
+        # Changes made before the sync, beyond its overlap
+        an_hour_ago = django_timezone.now() - timedelta(hours=1)
+        for model in (TaskEvent, StudyPlan, Notification):
+            model.objects.update(updated_at=an_hour_ago)
+        cursor = self.sync()["cursor"]
+
+        updated_task, deleted_task, soft_deleted_task = self.tasks
+        deleted_ids = {
+            "tasks": [deleted_task.id, soft_deleted_task.id],
+            "study_plans": [self.study_plan.id],
+            "notifications": [self.notifications[1].id],
+        }
+        updated_task.notes = "Chapter 3"
+        updated_task.save()
+        deleted_task.delete()
+        self.study_plan.delete()
+        soft_deleted_task.status = "Deleted"
+        soft_deleted_task.save()
+        self.notifications[1].delete()
+
+        changes = self.sync(cursor)
+
+        self.assertFalse(changes["full"])
+        self.assertEqual(
+            [(task["id"], task["notes"]) for task in changes["tasks"]],
+            [(updated_task.id, "Chapter 3")],
+        )
+        self.assertEqual(changes["study_plans"], [])
+        self.assertEqual(changes["notifications"], [])
+        self.assertEqual(changes["deleted"], deleted_ids)
+
+    def test_tombstones_are_not_kept_for_deleted_users(self):
+        self.user.delete()
+
+        self.assertFalse(Tombstone.objects.exists())
@@ -0,0 +1,72 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from users.models import TaskEvent
+
+EVENT_START = datetime(2030, 1, 7, 9, 0, tzinfo=timezone.utc)
+
+# "In Progress" isn't one of the choices, which TaskStatusUpdateView allows
+STATUSES = ["Pending", "Not Complete", "Complete", "Deleted", "In Progress"]
+
+
+class TaskPageTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="student", password="pw")
+        self.client.force_authenticate(user=self.user)
+        other_user = User.objects.create_user(username="other", password="pw")
+        rng = random.Random(5)
+        # Few distinct event dates, so pages often split tasks sharing one
+        TaskEvent.objects.bulk_create(
+            [
+                TaskEvent(
+                    user=user,
+                    task_name=f"Task {i}",
+                    subject="DSA",
+                    task_type="Exam",
+                    start_date=EVENT_START,
+                    event_date=EVENT_START + timedelta(days=rng.randint(0, 20)),
+                    estimated_study_hours=2,
+                    notes="",
+                    priority=1,
+                    status=rng.choice(STATUSES),
+                )
+                for user in (self.user, other_user)
+                for i in range(120)
+            ]
+        )
+
+    def get(self, path, **params):
+        response = self.client.get(path, params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_pages_match_the_unpaginated_list(self):
+        for path in ("/api/tasks/", "/api/all_tasks/"):
+            tasks = self.get(path)
+            pages = []
+            cursor = None
+            while True:
+                params = {"page_size": 7}
+                if cursor:
+                    params["cursor"] = cursor
+                with CaptureQueriesContext(connection) as queries:
+                    page = self.get(path, **params)
+                # One keyset query per page
+                self.assertEqual(len(queries), 1)
+                pages += page["results"]
+                cursor = page["next_cursor"]
+                if cursor is None:
+                    break
+
+            self.assertEqual(pages, tasks)
+            self.assertIn("In Progress", {task["status"] for task in tasks})
+
+    def test_invalid_cursor(self):
+        response = self.client.get("/api/tasks/", {"cursor": "not-a-cursor"})
+
+        self.assertEqual(response.status_code, 400)
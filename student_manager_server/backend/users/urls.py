@@ -3,6 +3,8 @@ from .views import (
     AddQuizQuestionsView,
     AddResourceView,
     AllTaskEventListView,
+    BulkCreateTaskEventsView,
+    BulkTaskStatusView,
     CompletedTasksView,
     CustomTokenObtainPairView,
     CustomTokenRefreshView,
@@ -13,15 +15,26 @@ from .views import (
     GetQuizResultsView,
     GetRecommendedResourcesView,
     GetStudyPlanView,
+    GradeQuizView,
+    ImportQuizQuestionsView,
     NotificationListView,
     NotificationReadView,
     NotificationSaveView,
+    QuizBundleManifestView,
+    QuizBundleView,
+    QuizHistoryView,
     QuizResultSaveView,
     RegisterView,
     SaveDeviceTokenView,
     SaveQuizResultView,
     SaveTaskEventView,
+    ScheduleStudyPlansView,
+    SearchQuizQuestionsView,
+    StudyPlanCacheStatsView,
+    StudyPlanConflictsView,
     StudyPlanView,
+    StudySessionsView,
+    SyncView,
     TaskEventListView,
     TaskStatusUpdateView,
     TestNotificationView,
@@ -41,6 +54,26 @@ urlpatterns = [
     path("token/", CustomTokenObtainPairView.as_view(), name="token_obtain_pair"),
     path("token/refresh/", CustomTokenRefreshView.as_view(), name="token_refresh"),
     path("questions/add/", AddQuizQuestionsView.as_view(), name="add-quiz-questions"),
+    path(
+        "questions/import/",
+        ImportQuizQuestionsView.as_view(),
+        name="import-quiz-questions",
+    ),
+    path(
+        "questions/search/",
+        SearchQuizQuestionsView.as_view(),
+        name="search-quiz-questions",
+    ),
+    path(
+        "questions/bundles/",
+        QuizBundleManifestView.as_view(),
+        name="quiz-bundle-manifest",
+    ),
+    path(
+        "questions/bundles/<str:subject>/<str:level>/",
+        QuizBundleView.as_view(),
+        name="quiz-bundle",
+    ),
     path("resources/add/", AddResourceView.as_view(), name="add-resource"),
     path("questions/", GetQuizQuestions.as_view(), name="get-quiz-questions"),
     path("quiz/results/save/", SaveQuizResultView.as_view(), name="save-quiz-result"),
@@ -49,6 +82,10 @@ urlpatterns = [
     path("study-plan/", StudyPlanView.as_view(), name="study-plan"),
     path("tasks/", TaskEventListView.as_view(), name="get-tasks"),
     path("all_tasks/", AllTaskEventListView.as_view(), name="get-tasks"),
+    path("tasks/bulk/", BulkCreateTaskEventsView.as_view(), name="bulk-create-tasks"),
+    path(
+        "tasks/bulk-status/", BulkTaskStatusView.as_view(), name="bulk-task-status"
+    ),
     path(
         "tasks/<int:task_id>/update-status/",
         UpdateTaskStatusView.as_view(),
@@ -73,6 +110,11 @@ urlpatterns = [
     path(
         "update-study-plans/", UpdateStudyPlansView.as_view(), name="update_study_plans"
     ),
+    path(
+        "study-plan/cache-stats/",
+        StudyPlanCacheStatsView.as_view(),
+        name="study-plan-cache-stats",
+    ),
     path("tasks/completed/", CompletedTasksView.as_view(), name="completed-tasks"),
     path(
         "study-plan/update/<int:event_id>/",
@@ -98,12 +140,26 @@ urlpatterns = [
         name="notification-read",
     ),
     path("study-plans/", GetAllStudyPlansView.as_view(), name="get-all-study-plans"),
+    path(
+        "study-plans/schedule/",
+        ScheduleStudyPlansView.as_view(),
+        name="schedule-study-plans",
+    ),
+    path(
+        "study-plans/conflicts/",
+        StudyPlanConflictsView.as_view(),
+        name="study-plan-conflicts",
+    ),
+    path("sessions/", StudySessionsView.as_view(), name="study-sessions"),
+    path("sync/", SyncView.as_view(), name="sync"),
     path(
         "api/quiz/results/save/", QuizResultSaveView.as_view(), name="quiz-results-save"
     ),
     path(
         "quiz/results_progress/", GetQuizResultsView.as_view(), name="get-quiz-results"
     ),
+    path("quiz/history/", QuizHistoryView.as_view(), name="quiz-history"),
+    path("quiz/grade/", GradeQuizView.as_view(), name="grade-quiz"),
     path(
         "users_resources/",
         GetRecommendedResourcesView.as_view(),
@@ -1,6 +1,7 @@
-from datetime import datetime, timedelta
+from datetime import datetime
+import hashlib
 import json
-import math
+import logging
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404
 from rest_framework import status
@@ -8,6 +9,9 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 
 
 # from .utils import send_push_notification
@@ -15,12 +19,73 @@ from users.models import QuizQuestion, QuizResult, StudyPlan, TaskEvent, UserPre
 from rest_framework_simplejwt.views import TokenObtainPairView
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
-from .models import DeviceToken, Notification, Resource
+from .models import DeviceToken, Notification, QuizRollup, Resource, StudyPlanDay
+from .list_serializers import (
+    completed_task_serializer,
+    notification_list_serializer,
+    task_list_serializer,
+)
+from .mastery import (
+    first_results_by_level,
+    latest_results_by_subject,
+    latest_scores_by_level,
+    level_averages,
+    record_quiz_result,
+    user_mastery,
+    weighted_overall_percentage,
+)
+from .plan_cache import cached_plan_study_days, plan_cache
+from .plan_days import (
+    all_study_dates,
+    all_study_plan_days,
+    changed_study_dates,
+    find_session_conflicts,
+    materialize_study_plan,
+    replan_study_plan,
+    rolling_study_plan_days,
+    summarize_session_conflicts,
+    sync_study_plan_days,
+)
+from .question_bank import question_bank
+from .question_import import (
+    QuestionImportError,
+    detect_format,
+    import_questions,
+    import_rows,
+    text_lines,
+)
+from .question_search import search_questions, serialize_search_result
+from .quiz_bundles import IMMUTABLE, REVALIDATE, bundle_response, quiz_bundles
+from .quiz_grading import MAX_SUBMISSIONS, grade_submissions, start_quiz_session
+from .quiz_history import record_quiz_attempt, serialize_rollup
+from .scheduling import (
+    STUDY_TYPE,
+    StudyPlanError,
+    generator_params,
+    preference_inputs,
+    schedule_user_tasks,
+    task_inputs,
+)
+
+from .sync import changes_since, touch
+from .task_lists import (
+    MAX_TASK_PAGE_SIZE,
+    TASK_PAGE_SIZE,
+    TaskCursorError,
+    task_page,
+    user_tasks,
+)
+from .task_status import (
+    MAX_STATUS_CHANGES,
+    apply_status_changes,
+    clean_status_changes,
+)
 
 # from .utils import send_push_notification
 
 
 from .serializers import (
+    BulkTaskEventSerializer,
     NotificationSerializer,
     QuizQuestionSerializer,
     QuizResultSerializer,
@@ -30,13 +95,15 @@ from .serializers import (
     UserSerializer,
     UsersResourceSerializer,
 )
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 
 
 from rest_framework.permissions import (
     AllowAny,
 )  # This allows unauthenticated users to access this view
 
+logger = logging.getLogger(__name__)
+
 
 class RegisterView(APIView):
     permission_classes = [
@@ -134,6 +201,164 @@ class AddQuizQuestionsView(APIView):
             )
 
 
+class ImportQuizQuestionsView(APIView):
+    """
+    Bulk import of quiz questions from an uploaded NDJSON or CSV file
+    (multipart field "file"; "format" when the file name doesn't tell).
+    Invalid rows and questions already in the bank are skipped and reported.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response(
+                {"error": "Upload the questions as a 'file' field."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        file_format = request.data.get("format") or detect_format(upload.name)
+        if file_format not in ("csv", "ndjson"):
+            return Response(
+                {"error": "format must be 'csv' or 'ndjson'."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            report = import_questions(
+                import_rows(text_lines(upload.file), file_format)
+            )
+        except (QuestionImportError, UnicodeDecodeError) as e:
+            # Batches imported before the error are kept; importing the
+            # fixed file again skips them as duplicates
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(
+            report,
+            status=status.HTTP_201_CREATED if report["created"] else status.HTTP_200_OK,
+        )
+
+
+class SearchQuizQuestionsView(APIView):
+    """
+    Full-text search over the question text and choices, best matches first:
+    GET questions/search/?q=&subject=&level=&page=&page_size=
+    Very broad queries only rank their MAX_RANKED_MATCHES newest matches.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            return Response(
+                {"error": "q is a required parameter"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        subject = request.query_params.get("subject")
+        if subject and subject not in dict(QuizQuestion.SUBJECT_CHOICES):
+            return Response(
+                {"error": f"Invalid subject: {subject}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        level = request.query_params.get("level")
+        if level and level not in dict(QuizQuestion.DIFFICULTY_CHOICES):
+            return Response(
+                {"error": f"Invalid level: {level}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            page = int(request.query_params.get("page", 1))
+            page_size = int(request.query_params.get("page_size", 20))
+        except ValueError:
+            return Response(
+                {"error": "page and page_size must be integers."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if page < 1 or not 1 <= page_size <= 100:
+            return Response(
+                {"error": "page must be at least 1 and page_size between 1 and 100."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # One extra row tells whether there is a next page without a count
+        questions = search_questions(
+            query, subject, level, limit=page_size + 1, offset=(page - 1) * page_size
+        )
+        return Response(
+            {
+                "page": page,
+                "page_size": page_size,
+                "has_next": len(questions) > page_size,
+                "results": [
+                    serialize_search_result(question)
+                    for question in questions[:page_size]
+                ],
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class QuizBundleManifestView(APIView):
+    """
+    Current version of every prebuilt question bundle, with the URL to fetch
+    it at: GET questions/bundles/
+    Revalidated with its ETag, so an unchanged bank costs the client a 304.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        bundles = [
+            {
+                "subject": bundle.subject,
+                "level": bundle.level,
+                "version": bundle.version,
+                "count": bundle.count,
+                "url": (
+                    f"{request.path}{bundle.subject}/{bundle.level}/"
+                    f"?v={bundle.version}"
+                ),
+            }
+            for bundle in quiz_bundles.all()
+        ]
+        body = json.dumps({"bundles": bundles}, separators=(",", ":")).encode()
+        etag = hashlib.sha256(body).hexdigest()[:20]
+        return bundle_response(request, etag, body, REVALIDATE)
+
+
+class QuizBundleView(APIView):
+    """
+    Every question of a subject and level as one gzipped JSON bundle:
+    GET questions/bundles/<subject>/<level>/?v=<version>
+    Requested with its current version (as listed by the manifest), the
+    bundle is cached for a year; otherwise it is revalidated with its ETag.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, subject, level, *args, **kwargs):
+        if subject not in dict(QuizQuestion.SUBJECT_CHOICES) or level not in dict(
+            QuizQuestion.DIFFICULTY_CHOICES
+        ):
+            return Response(
+                {"error": "Unknown subject or level."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        bundle = quiz_bundles.get(subject, level)
+        # An old ?v= gets the current bundle, which must not be kept for it
+        cache_control = (
+            IMMUTABLE if request.query_params.get("v") == bundle.version else REVALIDATE
+        )
+        return bundle_response(
+            request, bundle.version, bundle.body, cache_control, gzipped=True
+        )
+
+
 class AddResourceView(APIView):
     def post(self, request, *args, **kwargs):
         resources_data = (
@@ -168,48 +393,37 @@ class GetQuizQuestions(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        if level == "Mixed":
-            # Get 5 questions from each level
-            beginner_questions = QuizQuestion.objects.filter(
-                subject=subject, difficulty_level="Beginner"
-            )[:5]
-            intermediate_questions = QuizQuestion.objects.filter(
-                subject=subject, difficulty_level="Intermediate"
-            )[:5]
-            advanced_questions = QuizQuestion.objects.filter(
-                subject=subject, difficulty_level="Advanced"
-            )[:5]
-
-            questions = (
-                list(beginner_questions)
-                + list(intermediate_questions)
-                + list(advanced_questions)
+        mode = request.query_params.get("mode", "random")
+        if mode not in ("random", "adaptive"):
+            return Response(
+                {"error": "mode must be 'random' or 'adaptive'."},
+                status=status.HTTP_400_BAD_REQUEST,
             )
 
+        # Draw random questions from the in-memory question bank, avoiding
+        # the ones the user saw recently; adaptive quizzes draw them near the
+        # difficulty that suits the user's latest score of each level
+        if level == "Mixed":
+            # Get 5 questions from each level
+            counts = {"Beginner": 5, "Intermediate": 5, "Advanced": 5}
         else:
             # Get 10 questions from the specified level
-            questions = QuizQuestion.objects.filter(
-                subject=subject, difficulty_level=level
-            )[:10]
-
-        # Prepare the data to be returned
-        serialized_questions = []
-        for question in questions:
-            serialized_questions.append(
-                {
-                    "question": question.question,
-                    "choices": [
-                        question.choice_1,
-                        question.choice_2,
-                        question.choice_3,
-                        question.choice_4,
-                    ],
-                    "correct_answer": question.correct_answer,
-                    "difficulty_level": question.difficulty_level,
-                }
-            )
+            counts = {level: 10}
+        scores = None
+        if mode == "adaptive":
+            scores = latest_scores_by_level(user_mastery(request.user.id), subject)
+        serialized_questions = question_bank.sample_quiz(
+            subject, counts, user_id=request.user.id, scores=scores
+        )
+        # Lets the answers be graded by the server (GradeQuizView)
+        session_id = start_quiz_session(
+            request.user.id, subject, level, serialized_questions
+        )
 
-        return Response({"questions": serialized_questions}, status=status.HTTP_200_OK)
+        return Response(
+            {"questions": serialized_questions, "session_id": session_id},
+            status=status.HTTP_200_OK,
+        )
 
 
 class SaveQuizResultView(APIView):
@@ -227,13 +441,17 @@ class SaveQuizResultView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Use update_or_create to handle both creating and updating results
-        quiz_result, created = QuizResult.objects.update_or_create(
-            user=request.user,
-            subject=subject,
-            level=level,
-            defaults={"results": results},
-        )
+        # Use update_or_create to handle both creating and updating results,
+        # and update the user's mastery summary and attempt history with it
+        with transaction.atomic():
+            quiz_result, created = QuizResult.objects.update_or_create(
+                user=request.user,
+                subject=subject,
+                level=level,
+                defaults={"results": results},
+            )
+            record_quiz_result(quiz_result)
+            record_quiz_attempt(quiz_result)
 
         if created:
             return Response(
@@ -247,6 +465,53 @@ class SaveQuizResultView(APIView):
             )
 
 
+class GradeQuizView(APIView):
+    """
+    Grade quiz answers against the questions of their quiz session and save
+    the score as a quiz result. Takes {"session_id", "answers": {question id:
+    answer}}, or {"submissions": [...]} of those to grade many at once.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        data = request.data
+        single = "submissions" not in data
+        submissions = [data] if single else data["submissions"]
+
+        if not isinstance(submissions, list) or not submissions:
+            return Response(
+                {"error": "submissions must be a non-empty list."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(submissions) > MAX_SUBMISSIONS:
+            return Response(
+                {"error": f"At most {MAX_SUBMISSIONS} submissions per request."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        for submission in submissions:
+            if (
+                not isinstance(submission, dict)
+                or not isinstance(submission.get("session_id"), str)
+                or not isinstance(submission.get("answers"), dict)
+            ):
+                return Response(
+                    {"error": "Each submission needs a session_id and answers."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+        outcomes = grade_submissions(request.user.id, submissions)
+
+        if single:
+            outcome = outcomes[0]
+            if "error" in outcome:
+                return Response(
+                    {"error": outcome["error"]}, status=status.HTTP_400_BAD_REQUEST
+                )
+            return Response(outcome, status=status.HTTP_201_CREATED)
+        return Response({"results": outcomes}, status=status.HTTP_200_OK)
+
+
 class SaveTaskEventView(APIView):
     permission_classes = [IsAuthenticated]  # Ensure the user is authenticated
 
@@ -278,6 +543,129 @@ class SaveTaskEventView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class BulkCreateTaskEventsView(APIView):
+    """
+    Create many tasks at once: POST tasks/bulk/ with {"tasks": [...]} (or
+    just the list), each task as SaveTaskEventView takes it. With
+    "generate_plans": true a study plan is generated for every new task as
+    StudyPlanView would ("rolling_horizon" applies to all of them), with the
+    preferences and quiz results loaded once.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    # Tasks created per request at most
+    MAX_TASKS = 500
+
+    def post(self, request, *args, **kwargs):
+        user = request.user
+        data = request.data
+        if isinstance(data, list):
+            data = {"tasks": data}
+        tasks_data = data.get("tasks")
+        generate_plans = bool(data.get("generate_plans"))
+        rolling_horizon = bool(data.get("rolling_horizon"))
+
+        if not isinstance(tasks_data, list) or not tasks_data:
+            return Response(
+                {"error": "Expected a non-empty list of tasks."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(tasks_data) > self.MAX_TASKS:
+            return Response(
+                {"error": f"At most {self.MAX_TASKS} tasks per request."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # Step 1: Validate every task; nothing is saved unless all are valid
+        serializer = BulkTaskEventSerializer(
+            data=tasks_data, many=True, context={"request": request}
+        )
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        task_events = [TaskEvent(**task) for task in serializer.validated_data]
+
+        # Step 2: Build the study plans in memory, loading the preferences and
+        # the mastery summary once for all tasks
+        errors = []
+        plans = []
+        if generate_plans:
+            user_preference = UserPreference.objects.filter(user=user).first()
+            mastery = user_mastery(user.id)
+            quiz_results = {}
+            for index, task_event in enumerate(task_events):
+                if user_preference is None:
+                    errors.append(
+                        {"index": index, "error": "User preferences not found."}
+                    )
+                    continue
+                subject = task_event.subject
+                if subject not in quiz_results:
+                    quiz_results[subject] = first_results_by_level(mastery, subject)
+                task_data = {
+                    "subject": subject,
+                    "study_start_date": task_event.start_date.isoformat(),
+                    "exam_date": task_event.event_date.isoformat(),
+                    "estimated_study_hours": task_event.estimated_study_hours,
+                }
+                # The task id is only known once it is saved
+                study_plan_data, error_response = build_study_plan(
+                    user,
+                    task_data,
+                    None,
+                    user_preference,
+                    quiz_results[subject],
+                    task_event.skip_days or [],
+                )
+                if error_response:
+                    errors.append(
+                        {"index": index, "error": error_response.data["error"]}
+                    )
+                    continue
+                plans.append((index, study_plan_data))
+
+        # Step 3: Save the tasks and their plans in one transaction
+        with transaction.atomic():
+            TaskEvent.objects.bulk_create(task_events)
+            study_plans = []
+            for index, study_plan_data in plans:
+                study_plan_data["event_id_id"] = task_events[index].id
+                # Rolling plans only keep generator_params
+                study_plans.append(
+                    StudyPlan(
+                        **{
+                            **study_plan_data,
+                            "plan": [] if rolling_horizon else study_plan_data["plan"],
+                        },
+                        rolling_horizon=rolling_horizon,
+                    )
+                )
+            StudyPlan.objects.bulk_create(study_plans)
+            sync_study_plan_days(study_plans, all_study_dates(study_plans))
+
+        response_data = {
+            "message": "Tasks/Events created successfully!",
+            "task_event_ids": [task_event.id for task_event in task_events],
+        }
+        if generate_plans:
+            response_data.update(
+                study_plans=[
+                    {
+                        "index": index,
+                        "task_event_id": study_plan.event_id_id,
+                        "study_plan_id": study_plan.id,
+                        "total_study_hours": sum(
+                            day["total_hours"] for day in study_plan_data["plan"]
+                        ),
+                    }
+                    for (index, study_plan_data), study_plan in zip(plans, study_plans)
+                ],
+                errors=errors,
+                conflicts=summarize_session_conflicts(user, study_plans),
+            )
+        return Response(response_data, status=status.HTTP_201_CREATED)
+
+
 class UserPreferenceView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -323,34 +711,61 @@ class UserPreferenceView(APIView):
             )
 
 
-class TaskEventListView(APIView):
+class TaskListView(APIView):
+    """
+    The user's tasks, except those with an excluded status, by event date.
+    With ?page_size= or ?cursor= they are paginated by (event_date, id):
+    {"results": [...], "next_cursor": ...}, where next_cursor is passed as
+    ?cursor= to get the next page and is null on the last one. Without
+    either, every task is returned as a list.
+    """
+
     permission_classes = [IsAuthenticated]
+    excluded_statuses = ["Deleted"]
 
     def get(self, request, *args, **kwargs):
         user = request.user  # Get the logged-in user
-        tasks = (
-            TaskEvent.objects.filter(user=user)
-            .exclude(status="Deleted")
-            .exclude(status="Complete")
-            .order_by("event_date")
-        )
+        excluded = self.excluded_statuses
 
-        serializer = TaskEventSerializer(tasks, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        cursor = request.query_params.get("cursor")
+        page_size = request.query_params.get("page_size")
+        if cursor is None and page_size is None:
+            return Response(
+                task_list_serializer.serialize(user_tasks(user, excluded)),
+                status=status.HTTP_200_OK,
+            )
 
-class AllTaskEventListView(APIView):
-    permission_classes = [IsAuthenticated]
+        try:
+            page_size = int(page_size) if page_size is not None else TASK_PAGE_SIZE
+        except ValueError:
+            return Response(
+                {"error": "page_size must be an integer."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if not 1 <= page_size <= MAX_TASK_PAGE_SIZE:
+            return Response(
+                {"error": f"page_size must be between 1 and {MAX_TASK_PAGE_SIZE}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-    def get(self, request, *args, **kwargs):
-        user = request.user  # Get the logged-in user
-        tasks = (
-            TaskEvent.objects.filter(user=user)
-            .exclude(status="Deleted")
-            .order_by("event_date")
+        try:
+            tasks, next_cursor = task_page(user, excluded, cursor, page_size)
+        except TaskCursorError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(
+            {"results": tasks, "next_cursor": next_cursor},
+            status=status.HTTP_200_OK,
         )
 
-        serializer = TaskEventSerializer(tasks, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+
+class TaskEventListView(TaskListView):
+    # Upcoming tasks: completed ones are left out
+    excluded_statuses = ["Deleted", "Complete"]
+
+
+class AllTaskEventListView(TaskListView):
+    excluded_statuses = ["Deleted"]
 
 
 class UpdateTaskStatusView(APIView):
@@ -382,6 +797,50 @@ class UpdateTaskStatusView(APIView):
         )
 
 
+class BulkTaskStatusView(APIView):
+    """
+    Change the status of many of the user's tasks at once:
+    POST tasks/bulk-status/ with [{"id": task id, "status": status}, ...]
+    Either every change is applied, with a notification per changed task, or
+    none is.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        changes = request.data
+        if not isinstance(changes, list) or not changes:
+            return Response(
+                {"error": "Expected a non-empty list of {id, status} changes."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(changes) > MAX_STATUS_CHANGES:
+            return Response(
+                {"error": f"At most {MAX_STATUS_CHANGES} changes per request."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        statuses, errors = clean_status_changes(changes)
+        if errors:
+            return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        result = apply_status_changes(request.user, statuses)
+        if result is None:
+            return Response(
+                {"error": "Task not found or you don't have permission to modify it."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        updated, unchanged = result
+        return Response(
+            {
+                "message": "Task statuses updated successfully!",
+                "updated": updated,
+                "unchanged": unchanged,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
 class UserProfileView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -401,35 +860,9 @@ class UserQuizPercentageView(APIView):
     def get(self, request, *args, **kwargs):
         user = request.user
 
-        # Retrieve quiz results for the user
-        results = QuizResult.objects.filter(user=user)
-
-        # Initialize scores to 0
-        advanced_score = 0
-        intermediate_score = 0
-        beginner_score = 0
-
-        # Check if each level's score exists, if not, set it to 0
-        advanced_result = results.filter(level="Advanced").first()
-        intermediate_result = results.filter(level="Intermediate").first()
-        beginner_result = results.filter(level="Beginner").first()
-
-        # If the result exists, convert the percentage string to a float (remove '%')
-        if advanced_result:
-            advanced_score = float(advanced_result.results.replace("%", "").strip())
-        if intermediate_result:
-            intermediate_score = float(
-                intermediate_result.results.replace("%", "").strip()
-            )
-        if beginner_result:
-            beginner_score = float(beginner_result.results.replace("%", "").strip())
-
-        # Calculate the overall quiz percentage based on the weighted formula
-        overall_percentage = (
-            (advanced_score * 0.5)
-            + (intermediate_score * 0.35)
-            + (beginner_score * 0.15)
-        )
+        # Calculate the overall quiz percentage based on the weighted formula,
+        # from the user's mastery summary
+        overall_percentage = weighted_overall_percentage(user_mastery(user.id))
 
         return Response({"overall_percentage": overall_percentage})
 
@@ -459,18 +892,15 @@ class GetStudyPlanView(APIView):
     permission_classes = [IsAuthenticated]  # Ensure the user is authenticated
 
     def get(self, request, event_id, *args, **kwargs):
-   
-        print(f"Received event_id: {event_id}")  
-
-        # Debugging - Check if user is authenticated
-        print(f"Authenticated user: {request.user}")  
+        date_from, date_to, error_response = parse_plan_window(request.query_params)
+        if error_response:
+            return error_response
 
         # Step 1: Retrieve the StudyPlan based on event_id
         try:
             study_plan = StudyPlan.objects.get(
                 event_id_id=event_id
             )  # Find the StudyPlan by event_id
-            print(f"Found study plan: {study_plan}")  
         except StudyPlan.DoesNotExist:
             return Response(
                 {"error": "Study plan not found for the given event_id"},
@@ -478,7 +908,32 @@ class GetStudyPlanView(APIView):
             )
 
         # Step 2: Return the plan as a JSON response
-        return JsonResponse(study_plan.plan, safe=False)
+        return JsonResponse(
+            materialize_study_plan(study_plan, date_from, date_to), safe=False
+        )
+
+
+def parse_plan_window(query_params):
+    """
+    Read the optional ?from=&to= (YYYY-MM-DD) window of a study plan request.
+    Returns a tuple: (date_from, date_to, error_response).
+    """
+    try:
+        date_from = query_params.get("from")
+        date_to = query_params.get("to")
+        date_from = datetime.strptime(date_from, "%Y-%m-%d").date() if date_from else None
+        date_to = datetime.strptime(date_to, "%Y-%m-%d").date() if date_to else None
+    except ValueError:
+        return None, None, Response(
+            {"error": "Invalid date format. Use YYYY-MM-DD."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    if date_from and date_to and date_from > date_to:
+        return None, None, Response(
+            {"error": "'from' must not be after 'to'."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    return date_from, date_to, None
 
 
 def generate_study_plan(user, task_data, event_id):
@@ -497,40 +952,10 @@ def generate_study_plan(user, task_data, event_id):
             status=status.HTTP_404_NOT_FOUND,
         )
 
-    # Step 2: Retrieve Quiz Results
-    try:
-        quiz_results = QuizResult.objects.filter(
-            user=user, subject=task_data.get("subject")
-        )
-        print(f"Quiz results for {task_data.get('subject')}: {quiz_results.values()}")
-    except QuizResult.DoesNotExist:
-        return None, Response(
-            {"error": "User quiz results not found."},
-            status=status.HTTP_404_NOT_FOUND,
-        )
-
-    # Step 3: Retrieve Task/Event Data
-    subject = task_data.get("subject")
-    try:
-        study_start_date = datetime.fromisoformat(
-            task_data.get("study_start_date").replace("Z", "+00:00")
-        )
-        exam_date = datetime.fromisoformat(
-            task_data.get("exam_date").replace("Z", "+00:00")
-        )
-    except (ValueError, TypeError) as e:
-        return None, Response(
-            {"error": f"Invalid date format: {str(e)}"},
-            status=status.HTTP_400_BAD_REQUEST,
-        )
-    estimated_study_hours = task_data.get("estimated_study_hours")
-
-    # Validate dates
-    if study_start_date >= exam_date:
-        return None, Response(
-            {"error": "Study start date must be before exam date."},
-            status=status.HTTP_400_BAD_REQUEST,
-        )
+    # Step 2: Retrieve Quiz Results from the user's mastery summary
+    quiz_results = first_results_by_level(
+        user_mastery(user.id), task_data.get("subject")
+    )
 
     # Retrieve TaskEvent to get skip_days
     try:
@@ -539,153 +964,41 @@ def generate_study_plan(user, task_data, event_id):
     except TaskEvent.DoesNotExist:
         skip_days = []
 
-    # Step 4: Adjust Study Hours Based on Quiz Results
-    study_hours_per_day = min(user_preference.hours_per_day, 4.0)
-    print(f"Initial study_hours_per_day: {study_hours_per_day}")
-
-    advanced_result = quiz_results.filter(level="Advanced").first()
-    intermediate_result = quiz_results.filter(level="Intermediate").first()
-    beginner_result = quiz_results.filter(level="Beginner").first()
-
-    def convert_to_float(percentage_str):
-        return float(percentage_str.replace("%", "").strip()) if percentage_str else 0.0
-
-    adjustments = []
-    if advanced_result and convert_to_float(advanced_result.results) > 60:
-        adjustments.append(0.7)
-    if intermediate_result and convert_to_float(intermediate_result.results) > 60:
-        adjustments.append(0.8)
-    if beginner_result and convert_to_float(beginner_result.results) > 60:
-        adjustments.append(0.9)
-
-    if adjustments:
-        adjustment = min(adjustments)
-        print(f"Applying adjustment: {adjustment}")
-        study_hours_per_day *= adjustment
-    else:
-        print("No adjustments applied, increasing hours")
-        study_hours_per_day = min(study_hours_per_day + 0.5, 4.0)
-    print(f"Adjusted study_hours_per_day: {study_hours_per_day}")
-
-    # Step 5: Calculate Study Plan Basics
-    total_days = (exam_date - study_start_date).days  # Exclude exam_date
-    if total_days < 1:
-        return None, Response(
-            {"error": "No days available for study plan before exam date."},
-            status=status.HTTP_400_BAD_REQUEST,
-        )
-
-    skip_days_count = sum(
-        1
-        for i in range(total_days)
-        if (study_start_date + timedelta(days=i)).strftime("%A") in skip_days
-    )
-    available_days = (total_days - skip_days_count) * (
-        user_preference.days_per_week / 7
+    return build_study_plan(
+        user,
+        task_data,
+        event_id,
+        user_preference,
+        quiz_results,
+        skip_days,
     )
-    if available_days < 1:
-        return None, Response(
-            {"error": "No available days for study plan after skipping days."},
-            status=status.HTTP_400_BAD_REQUEST,
-        )
-
-    hours_per_session = estimated_study_hours / available_days
-
-    # Step 6: Adjust for Strengths and Weaknesses
-    strength_factor = 1
-    weakness_factor = 1
-
-    strengths = user_preference.get_strengths()
-    weaknesses = user_preference.get_weaknesses()
-
-    strength_ratings = {
-        "Can work more than 3 hours continuously": 5,
-        "Good at organizing tasks and time": 4,
-        "Quick learner": 4,
-        "Can stay focused for extended periods": 5,
-        "Good at retaining information through reading": 3,
-    }
-
-    weakness_ratings = {
-        "Easily distracted": 5,
-        "Tend to procrastinate often": 5,
-        "Find it hard to start studying without motivation": 4,
-        "Struggle with organizing tasks": 4,
-        "Have difficulty managing stress": 3,
-    }
 
-    adjusted_hours = hours_per_session
-    for strength in strengths:
-        if strength in strength_ratings:
-            adjusted_hours *= 1 + (strength_ratings[strength] * 0.05)
-
-    for weakness in weaknesses:
-        if weakness in weakness_ratings:
-            adjusted_hours *= 1 - (weakness_ratings[weakness] * 0.05)
-
-    adjusted_hours = min(adjusted_hours, 1.5)
-
-    # Step 7: Generate Study Plan with Sessions
-    max_session_length = 1.5
-    max_sessions_per_day = 2
-    study_plan = []
-
-    current_date = study_start_date
-    days_added = 0
-    exam_date_minus_one = exam_date - timedelta(days=1)
-    while days_added < int(available_days) and current_date <= exam_date_minus_one:
-        weekday_name = current_date.strftime("%A")
-        if weekday_name in skip_days:
-            current_date += timedelta(days=1)
-            continue
-
-        if user_preference.preferred_study_time == "Morning":
-            study_start_time = current_date.replace(hour=6, minute=0)
-        elif user_preference.preferred_study_time == "Day":
-            study_start_time = current_date.replace(hour=12, minute=0)
-        elif user_preference.preferred_study_time == "Night":
-            study_start_time = current_date.replace(hour=21, minute=0)
-        else:
-            study_start_time = current_date.replace(hour=8, minute=0)
-
-        sessions_per_day = min(
-            max(1, math.ceil(study_hours_per_day / max_session_length)),
-            max_sessions_per_day,
-        )
-        session_hours = min(study_hours_per_day / sessions_per_day, max_session_length)
-        daily_schedule = []
-
-        current_time = study_start_time
-        for session in range(sessions_per_day):
-            session_end_time = current_time + timedelta(hours=session_hours)
-            daily_schedule.append(
-                {
-                    "start_time": current_time.strftime("%H:%M"),
-                    "end_time": session_end_time.strftime("%H:%M"),
-                    "hours_to_study": round(session_hours, 2),
-                }
-            )
-            current_time = session_end_time + timedelta(minutes=30)
 
-        study_plan.append(
-            {
-                "study_date": current_date.strftime("%Y-%m-%d"),
-                "sessions": daily_schedule,
-                "subject": subject,
-                "study_time": user_preference.preferred_study_time,
-                "total_hours": round(session_hours * sessions_per_day, 2),
-            }
+def build_study_plan(
+    user, task_data, event_id, user_preference, quiz_results, skip_days
+):
+    """
+    Build a study plan from already loaded data, without touching the database.
+    quiz_results maps each level to its results string (see first_results_by_level).
+    Returns the same (study_plan_data, error_response) tuple as generate_study_plan.
+    """
+    task = task_inputs(task_data, skip_days)
+    preferences = preference_inputs(user_preference)
+    try:
+        study_plan = cached_plan_study_days(preferences, quiz_results, task)
+    except StudyPlanError as e:
+        return None, Response(
+            {"error": str(e)},
+            status=status.HTTP_400_BAD_REQUEST,
         )
-        days_added += 1
-        current_date += timedelta(days=1)
 
-    # Step 8: Save the Study Plan
     study_plan_data = {
         "user": user,
-        "subject": subject,
-        "study_type": "exam preparation",
+        "subject": task["subject"],
+        "study_type": STUDY_TYPE,
         "plan": study_plan,
         "event_id_id": event_id,
+        "generator_params": generator_params(preferences, quiz_results, task),
     }
     return study_plan_data, None
 
@@ -702,28 +1015,54 @@ class StudyPlanView(APIView):
         if error_response:
             return error_response
 
-        # Save the study plan
-        study_plan_instance = StudyPlan.objects.create(**study_plan_data)
+        # Save the study plan; rolling plans only keep generator_params
+        rolling_horizon = bool(task_data.get("rolling_horizon"))
+        if rolling_horizon:
+            study_plan_instance = StudyPlan.objects.create(
+                **{**study_plan_data, "plan": []}, rolling_horizon=True
+            )
+            study_plan = materialize_study_plan(study_plan_instance)
+        else:
+            with transaction.atomic():
+                study_plan_instance = StudyPlan.objects.create(**study_plan_data)
+                sync_study_plan_days(
+                    [study_plan_instance], all_study_dates([study_plan_instance])
+                )
+            study_plan = study_plan_data["plan"]
 
         # Return response
         return Response(
             {
-                "study_plan": study_plan_data["plan"],
+                "study_plan": study_plan,
                 "study_plan_id": study_plan_instance.id,
                 "total_study_hours": sum(
                     day["total_hours"] for day in study_plan_data["plan"]
                 ),
+                "conflicts": summarize_session_conflicts(user, [study_plan_instance]),
             },
             status=status.HTTP_200_OK,
         )
 
 
+def study_plan_fields(study_plan):
+    """The fields a full rebuild sets, except plan, to tell if it changed any."""
+    return (
+        study_plan.user_id,
+        study_plan.subject,
+        study_plan.study_type,
+        study_plan.generator_params,
+        study_plan.day_overrides,
+    )
+
+
 class UpdateStudyPlansView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request, *args, **kwargs):
         user = request.user
         subject = request.data.get("subject")
+        # Incremental replans keep past and edited days and only regenerate from today
+        incremental = bool(request.data.get("incremental"))
 
         if not subject:
             return Response(
@@ -732,27 +1071,45 @@ class UpdateStudyPlansView(APIView):
             )
 
         # Step 1: Find all TaskEvent records for the user with the given subject and status 'Pending'
-        try:
-            task_events = TaskEvent.objects.filter(
-                user=user, subject=subject, status="Pending"
-            )
-        except TaskEvent.DoesNotExist:
+        task_events = list(
+            TaskEvent.objects.filter(user=user, subject=subject, status="Pending")
+        )
+        if not task_events:
             return Response(
                 {"message": f"No pending tasks found for subject '{subject}'."},
                 status=status.HTTP_200_OK,
             )
 
-        if not task_events.exists():
-            return Response(
-                {"message": f"No pending tasks found for subject '{subject}'."},
-                status=status.HTTP_200_OK,
-            )
+        # Step 2: Load everything the plans depend on once for all tasks
+        user_preference = UserPreference.objects.filter(user=user).first()
+        quiz_results = first_results_by_level(user_mastery(user.id), subject)
+        existing_plans = {}
+        for study_plan in StudyPlan.objects.filter(
+            event_id__in=[task_event.id for task_event in task_events]
+        ):
+            existing_plans.setdefault(study_plan.event_id_id, []).append(study_plan)
 
-        # Step 2: Regenerate study plans for each task
+        # Step 3: Regenerate study plans for each task in memory
         updated_plans = []
         errors = []
+        plans_to_create = []
+        plans_to_update = []
+        plans_to_replan = []
+        changed_dates = {}
+        generated = []
+        today = timezone.localdate()
 
         for task_event in task_events:
+            if user_preference is None:
+                errors.append(
+                    {
+                        "task_event_id": task_event.id,
+                        "task_name": task_event.task_name,
+                        "error": "User preferences not found.",
+                    }
+                )
+                continue
+
             # Construct task_data from TaskEvent
             task_data = {
                 "subject": task_event.subject,
@@ -762,9 +1119,53 @@ class UpdateStudyPlansView(APIView):
                 "id": task_event.id,
             }
 
+            study_plans = existing_plans.get(task_event.id, [])
+            if incremental and len(study_plans) == 1:
+                study_plan_instance = study_plans[0]
+                previous_params = study_plan_instance.generator_params
+                try:
+                    changed_dates[study_plan_instance.id] = replan_study_plan(
+                        study_plan_instance,
+                        generator_params(
+                            preference_inputs(user_preference),
+                            quiz_results,
+                            task_inputs(task_data, task_event.skip_days or []),
+                        ),
+                        today,
+                    )
+                except StudyPlanError as e:
+                    errors.append(
+                        {
+                            "task_event_id": task_event.id,
+                            "task_name": task_event.task_name,
+                            "error": str(e),
+                        }
+                    )
+                    continue
+
+                # Only write plans whose days or inputs changed
+                if (
+                    changed_dates[study_plan_instance.id]
+                    or study_plan_instance.generator_params != previous_params
+                ):
+                    plans_to_replan.append(study_plan_instance)
+                generated.append(
+                    (
+                        task_event,
+                        study_plan_instance,
+                        all_study_plan_days(study_plan_instance),
+                    )
+                )
+                continue
+
             # Generate study plan
-            study_plan_data, error_response = generate_study_plan(
-                user, task_data, task_event.id
+            study_plan_data, error_response = build_study_plan(
+                user,
+                task_data,
+                task_event.id,
+                user_preference,
+                quiz_results,
+                task_event.skip_days or [],
             )
             if error_response:
                 errors.append(
@@ -776,28 +1177,76 @@ class UpdateStudyPlansView(APIView):
                 )
                 continue
 
-            # Update or create StudyPlan
-            try:
-                study_plan_instance, created = StudyPlan.objects.update_or_create(
-                    event_id_id=task_event.id,
-                    defaults={
-                        "user": user,
-                        "subject": study_plan_data["subject"],
-                        "study_type": study_plan_data["study_type"],
-                        "plan": study_plan_data["plan"],
-                    },
-                )
-                updated_plans.append(
+            if len(study_plans) > 1:
+                errors.append(
                     {
                         "task_event_id": task_event.id,
                         "task_name": task_event.task_name,
-                        "study_plan_id": study_plan_instance.id,
-                        "total_study_hours": sum(
-                            day["total_hours"] for day in study_plan_data["plan"]
-                        ),
+                        "error": "Failed to save study plan: multiple study plans exist for this task.",
                     }
                 )
-            except Exception as e:
+                continue
+
+            if study_plans:
+                study_plan_instance = study_plans[0]
+                previous_fields = study_plan_fields(study_plan_instance)
+                study_plan_instance.user = user
+                study_plan_instance.subject = study_plan_data["subject"]
+                study_plan_instance.study_type = study_plan_data["study_type"]
+                study_plan_instance.generator_params = study_plan_data[
+                    "generator_params"
+                ]
+                if study_plan_instance.rolling_horizon:
+                    # A full rebuild generates the days stored by replans too
+                    changed_dates[study_plan_instance.id] = changed_study_dates(
+                        study_plan_instance.plan, []
+                    )
+                    study_plan_instance.plan = []
+                else:
+                    # A full rebuild drops the manual edits of the old plan
+                    changed_dates[study_plan_instance.id] = changed_study_dates(
+                        study_plan_instance.plan, study_plan_data["plan"]
+                    )
+                    study_plan_instance.plan = study_plan_data["plan"]
+                    study_plan_instance.day_overrides = {}
+                # Only write plans whose days or inputs changed
+                if changed_dates.get(study_plan_instance.id) or (
+                    study_plan_fields(study_plan_instance) != previous_fields
+                ):
+                    plans_to_update.append(study_plan_instance)
+            else:
+                study_plan_instance = StudyPlan(**study_plan_data)
+                plans_to_create.append(study_plan_instance)
+            generated.append(
+                (task_event, study_plan_instance, study_plan_data["plan"])
+            )
+
+        # Step 4: Save all regenerated plans in one transaction
+        try:
+            with transaction.atomic():
+                StudyPlan.objects.bulk_create(plans_to_create)
+                StudyPlan.objects.bulk_update(
+                    touch(plans_to_update),
+                    [
+                        "user",
+                        "subject",
+                        "study_type",
+                        "plan",
+                        "generator_params",
+                        "day_overrides",
+                        "updated_at",
+                    ],
+                )
+                StudyPlan.objects.bulk_update(
+                    touch(plans_to_replan),
+                    ["plan", "generator_params", "day_overrides", "updated_at"],
+                )
+                changed_dates.update(all_study_dates(plans_to_create))
+                sync_study_plan_days(
+                    plans_to_create + plans_to_update + plans_to_replan, changed_dates
+                )
+        except Exception as e:
+            for task_event, study_plan_instance, plan_days in generated:
                 errors.append(
                     {
                         "task_event_id": task_event.id,
@@ -805,11 +1254,26 @@ class UpdateStudyPlansView(APIView):
                         "error": f"Failed to save study plan: {str(e)}",
                     }
                 )
+            generated = []
+
+        for task_event, study_plan_instance, plan_days in generated:
+            updated_plans.append(
+                {
+                    "task_event_id": task_event.id,
+                    "task_name": task_event.task_name,
+                    "study_plan_id": study_plan_instance.id,
+                    "total_study_hours": sum(day["total_hours"] for day in plan_days),
+                }
+            )
 
-        # Step 3: Return response
+        # Step 5: Return response
         response_data = {
             "updated_plans": updated_plans,
             "errors": errors,
+            "conflicts": summarize_session_conflicts(
+                user,
+                [study_plan_instance for _, study_plan_instance, _ in generated],
+            ),
         }
         if errors and not updated_plans:
             return Response(
@@ -827,56 +1291,156 @@ class UpdateStudyPlansView(APIView):
         )
 
 
+class ScheduleStudyPlansView(APIView):
+    """
+    Plan every pending task of the user together, sharing hours_per_day
+    between them instead of giving each task its own daily hours.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        user = request.user
+        try:
+            user_preference = UserPreference.objects.get(user=user)
+        except UserPreference.DoesNotExist:
+            return Response(
+                {"error": "User preferences not found."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        task_events = list(
+            TaskEvent.objects.filter(user=user, status="Pending").order_by(
+                "event_date", "id"
+            )
+        )
+        if not task_events:
+            return Response(
+                {"message": "No pending tasks found."},
+                status=status.HTTP_200_OK,
+            )
+
+        plans, unscheduled_hours = schedule_user_tasks(
+            preference_inputs(user_preference),
+            [
+                {
+                    "id": task_event.id,
+                    "subject": task_event.subject,
+                    "study_start_date": task_event.start_date.isoformat(),
+                    "exam_date": task_event.event_date.isoformat(),
+                    "estimated_study_hours": task_event.estimated_study_hours,
+                    "priority": task_event.priority,
+                    "skip_days": task_event.skip_days or [],
+                }
+                for task_event in task_events
+            ],
+        )
+
+        # Replace each task's plans; scheduled plans can't be regenerated lazily
+        existing_plans = {}
+        for study_plan in StudyPlan.objects.filter(
+            event_id__in=[task_event.id for task_event in task_events]
+        ):
+            existing_plans.setdefault(study_plan.event_id_id, []).append(study_plan)
+
+        plans_to_create = []
+        plans_to_update = []
+        changed_dates = {}
+        for task_event in task_events:
+            study_plans = existing_plans.get(task_event.id)
+            if not study_plans:
+                study_plans = [StudyPlan(event_id_id=task_event.id)]
+                plans_to_create.extend(study_plans)
+            else:
+                plans_to_update.extend(study_plans)
+            for study_plan in study_plans:
+                if study_plan.id is not None:
+                    changed_dates[study_plan.id] = changed_study_dates(
+                        study_plan.plan, plans[task_event.id]
+                    )
+                study_plan.user = user
+                study_plan.subject = task_event.subject
+                study_plan.study_type = STUDY_TYPE
+                study_plan.plan = plans[task_event.id]
+                study_plan.generator_params = None
+                study_plan.rolling_horizon = False
+                study_plan.day_overrides = {}
+            existing_plans[task_event.id] = study_plans
+
+        with transaction.atomic():
+            StudyPlan.objects.bulk_create(plans_to_create)
+            StudyPlan.objects.bulk_update(
+                touch(plans_to_update),
+                [
+                    "user",
+                    "subject",
+                    "study_type",
+                    "plan",
+                    "generator_params",
+                    "rolling_horizon",
+                    "day_overrides",
+                    "updated_at",
+                ],
+            )
+            changed_dates.update(all_study_dates(plans_to_create))
+            sync_study_plan_days(plans_to_create + plans_to_update, changed_dates)
+
+        return Response(
+            {
+                "hours_per_day": user_preference.hours_per_day,
+                "scheduled_plans": [
+                    {
+                        "task_event_id": task_event.id,
+                        "task_name": task_event.task_name,
+                        "study_plan_id": existing_plans[task_event.id][0].id,
+                        "total_study_hours": sum(
+                            day["total_hours"] for day in plans[task_event.id]
+                        ),
+                        "unscheduled_hours": unscheduled_hours[task_event.id],
+                    }
+                    for task_event in task_events
+                ],
+                "conflicts": summarize_session_conflicts(
+                    user, plans_to_create + plans_to_update
+                ),
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class StudyPlanCacheStatsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        # Counters are per worker process; size the cache from a busy worker
+        return Response(plan_cache.stats(), status=status.HTTP_200_OK)
+
+
 class CompletedTasksView(APIView):
     permission_classes = [IsAuthenticated]  # Ensure the user is authenticated
 
     def get(self, request, *args, **kwargs):
         user = request.user  # Get the currently authenticated user
 
-    
-        print(f"Authenticated user: {user.username}")
-
-        # Filter tasks where status is 'Complete' for the logged-in user
+        # Filter tasks where status is 'Complete' for the logged-in user,
+        # reading only the returned columns
         try:
-            completed_tasks = TaskEvent.objects.filter(user=user, status="Complete")
-            print(
-                f"Number of completed tasks found: {completed_tasks.count()}"
-            )   
-        except Exception as e:
-            print(f"Error fetching tasks: {str(e)}")
+            task_data = completed_task_serializer.serialize(
+                TaskEvent.objects.filter(user=user, status="Complete")
+            )
+        except Exception:
+            logger.exception("Error fetching completed tasks of user %s", user.id)
             return Response(
                 {"error": "Error fetching tasks"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
-        if not completed_tasks:
-            print("No completed tasks found for this user.")
+        if not task_data:
             return Response(
                 {"error": "No completed tasks found."},
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        # Serialize the data (You may want to create a serializer for TaskEvent)
-        task_data = []
-        for task in completed_tasks:
-            task_data.append(
-                {
-                    "id": task.id,
-                    "task_name": task.task_name,
-                    "subject": task.subject,
-                    "task_type": task.task_type,
-                    "start_date": task.start_date,
-                    "event_date": task.event_date,
-                    "estimated_study_hours": task.estimated_study_hours,
-                    "notes": task.notes,
-                    "priority": task.priority,
-                    "status": task.status,
-                }
-            )
-
-        
-        print(f"Returned task data: {task_data}")
-
         return Response(task_data, status=status.HTTP_200_OK)
 
 
@@ -993,9 +1557,53 @@ class UpdateStudyPlanView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Update the study plan
-        study_plan.plan = updated_plan
-        study_plan.save()
+        # Update the study plan; edited days are kept as overrides so that
+        # incremental replans don't undo them
+        if study_plan.rolling_horizon:
+            # The client sends the days of a window, compared with the days
+            # the plan has between the first and last of them
+            study_dates = [day["study_date"] for day in updated_plan]
+            current_days = materialize_study_plan(
+                study_plan,
+                datetime.strptime(min(study_dates), "%Y-%m-%d").date(),
+                datetime.strptime(max(study_dates), "%Y-%m-%d").date(),
+            )
+        else:
+            current_days = study_plan.plan
+        edited_dates = changed_study_dates(current_days, updated_plan)
+        updated_days = {day["study_date"]: day for day in updated_plan}
+        if study_plan.rolling_horizon:
+            # Its days before replanned_from are stored in plan, not generated
+            replanned_from = study_plan.generator_params.get("replanned_from", "")
+            stored_dates = {
+                study_date for study_date in edited_dates if study_date < replanned_from
+            }
+            study_plan.plan = sorted(
+                [
+                    day
+                    for day in study_plan.plan
+                    if day["study_date"] not in stored_dates
+                ]
+                + [
+                    updated_days[study_date]
+                    for study_date in stored_dates
+                    if study_date in updated_days
+                ],
+                key=lambda day: day["study_date"],
+            )
+        else:
+            stored_dates = set()
+            study_plan.plan = updated_plan
+        study_plan.day_overrides = {
+            **study_plan.day_overrides,
+            **{
+                study_date: updated_days.get(study_date)
+                for study_date in edited_dates - stored_dates
+            },
+        }
+        with transaction.atomic():
+            study_plan.save()
+            sync_study_plan_days([study_plan], {study_plan.id: edited_dates})
 
         # Send push notification
         # notification_result = send_push_notification(
@@ -1012,6 +1620,7 @@ class UpdateStudyPlanView(APIView):
                 "message": "Study plan updated successfully!",
                 "study_plan_id": study_plan.id,
                 "total_study_hours": sum(day["total_hours"] for day in updated_plan),
+                "conflicts": summarize_session_conflicts(user, [study_plan]),
             },
             status=status.HTTP_200_OK,
         )
@@ -1048,8 +1657,7 @@ class NotificationListView(APIView):
 
     def get(self, request):
         notifications = Notification.objects.filter(user=request.user)
-        serializer = NotificationSerializer(notifications, many=True)
-        return Response(serializer.data)
+        return Response(notification_list_serializer.serialize(notifications))
 
 
 class NotificationSaveView(APIView):
@@ -1070,6 +1678,35 @@ class NotificationSaveView(APIView):
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
+class SyncView(APIView):
+    """
+    What changed in the user's tasks, study plans and notifications since
+    the last sync: GET sync/?since=<cursor>, with the cursor of the previous
+    response. Without since, everything is returned ("full": true).
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        since = request.query_params.get("since")
+        if since:
+            try:
+                since = parse_datetime(since)
+            except ValueError:
+                since = None
+            if since is None:
+                return Response(
+                    {"error": "Invalid since cursor."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since, timezone.utc)
+        else:
+            since = None
+
+        return Response(changes_since(request.user, since), status=status.HTTP_200_OK)
+
+
 class TaskStatusUpdateView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -1133,18 +1770,105 @@ class GetAllStudyPlansView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, *args, **kwargs):
+        date_from, date_to, error_response = parse_plan_window(request.query_params)
+        if error_response:
+            return error_response
+
         study_plans = StudyPlan.objects.filter(user=request.user)
         plans_data = []
         for plan in study_plans:
             plans_data.append(
                 {
                     "event_id": plan.event_id_id,
-                    "plan": plan.plan,
+                    "plan": materialize_study_plan(plan, date_from, date_to),
                 }
             )
         return Response(plans_data, status=status.HTTP_200_OK)
 
 
+class StudySessionsView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        # ?date=YYYY-MM-DD for one day, or a ?from=&to= range (default: today)
+        query_params = request.query_params
+        if "date" in query_params:
+            query_params = {
+                "from": query_params.get("date"),
+                "to": query_params.get("date"),
+            }
+        date_from, date_to, error_response = parse_plan_window(query_params)
+        if error_response:
+            return error_response
+        date_from = date_from or date_to or timezone.localdate()
+        date_to = date_to or date_from
+
+        days = (
+            StudyPlanDay.objects.filter(
+                user=request.user, study_date__range=(date_from, date_to)
+            )
+            .select_related("study_plan")
+            .prefetch_related("sessions")
+            .order_by("study_date", "id")
+        )
+        days_data = [
+            {
+                "study_plan_id": day.study_plan_id,
+                "event_id": day.study_plan.event_id_id,
+                "study_date": day.study_date.isoformat(),
+                "subject": day.subject,
+                "study_time": day.study_time,
+                "total_hours": day.total_hours,
+                "sessions": [
+                    {
+                        "start_time": session.start_time,
+                        "end_time": session.end_time,
+                        "hours_to_study": session.hours_to_study,
+                    }
+                    for session in day.sessions.all()
+                ],
+            }
+            for day in days
+        ]
+
+        # Rolling-horizon plans only store their past days; generate the rest
+        for study_plan in StudyPlan.objects.filter(
+            user=request.user, rolling_horizon=True
+        ):
+            for day in rolling_study_plan_days(study_plan, date_from, date_to):
+                days_data.append(
+                    {
+                        "study_plan_id": study_plan.id,
+                        "event_id": study_plan.event_id_id,
+                        "study_date": day["study_date"],
+                        "subject": day["subject"],
+                        "study_time": day["study_time"],
+                        "total_hours": day["total_hours"],
+                        "sessions": day["sessions"],
+                    }
+                )
+
+        days_data.sort(key=lambda day: day["study_date"])
+        return Response(days_data, status=status.HTTP_200_OK)
+
+
+class StudyPlanConflictsView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        date_from, date_to, error_response = parse_plan_window(request.query_params)
+        if error_response:
+            return error_response
+
+        conflicts = find_session_conflicts(
+            request.user, date_from=date_from, date_to=date_to
+        )
+        return Response(
+            {"count": len(conflicts), "conflicts": conflicts},
+            status=status.HTTP_200_OK,
+        )
+
+
 class QuizResultSaveView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -1152,12 +1876,15 @@ class QuizResultSaveView(APIView):
         data = request.data
         serializer = QuizResultSerializer(data=data)
         if serializer.is_valid():
-            QuizResult.objects.create(
-                user=request.user,
-                subject=serializer.validated_data["subject"],
-                level=serializer.validated_data["level"],
-                results=serializer.validated_data["results"],
-            )
+            with transaction.atomic():
+                quiz_result = QuizResult.objects.create(
+                    user=request.user,
+                    subject=serializer.validated_data["subject"],
+                    level=serializer.validated_data["level"],
+                    results=serializer.validated_data["results"],
+                )
+                record_quiz_result(quiz_result)
+                record_quiz_attempt(quiz_result)
             return Response(
                 {"message": "Quiz results saved successfully"},
                 status=status.HTTP_201_CREATED,
@@ -1170,48 +1897,18 @@ class GetQuizResultsView(APIView):
 
     def get(self, request, *args, **kwargs):
         user = request.user
-        quiz_results = QuizResult.objects.filter(user=user)
-
-        # Group results by subject
-        results_by_subject = {}
-        for result in quiz_results:
-            subject = result.subject
-            if subject not in results_by_subject:
-                results_by_subject[subject] = {}
-            results_by_subject[subject][result.level] = result.results
-
-        # Ensure all levels are included, defaulting to null if not present
-        for subject_data in results_by_subject.values():
-            for level in ["Beginner", "Intermediate", "Advanced"]:
-                if level not in subject_data:
-                    subject_data[level] = None
+        mastery = user_mastery(user.id)
+
+        # Latest result of each subject and level, all levels included
+        # (null if not present)
+        results_by_subject = latest_results_by_subject(mastery)
 
         # Calculate overall averages for each level
-        overall_scores = {
-            "Beginner": {"total": 0, "count": 0},
-            "Intermediate": {"total": 0, "count": 0},
-            "Advanced": {"total": 0, "count": 0},
+        overall_averages = {
+            level: f"{average:.2f}%" if average is not None else None
+            for level, average in level_averages(mastery).items()
         }
 
-        for subject_data in results_by_subject.values():
-            for level in ["Beginner", "Intermediate", "Advanced"]:
-                if subject_data[level] is not None:
-                    # Remove '%' and convert to float
-                    percentage = float(subject_data[level].replace("%", ""))
-                    overall_scores[level]["total"] += percentage
-                    overall_scores[level]["count"] += 1
-
-        # Compute averages (or null if no results for that level)
-        overall_averages = {}
-        for level in overall_scores:
-            if overall_scores[level]["count"] > 0:
-                average = (
-                    overall_scores[level]["total"] / overall_scores[level]["count"]
-                )
-                overall_averages[level] = f"{average:.2f}%"
-            else:
-                overall_averages[level] = None
-
         # Prepare subject-wise results
         serialized_results = [
             {"subject": subject, "levels": data}
@@ -1224,6 +1921,50 @@ class GetQuizResultsView(APIView):
         return Response(response_data, status=status.HTTP_200_OK)
 
 
+class QuizHistoryView(APIView):
+    """
+    Quiz progress over time from the daily or weekly attempt rollups:
+    GET quiz/history/?subject=&level=&bucket=day|week&from=&to=
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        bucket = request.query_params.get("bucket", "day")
+        if bucket not in dict(QuizRollup.BUCKET_CHOICES):
+            return Response(
+                {"error": "bucket must be 'day' or 'week'."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        date_from, date_to, error_response = parse_plan_window(request.query_params)
+        if error_response:
+            return error_response
+
+        rollups = QuizRollup.objects.filter(user=request.user, bucket=bucket)
+        subject = request.query_params.get("subject")
+        if subject:
+            rollups = rollups.filter(subject=subject)
+        level = request.query_params.get("level")
+        if level:
+            rollups = rollups.filter(level=level)
+        if date_from:
+            rollups = rollups.filter(bucket_start__gte=date_from)
+        if date_to:
+            rollups = rollups.filter(bucket_start__lte=date_to)
+
+        return Response(
+            {
+                "bucket": bucket,
+                "history": [
+                    serialize_rollup(rollup)
+                    for rollup in rollups.order_by("bucket_start", "subject", "level")
+                ],
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
 class GetRecommendedResourcesView(APIView):
     permission_classes = [IsAuthenticated]
 